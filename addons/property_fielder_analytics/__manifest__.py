@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Property Fielder Analytics',
-    'version': '17.0.1.0.0',
+    'version': '17.0.1.1.0',
     'category': 'Field Service/Analytics',
     'summary': 'Analytics and reporting for field service operations',
     'description': '''
@@ -36,6 +36,7 @@ Features:
     'license': 'LGPL-3',
     'depends': [
         'property_fielder_field_service',
+        'property_fielder_field_service_mobile',  # Check-in durations for productivity
         'property_fielder_property_management',
     ],
     'data': [
@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+
+from odoo import http, fields
+from odoo.http import request
+import logging
+
+_logger = logging.getLogger(__name__)
+
+
+class AnalyticsController(http.Controller):
+    """JSON endpoints for analytics charts"""
+
+    @http.route('/property_fielder/analytics/costs', type='jsonrpc', auth='user', methods=['POST'])
+    def get_cost_breakdown(self, date_from=None, date_to=None, inspector_ids=None,
+                           hourly_rate=25.0, mileage_rate=0.45):
+        """Cost totals with inspector, week and certification type breakdowns."""
+        date_to = fields.Date.to_date(date_to) or fields.Date.context_today(request.env.user)
+        date_from = fields.Date.to_date(date_from) or fields.Date.subtract(date_to, days=30)
+        return request.env['property_fielder.cost.analysis'].get_cost_breakdown(
+            date_from, date_to,
+            inspector_ids=[int(i) for i in inspector_ids or []],
+            hourly_rate=float(hourly_rate),
+            mileage_rate=float(mileage_rate),
+        )
+
+    @http.route('/property_fielder/analytics/compliance_trends', type='jsonrpc', auth='user', methods=['POST'])
+    def get_compliance_trends(self, date_from=None, date_to=None, granularity='month',
+                              property_ids=None, certification_type_ids=None):
+        """Valid certificate counts per FLAGE+ category (cached per filter set)."""
+        date_to = fields.Date.to_date(date_to) or fields.Date.context_today(request.env.user)
+        date_from = fields.Date.to_date(date_from) or fields.Date.subtract(date_to, years=1)
+        if granularity not in ('day', 'week', 'month'):
+            granularity = 'month'
+        return request.env['property_fielder.compliance.analytics'].get_trend_series(
+            date_from, date_to, granularity,
+            property_ids=[int(i) for i in property_ids or []],
+            certification_type_ids=[int(i) for i in certification_type_ids or []],
+        )
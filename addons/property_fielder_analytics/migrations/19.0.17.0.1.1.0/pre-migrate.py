@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+
+
+def migrate(cr, version):
+    """The productivity report used to be a SQL view; it is now a fact table."""
+    cr.execute("DROP VIEW IF EXISTS property_fielder_inspector_productivity")
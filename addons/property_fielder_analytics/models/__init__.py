@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from . import inspector_productivity
+from . import productivity_sources
 from . import compliance_analytics
 from . import cost_analysis
 
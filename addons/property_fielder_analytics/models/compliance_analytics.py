@@ -1,11 +1,63 @@
 # -*- coding: utf-8 -*-
-from odoo import models, fields, api, _
+from odoo import models, fields, api, tools, _
 from datetime import datetime, timedelta
 from collections import defaultdict
+from dateutil.relativedelta import relativedelta
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# FLAGE+ categories, as defined on property_fielder.certification.type
+CATEGORIES = ['fire', 'legionella', 'asbestos', 'gas', 'electrical', 'other']
+
+GRANULARITIES = [
+    ('day', 'Daily'),
+    ('week', 'Weekly'),
+    ('month', 'Monthly'),
+]
+
+
+def period_starts(date_from, date_to, granularity):
+    """Sample dates of a trend series: the start of each period in range."""
+    if granularity == 'day':
+        step = relativedelta(days=1)
+        current = date_from
+    elif granularity == 'week':
+        step = relativedelta(weeks=1)
+        current = date_from - timedelta(days=date_from.weekday())
+    else:
+        step = relativedelta(months=1)
+        current = date_from.replace(day=1)
+    dates = []
+    while current <= date_to:
+        dates.append(current)
+        current += step
+    return dates
+
+
+def sweep_events(events, sample_dates):
+    """Sweep a sorted event stream once, sampling counts at each date.
+
+    :param events: (date, category, issued delta, valid delta) tuples sorted
+                   by date. A certificate contributes (issue_date, +1, +1)
+                   and (expiry_date, 0, -1): it is valid from its issue date
+                   up to, but excluding, its expiry date.
+    :param sample_dates: ascending dates to sample
+    :return: list of (issued, {category: valid}) per sample date
+    """
+    issued = 0
+    valid = dict.fromkeys(CATEGORIES, 0)
+    samples = []
+    index = 0
+    for sample in sample_dates:
+        while index < len(events) and events[index][0] <= sample:
+            _date, category, issued_delta, valid_delta = events[index]
+            issued += issued_delta
+            valid[category] += valid_delta
+            index += 1
+        samples.append((issued, dict(valid)))
+    return samples
+
 
 class ComplianceAnalytics(models.TransientModel):
     """Compliance trend analytics and reporting"""
@@ -32,6 +84,12 @@ class ComplianceAnalytics(models.TransientModel):
         string='Certification Types',
         help='Leave empty for all types'
     )
+    granularity = fields.Selection(
+        GRANULARITIES,
+        string='Granularity',
+        default='month',
+        required=True
+    )
     
     # Summary Stats
     total_properties = fields.Integer(string='Total Properties', compute='_compute_stats')
@@ -45,7 +103,7 @@ class ComplianceAnalytics(models.TransientModel):
     trend_line_ids = fields.One2many(
         'property_fielder.compliance.trend.line',
         'analytics_id',
-        string='Monthly Trends'
+        string='Trends'
     )
     
     # Category breakdown
@@ -94,6 +152,83 @@ class ComplianceAnalytics(models.TransientModel):
             else:
                 record.compliance_rate = 0.0
     
+    # ------------------------------------------------------------
+    # Trend engine
+    # ------------------------------------------------------------
+
+    @api.model
+    def _get_certification_signature(self):
+        """Cheap fingerprint of the certification table used as cache key.
+
+        ``status`` and ``flage_category`` are stored computed fields which the
+        daily cron and certification type edits recompute without touching
+        ``write_date``, so their distribution is part of the fingerprint.
+        """
+        self.env['property_fielder.property.certification'].flush_model()
+        self.env.cr.execute("""
+            SELECT status, flage_category, COUNT(*), MAX(write_date)
+              FROM property_fielder_property_certification
+          GROUP BY status, flage_category
+          ORDER BY status, flage_category
+        """)
+        return tuple(
+            (status, category, count, str(last_write))
+            for status, category, count, last_write in self.env.cr.fetchall()
+        )
+
+    @api.model
+    def get_trend_series(self, date_from, date_to, granularity='month',
+                         property_ids=None, certification_type_ids=None):
+        """Valid certificate counts per FLAGE+ category over time.
+
+        Issue and expiry dates are aggregated into one sorted event stream
+        which is swept once, so the cost no longer grows with the number of
+        periods. Series are cached per filter set and certification revision.
+
+        :return: list of dicts {date, total, valid, compliance_rate, categories}
+        """
+        filter_key = (
+            fields.Date.to_date(date_from),
+            fields.Date.to_date(date_to),
+            granularity,
+            tuple(sorted(property_ids or ())),
+            tuple(sorted(certification_type_ids or ())),
+        )
+        return self._build_trend_series(self._get_certification_signature(), filter_key)
+
+    @tools.ormcache('self.env.uid', 'signature', 'filter_key')
+    def _build_trend_series(self, signature, filter_key):
+        date_from, date_to, granularity, property_ids, type_ids = filter_key
+        domain = [('status', '!=', 'cancelled'), ('issue_date', '<=', date_to)]
+        if property_ids:
+            domain.append(('property_id', 'in', list(property_ids)))
+        if type_ids:
+            domain.append(('certification_type_id', 'in', list(type_ids)))
+
+        Certification = self.env['property_fielder.property.certification']
+        events = []
+        for issue_date, category, count in Certification._read_group(
+                domain, ['issue_date:day', 'flage_category'], ['__count']):
+            events.append((issue_date, category or 'other', count, count))
+        for expiry_date, category, count in Certification._read_group(
+                domain + [('expiry_date', '<=', date_to)],
+                ['expiry_date:day', 'flage_category'], ['__count']):
+            events.append((expiry_date, category or 'other', 0, -count))
+        events.sort(key=lambda event: event[0])
+
+        sample_dates = period_starts(date_from, date_to, granularity)
+        series = []
+        for sample, (issued, valid) in zip(sample_dates, sweep_events(events, sample_dates)):
+            valid_total = sum(valid.values())
+            series.append({
+                'date': fields.Date.to_string(sample),
+                'total': issued,
+                'valid': valid_total,
+                'compliance_rate': round(valid_total / issued * 100, 1) if issued else 0.0,
+                'categories': valid,
+            })
+        return series
+
     def action_generate_trends(self):
         """Generate compliance trend analysis"""
         self.ensure_one()
@@ -102,66 +237,46 @@ class ComplianceAnalytics(models.TransientModel):
         self.trend_line_ids.unlink()
         self.category_line_ids.unlink()
         
-        # Get properties
-        if self.property_ids:
-            properties = self.property_ids
-        else:
-            properties = self.env['property_fielder.property'].search([])
-        
-        # Get certifications
-        cert_domain = [('property_id', 'in', properties.ids)]
-        if self.certification_type_ids:
-            cert_domain.append(('certification_type_id', 'in', self.certification_type_ids.ids))
-        
-        certs = self.env['property_fielder.property.certification'].search(cert_domain)
-        
-        # Generate monthly trend
-        trends = []
-        current = self.date_from.replace(day=1)
-        end = self.date_to
-        
-        while current <= end:
-            month_end = (current.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
-            
-            # Calculate compliance for this month
-            valid_count = len(certs.filtered(
-                lambda c: not c.expiry_date or c.expiry_date > current
-            ))
-            
-            trends.append((0, 0, {
-                'analytics_id': self.id,
-                'month': current,
-                'total_certs': len(certs),
-                'valid_certs': valid_count,
-                'compliance_rate': (valid_count / len(certs) * 100) if certs else 0,
-            }))
-            
-            # Next month
-            current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
-        
-        self.trend_line_ids = trends
+        series = self.get_trend_series(
+            self.date_from, self.date_to, self.granularity,
+            property_ids=self.property_ids.ids,
+            certification_type_ids=self.certification_type_ids.ids,
+        )
+        self.trend_line_ids = [(0, 0, {
+            'analytics_id': self.id,
+            'period': point['date'],
+            'total_certs': point['total'],
+            'valid_certs': point['valid'],
+            'compliance_rate': point['compliance_rate'],
+            **{'valid_%s' % cat: point['categories'][cat] for cat in CATEGORIES},
+        }) for point in series]
         
         # Generate category breakdown
-        categories = defaultdict(lambda: {'total': 0, 'valid': 0, 'expired': 0})
+        domain = [('status', '!=', 'cancelled')]
+        if self.property_ids:
+            domain.append(('property_id', 'in', self.property_ids.ids))
+        if self.certification_type_ids:
+            domain.append(('certification_type_id', 'in', self.certification_type_ids.ids))
         today = fields.Date.today()
         
-        for cert in certs:
-            cat = cert.certification_type_id.flage_category or 'other'
-            categories[cat]['total'] += 1
-            if cert.expiry_date and cert.expiry_date <= today:
-                categories[cat]['expired'] += 1
-            else:
-                categories[cat]['valid'] += 1
+        Certification = self.env['property_fielder.property.certification']
+        categories = defaultdict(lambda: {'total': 0, 'expired': 0})
+        for cat, count in Certification._read_group(domain, ['flage_category'], ['__count']):
+            categories[cat or 'other']['total'] += count
+        for cat, count in Certification._read_group(
+                domain + [('expiry_date', '<=', today)], ['flage_category'], ['__count']):
+            categories[cat or 'other']['expired'] += count
         
         cat_lines = []
         for cat, data in categories.items():
+            valid = data['total'] - data['expired']
             cat_lines.append((0, 0, {
                 'analytics_id': self.id,
                 'category': cat,
                 'total_count': data['total'],
-                'valid_count': data['valid'],
+                'valid_count': valid,
                 'expired_count': data['expired'],
-                'compliance_rate': (data['valid'] / data['total'] * 100) if data['total'] else 0,
+                'compliance_rate': (valid / data['total'] * 100) if data['total'] else 0,
             }))
         
         self.category_line_ids = cat_lines
@@ -181,10 +296,16 @@ class ComplianceTrendLine(models.TransientModel):
     _description = 'Compliance Trend Line'
     
     analytics_id = fields.Many2one('property_fielder.compliance.analytics', ondelete='cascade')
-    month = fields.Date(string='Month')
+    period = fields.Date(string='Period')
     total_certs = fields.Integer(string='Total Certificates')
     valid_certs = fields.Integer(string='Valid Certificates')
     compliance_rate = fields.Float(string='Compliance %')
+    valid_fire = fields.Integer(string='Fire Safety')
+    valid_legionella = fields.Integer(string='Legionella')
+    valid_asbestos = fields.Integer(string='Asbestos')
+    valid_gas = fields.Integer(string='Gas Safety')
+    valid_electrical = fields.Integer(string='Electrical')
+    valid_other = fields.Integer(string='Other')
 
 
 class ComplianceCategoryLine(models.TransientModel):
@@ -1,10 +1,14 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api, _
+from odoo.exceptions import AccessError
+from odoo.tools import SQL
 from datetime import datetime, timedelta
 import logging
 
 _logger = logging.getLogger(__name__)
 
+KM_TO_MILES = 0.621371
+
 
 class CostAnalysis(models.TransientModel):
     """Cost analysis for inspections and routes"""
@@ -58,36 +62,125 @@ class CostAnalysis(models.TransientModel):
         string='Cost by Inspector'
     )
     
+    @api.model
+    def get_cost_breakdown(self, date_from, date_to, inspector_ids=None,
+                           hourly_rate=25.0, mileage_rate=0.45):
+        """Cost totals plus inspector, week and certification type breakdowns.
+
+        All groupings come from a single GROUPING SETS query over jobs.
+        Route distance is shared evenly between the route's jobs in the
+        selection, so every breakdown sums to the same total mileage. Only
+        field service users may call it, and only the jobs they can read
+        are counted.
+        """
+        if not self.env.user.has_group('property_fielder_field_service.group_field_service_user'):
+            raise AccessError(_('Only field service users can view cost analytics.'))
+        Job = self.env['property_fielder.job']
+        Job.check_access('read')
+        for model in ('property_fielder.job', 'property_fielder.route',
+                      'property_fielder.property.inspection'):
+            self.env[model].flush_model()
+        domain = [('scheduled_date', '>=', date_from), ('scheduled_date', '<=', date_to)]
+        if inspector_ids:
+            domain.append(('inspector_id', 'in', list(inspector_ids)))
+        self.env.cr.execute(SQL("""
+            WITH selected_jobs AS (
+                SELECT j.id,
+                       j.inspector_id,
+                       i.name AS inspector_name,
+                       date_trunc('week', j.scheduled_date)::date AS week,
+                       (SELECT pi.certification_type_id
+                          FROM property_fielder_property_inspection pi
+                         WHERE pi.job_id = j.id
+                         ORDER BY pi.id
+                         LIMIT 1) AS certification_type_id,
+                       COALESCE(j.duration_minutes, 0) AS duration_minutes,
+                       j.route_id,
+                       COALESCE(r.total_distance_km, 0)
+                           / COUNT(j.id) OVER (PARTITION BY j.route_id) AS km_share
+                  FROM property_fielder_job j
+                  LEFT JOIN property_fielder_inspector i ON i.id = j.inspector_id
+                  LEFT JOIN property_fielder_route r ON r.id = j.route_id
+                 WHERE j.id IN %s
+            )
+            SELECT GROUPING(inspector_id, inspector_name) = 0 AS by_inspector,
+                   GROUPING(week) = 0 AS by_week,
+                   GROUPING(certification_type_id) = 0 AS by_certification_type,
+                   inspector_id, inspector_name, week, certification_type_id,
+                   COUNT(id), COUNT(DISTINCT route_id),
+                   SUM(duration_minutes), SUM(CASE WHEN route_id IS NULL THEN 0 ELSE km_share END)
+              FROM selected_jobs
+             GROUP BY GROUPING SETS ((), (inspector_id, inspector_name), (week), (certification_type_id))
+        """, Job._search(domain).subselect()))
+        rows = self.env.cr.fetchall()
+
+        def cost_row(jobs, routes, minutes, km):
+            hours = (minutes or 0) / 60
+            miles = (km or 0) * KM_TO_MILES
+            labor = hours * hourly_rate
+            mileage = miles * mileage_rate
+            return {
+                'jobs': jobs,
+                'routes': routes,
+                'hours': round(hours, 1),
+                'miles': round(miles, 1),
+                'labor_cost': round(labor, 2),
+                'mileage_cost': round(mileage, 2),
+                'total_cost': round(labor + mileage, 2),
+                'cost_per_job': round((labor + mileage) / jobs, 2) if jobs else 0,
+            }
+
+        result = {
+            'totals': cost_row(0, 0, 0, 0),
+            'by_inspector': [],
+            'by_week': [],
+            'by_certification_type': [],
+        }
+        cert_type_ids = set()
+        for (by_inspector, by_week, by_cert, inspector_id, inspector_name, week,
+             cert_type_id, jobs, routes, minutes, km) in rows:
+            values = cost_row(jobs, routes, minutes, km)
+            if by_inspector:
+                values.update(inspector_id=inspector_id, inspector_name=inspector_name)
+                result['by_inspector'].append(values)
+            elif by_week:
+                values.update(week=fields.Date.to_string(week))
+                result['by_week'].append(values)
+            elif by_cert:
+                values.update(certification_type_id=cert_type_id)
+                cert_type_ids.add(cert_type_id)
+                result['by_certification_type'].append(values)
+            else:
+                result['totals'] = values
+
+        names = {
+            cert_type.id: cert_type.name for cert_type in
+            self.env['property_fielder.certification.type'].browse(
+                [cert_id for cert_id in cert_type_ids if cert_id])
+        }
+        for values in result['by_certification_type']:
+            values['certification_type_name'] = names.get(values['certification_type_id'], _('Other'))
+        result['by_inspector'].sort(key=lambda v: v['inspector_name'] or '')
+        result['by_week'].sort(key=lambda v: v['week'])
+        result['by_certification_type'].sort(key=lambda v: v['certification_type_name'])
+        return result
+
     @api.depends('date_from', 'date_to', 'inspector_ids', 'hourly_rate', 'mileage_rate')
     def _compute_costs(self):
         for record in self:
-            # Build domain
-            domain = [
-                ('scheduled_date', '>=', record.date_from),
-                ('scheduled_date', '<=', record.date_to),
-            ]
-            if record.inspector_ids:
-                domain.append(('inspector_id', 'in', record.inspector_ids.ids))
-            
-            jobs = self.env['property_fielder.job'].search(domain)
-            routes = jobs.mapped('route_id')
+            totals = self.get_cost_breakdown(
+                record.date_from, record.date_to, record.inspector_ids.ids,
+                record.hourly_rate, record.mileage_rate,
+            )['totals']
             
-            record.total_jobs = len(jobs)
-            record.total_routes = len(routes)
-            
-            # Calculate total hours from job durations
-            total_minutes = sum(j.duration_minutes for j in jobs)
-            record.total_hours = round(total_minutes / 60, 1)
-            
-            # Calculate total miles from routes
-            total_km = sum(r.total_distance for r in routes if r.total_distance)
-            record.total_miles = round(total_km * 0.621371, 1)  # km to miles
-            
-            # Calculate costs
-            record.labor_cost = round(record.total_hours * record.hourly_rate, 2)
-            record.mileage_cost = round(record.total_miles * record.mileage_rate, 2)
-            record.total_cost = record.labor_cost + record.mileage_cost
-            record.cost_per_job = round(record.total_cost / record.total_jobs, 2) if record.total_jobs else 0
+            record.total_jobs = totals['jobs']
+            record.total_routes = totals['routes']
+            record.total_hours = totals['hours']
+            record.total_miles = totals['miles']
+            record.labor_cost = totals['labor_cost']
+            record.mileage_cost = totals['mileage_cost']
+            record.total_cost = totals['total_cost']
+            record.cost_per_job = totals['cost_per_job']
     
     def action_generate_breakdown(self):
         """Generate cost breakdown by inspector"""
@@ -96,46 +189,25 @@ class CostAnalysis(models.TransientModel):
         # Clear existing
         self.inspector_cost_ids.unlink()
         
-        # Get inspectors
-        if self.inspector_ids:
-            inspectors = self.inspector_ids
-        else:
-            inspectors = self.env['property_fielder.inspector'].search([])
+        breakdown = self.get_cost_breakdown(
+            self.date_from, self.date_to, self.inspector_ids.ids,
+            self.hourly_rate, self.mileage_rate,
+        )
         
         lines = []
-        for inspector in inspectors:
-            # Get jobs for this inspector
-            domain = [
-                ('scheduled_date', '>=', self.date_from),
-                ('scheduled_date', '<=', self.date_to),
-                ('inspector_id', '=', inspector.id),
-            ]
-            jobs = self.env['property_fielder.job'].search(domain)
-            
-            if not jobs:
+        for row in breakdown['by_inspector']:
+            if not row['inspector_id']:
                 continue
-            
-            routes = jobs.mapped('route_id')
-            
-            total_minutes = sum(j.duration_minutes for j in jobs)
-            hours = total_minutes / 60
-            
-            total_km = sum(r.total_distance for r in routes if r.total_distance)
-            miles = total_km * 0.621371
-            
-            labor = hours * self.hourly_rate
-            mileage = miles * self.mileage_rate
-            
             lines.append((0, 0, {
                 'analysis_id': self.id,
-                'inspector_id': inspector.id,
-                'jobs_count': len(jobs),
-                'routes_count': len(routes),
-                'hours': round(hours, 1),
-                'miles': round(miles, 1),
-                'labor_cost': round(labor, 2),
-                'mileage_cost': round(mileage, 2),
-                'total_cost': round(labor + mileage, 2),
+                'inspector_id': row['inspector_id'],
+                'jobs_count': row['jobs'],
+                'routes_count': row['routes'],
+                'hours': row['hours'],
+                'miles': row['miles'],
+                'labor_cost': row['labor_cost'],
+                'mileage_cost': row['mileage_cost'],
+                'total_cost': row['total_cost'],
             }))
         
         self.inspector_cost_ids = lines
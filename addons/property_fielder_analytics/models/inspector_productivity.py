@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from odoo import models, fields, api, _
+from odoo.tools import SQL
 from datetime import datetime, timedelta
 import logging
 
@@ -7,78 +8,204 @@ _logger = logging.getLogger(__name__)
 
 
 class InspectorProductivityReport(models.Model):
-    """Inspector productivity analytics and reporting"""
+    """Inspector productivity fact table (one row per inspector and day).
+
+    Rows are maintained incrementally: job, route and check-in changes mark
+    their (inspector, date) pair dirty and the pairs are re-aggregated once
+    per transaction, just before commit.
+    """
     
     _name = 'property_fielder.inspector.productivity'
     _description = 'Inspector Productivity Report'
-    _auto = False  # Database view, not a table
     _order = 'inspector_id, date desc'
     
     inspector_id = fields.Many2one(
         'property_fielder.inspector',
         string='Inspector',
-        readonly=True
+        readonly=True,
+        ondelete='cascade'
     )
     inspector_name = fields.Char(string='Inspector Name', readonly=True)
-    date = fields.Date(string='Date', readonly=True)
+    date = fields.Date(string='Date', readonly=True, index=True)
     
     # Job Metrics
     jobs_assigned = fields.Integer(string='Jobs Assigned', readonly=True)
     jobs_completed = fields.Integer(string='Jobs Completed', readonly=True)
     jobs_cancelled = fields.Integer(string='Jobs Cancelled', readonly=True)
-    completion_rate = fields.Float(string='Completion Rate (%)', readonly=True)
+    completion_rate = fields.Float(string='Completion Rate (%)', readonly=True, aggregator='avg')
     
     # Time Metrics
     total_duration_minutes = fields.Integer(string='Total Job Duration (min)', readonly=True)
-    avg_duration_minutes = fields.Float(string='Avg Job Duration (min)', readonly=True)
+    avg_duration_minutes = fields.Float(string='Avg Job Duration (min)', readonly=True, aggregator='avg')
     total_travel_minutes = fields.Integer(string='Total Travel Time (min)', readonly=True)
+    total_onsite_minutes = fields.Integer(string='Total On-Site Time (min)', readonly=True)
     
     # Performance
     on_time_count = fields.Integer(string='On-Time Jobs', readonly=True)
     late_count = fields.Integer(string='Late Jobs', readonly=True)
-    on_time_rate = fields.Float(string='On-Time Rate (%)', readonly=True)
+    on_time_rate = fields.Float(string='On-Time Rate (%)', readonly=True, aggregator='avg')
     
     # Route Metrics
     route_count = fields.Integer(string='Routes', readonly=True)
     total_distance_km = fields.Float(string='Total Distance (km)', readonly=True)
-    
+
+    _inspector_date_unique = models.Constraint(
+        'UNIQUE(inspector_id, date)',
+        'Only one productivity row per inspector and day.',
+    )
+
+    DIRTY_KEY = 'property_fielder.inspector.productivity.dirty'
+
+    def _auto_init(self):
+        # Up to 1.0 the report was a SQL view of the same name; the pre-migration
+        # drops it, this also covers databases updated without migration scripts
+        self.env.cr.execute("""
+            SELECT 1 FROM pg_class WHERE relname = %s AND relkind = 'v'
+        """, (self._table,))
+        if self.env.cr.fetchone():
+            self.env.cr.execute(SQL("DROP VIEW %s", SQL.identifier(self._table)))
+        return super()._auto_init()
+
     def init(self):
-        """Create the database view for productivity analytics"""
+        """Populate the fact table on first install."""
+        self.env.cr.execute("SELECT 1 FROM property_fielder_inspector_productivity LIMIT 1")
+        if not self.env.cr.fetchone():
+            self._rebuild_facts()
+
+    # ------------------------------------------------------------
+    # Incremental maintenance
+    # ------------------------------------------------------------
+
+    @api.model
+    def _mark_dirty(self, pairs):
+        """Queue (inspector_id, date) pairs for refresh at commit time."""
+        pairs = {(inspector_id, date) for inspector_id, date in pairs if inspector_id and date}
+        if not pairs:
+            return
+        precommit = self.env.cr.precommit
+        dirty = precommit.data.get(self.DIRTY_KEY)
+        if dirty is None:
+            dirty = precommit.data[self.DIRTY_KEY] = set()
+
+            @precommit.add
+            def refresh_dirty_facts():
+                # Inspectors/jobs may have been deleted since they were marked
+                self.env['property_fielder.inspector.productivity'].sudo()._refresh_facts(
+                    precommit.data.pop(self.DIRTY_KEY, set())
+                )
+        dirty.update(pairs)
+
+    @api.model
+    def _rebuild_facts(self):
+        """Rebuild the whole fact table (install / manual repair)."""
         self.env.cr.execute("""
-            DROP VIEW IF EXISTS property_fielder_inspector_productivity;
-            CREATE OR REPLACE VIEW property_fielder_inspector_productivity AS (
-                SELECT
-                    ROW_NUMBER() OVER () AS id,
-                    i.id AS inspector_id,
-                    i.name AS inspector_name,
-                    j.scheduled_date AS date,
-                    COUNT(j.id) AS jobs_assigned,
-                    SUM(CASE WHEN j.state = 'completed' THEN 1 ELSE 0 END) AS jobs_completed,
-                    SUM(CASE WHEN j.state = 'cancelled' THEN 1 ELSE 0 END) AS jobs_cancelled,
-                    CASE 
-                        WHEN COUNT(j.id) > 0 
-                        THEN ROUND(100.0 * SUM(CASE WHEN j.state = 'completed' THEN 1 ELSE 0 END) / COUNT(j.id), 1)
-                        ELSE 0 
-                    END AS completion_rate,
-                    SUM(j.duration_minutes) AS total_duration_minutes,
-                    AVG(j.duration_minutes) AS avg_duration_minutes,
-                    0 AS total_travel_minutes,
-                    SUM(CASE WHEN j.state = 'completed' AND j.completed_date <= j.scheduled_date THEN 1 ELSE 0 END) AS on_time_count,
-                    SUM(CASE WHEN j.state = 'completed' AND j.completed_date > j.scheduled_date THEN 1 ELSE 0 END) AS late_count,
-                    CASE 
-                        WHEN SUM(CASE WHEN j.state = 'completed' THEN 1 ELSE 0 END) > 0 
-                        THEN ROUND(100.0 * SUM(CASE WHEN j.state = 'completed' AND j.completed_date <= j.scheduled_date THEN 1 ELSE 0 END) / 
-                             NULLIF(SUM(CASE WHEN j.state = 'completed' THEN 1 ELSE 0 END), 0), 1)
-                        ELSE 0 
-                    END AS on_time_rate,
-                    COUNT(DISTINCT j.route_id) AS route_count,
-                    0.0 AS total_distance_km
-                FROM property_fielder_inspector i
-                LEFT JOIN property_fielder_job j ON j.inspector_id = i.id
-                WHERE j.scheduled_date IS NOT NULL
-                GROUP BY i.id, i.name, j.scheduled_date
-            )
+            SELECT DISTINCT inspector_id, scheduled_date
+              FROM property_fielder_job
+             WHERE inspector_id IS NOT NULL AND scheduled_date IS NOT NULL
         """)
+        pairs = set(self.env.cr.fetchall())
+        self.env.cr.execute("DELETE FROM property_fielder_inspector_productivity")
+        self._refresh_facts(pairs)
+
+    @api.model
+    def _refresh_facts(self, pairs):
+        """Re-aggregate the fact rows for the given (inspector_id, date) pairs."""
+        if not pairs:
+            return
+        for model in ('property_fielder.job', 'property_fielder.route', 'property_fielder.job.checkin'):
+            self.env[model].flush_model()
+        inspector_ids = [pair[0] for pair in pairs]
+        dates = [fields.Date.to_string(pair[1]) for pair in pairs]
+        self.env.cr.execute("""
+            DELETE FROM property_fielder_inspector_productivity f
+             USING unnest(%s::int[], %s::date[]) AS k(inspector_id, date)
+             WHERE f.inspector_id = k.inspector_id AND f.date = k.date
+        """, (inspector_ids, dates))
+        self.env.cr.execute("""
+            WITH keys AS (
+                SELECT DISTINCT inspector_id, date
+                  FROM unnest(%s::int[], %s::date[]) AS k(inspector_id, date)
+            ),
+            job_facts AS (
+                SELECT j.inspector_id,
+                       j.scheduled_date AS date,
+                       COUNT(j.id) AS jobs_assigned,
+                       COUNT(j.id) FILTER (WHERE j.state = 'completed') AS jobs_completed,
+                       COUNT(j.id) FILTER (WHERE j.state = 'cancelled') AS jobs_cancelled,
+                       COALESCE(SUM(j.duration_minutes), 0) AS total_duration_minutes,
+                       COALESCE(AVG(j.duration_minutes), 0) AS avg_duration_minutes,
+                       COALESCE(SUM(c.onsite_minutes), 0) AS total_onsite_minutes,
+                       COUNT(j.id) FILTER (WHERE j.state = 'completed'
+                                             AND c.last_checkout::date <= j.scheduled_date) AS on_time_count,
+                       COUNT(j.id) FILTER (WHERE j.state = 'completed'
+                                             AND c.last_checkout::date > j.scheduled_date) AS late_count
+                  FROM property_fielder_job j
+                  JOIN keys k ON k.inspector_id = j.inspector_id AND k.date = j.scheduled_date
+                  LEFT JOIN LATERAL (
+                      SELECT SUM(ci.duration_minutes) AS onsite_minutes,
+                             MAX(ci.checkout_time) AS last_checkout
+                        FROM property_fielder_job_checkin ci
+                       WHERE ci.job_id = j.id
+                  ) c ON TRUE
+                 GROUP BY j.inspector_id, j.scheduled_date
+            ),
+            route_facts AS (
+                SELECT r.inspector_id,
+                       r.route_date AS date,
+                       COUNT(r.id) AS route_count,
+                       COALESCE(SUM(r.total_drive_time_minutes), 0) AS total_travel_minutes,
+                       COALESCE(SUM(r.total_distance_km), 0) AS total_distance_km
+                  FROM property_fielder_route r
+                  JOIN keys k ON k.inspector_id = r.inspector_id AND k.date = r.route_date
+                 GROUP BY r.inspector_id, r.route_date
+            )
+            INSERT INTO property_fielder_inspector_productivity (
+                inspector_id, inspector_name, date,
+                jobs_assigned, jobs_completed, jobs_cancelled, completion_rate,
+                total_duration_minutes, avg_duration_minutes,
+                total_travel_minutes, total_onsite_minutes,
+                on_time_count, late_count, on_time_rate,
+                route_count, total_distance_km,
+                create_uid, create_date, write_uid, write_date
+            )
+            SELECT jf.inspector_id, i.name, jf.date,
+                   jf.jobs_assigned, jf.jobs_completed, jf.jobs_cancelled,
+                   ROUND(100.0 * jf.jobs_completed / NULLIF(jf.jobs_assigned, 0), 1),
+                   jf.total_duration_minutes, jf.avg_duration_minutes,
+                   COALESCE(rf.total_travel_minutes, 0), jf.total_onsite_minutes,
+                   jf.on_time_count, jf.late_count,
+                   COALESCE(ROUND(100.0 * jf.on_time_count / NULLIF(jf.jobs_completed, 0), 1), 0),
+                   COALESCE(rf.route_count, 0), COALESCE(rf.total_distance_km, 0),
+                   %s, (now() at time zone 'UTC'), %s, (now() at time zone 'UTC')
+              FROM job_facts jf
+              JOIN property_fielder_inspector i ON i.id = jf.inspector_id
+              LEFT JOIN route_facts rf ON rf.inspector_id = jf.inspector_id AND rf.date = jf.date
+        """, (inspector_ids, dates, self.env.uid, self.env.uid))
+        self.invalidate_model()
+
+    @api.model
+    def get_period_totals(self, date_from, date_to, inspector_ids=None):
+        """Aggregate the fact table per inspector for a date range (one query)."""
+        self.flush_model()
+        where = ['date >= %s', 'date <= %s']
+        params = [date_from, date_to]
+        if inspector_ids:
+            where.append('inspector_id = ANY(%s)')
+            params.append(list(inspector_ids))
+        self.env.cr.execute("""
+            SELECT inspector_id,
+                   SUM(jobs_assigned), SUM(jobs_completed), SUM(jobs_cancelled),
+                   SUM(total_duration_minutes), SUM(total_travel_minutes),
+                   SUM(total_onsite_minutes), SUM(total_distance_km),
+                   SUM(on_time_count), SUM(late_count)
+              FROM property_fielder_inspector_productivity
+             WHERE %s
+             GROUP BY inspector_id
+        """ % ' AND '.join(where), params)
+        keys = ['inspector_id', 'jobs_assigned', 'jobs_completed', 'jobs_cancelled',
+                'total_duration', 'total_travel', 'total_onsite', 'total_distance_km',
+                'on_time_count', 'late_count']
+        return [dict(zip(keys, row)) for row in self.env.cr.fetchall()]
 
 
 class InspectorProductivitySummary(models.TransientModel):
@@ -116,43 +243,28 @@ class InspectorProductivitySummary(models.TransientModel):
         # Clear existing lines
         self.line_ids.unlink()
         
-        # Build domain
-        domain = [
-            ('scheduled_date', '>=', self.date_from),
-            ('scheduled_date', '<=', self.date_to),
-        ]
-        if self.inspector_ids:
-            domain.append(('inspector_id', 'in', self.inspector_ids.ids))
-        
-        # Get all inspectors
-        if self.inspector_ids:
-            inspectors = self.inspector_ids
-        else:
-            inspectors = self.env['property_fielder.inspector'].search([])
-        
-        # Calculate metrics for each inspector
-        Job = self.env['property_fielder.job']
+        totals = self.env['property_fielder.inspector.productivity'].get_period_totals(
+            self.date_from, self.date_to, self.inspector_ids.ids
+        )
+
         lines = []
-        
-        for inspector in inspectors:
-            inspector_domain = domain + [('inspector_id', '=', inspector.id)]
-            jobs = Job.search(inspector_domain)
-            
-            if not jobs:
+        for row in totals:
+            assigned = row['jobs_assigned'] or 0
+            if not assigned:
                 continue
-            
-            completed = jobs.filtered(lambda j: j.state == 'completed')
-            cancelled = jobs.filtered(lambda j: j.state == 'cancelled')
-            
+            completed = row['jobs_completed'] or 0
             lines.append((0, 0, {
                 'summary_id': self.id,
-                'inspector_id': inspector.id,
-                'jobs_assigned': len(jobs),
-                'jobs_completed': len(completed),
-                'jobs_cancelled': len(cancelled),
-                'completion_rate': (len(completed) / len(jobs) * 100) if jobs else 0,
-                'total_duration': sum(j.duration_minutes for j in jobs),
-                'avg_duration': sum(j.duration_minutes for j in jobs) / len(jobs) if jobs else 0,
+                'inspector_id': row['inspector_id'],
+                'jobs_assigned': assigned,
+                'jobs_completed': completed,
+                'jobs_cancelled': row['jobs_cancelled'] or 0,
+                'completion_rate': completed / assigned * 100,
+                'total_duration': row['total_duration'] or 0,
+                'avg_duration': (row['total_duration'] or 0) / assigned,
+                'total_travel': row['total_travel'] or 0,
+                'total_onsite': row['total_onsite'] or 0,
+                'total_distance_km': row['total_distance_km'] or 0.0,
             }))
         
         self.line_ids = lines
@@ -188,4 +300,7 @@ class InspectorProductivityLine(models.TransientModel):
     completion_rate = fields.Float(string='Completion %')
     total_duration = fields.Integer(string='Total Duration (min)')
     avg_duration = fields.Float(string='Avg Duration (min)')
+    total_travel = fields.Integer(string='Travel Time (min)')
+    total_onsite = fields.Integer(string='On-Site Time (min)')
+    total_distance_km = fields.Float(string='Distance (km)')
 
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+from odoo import models, api
+
+
+class JobProductivity(models.Model):
+    """Keep the productivity fact table in sync with job changes."""
+
+    _inherit = 'property_fielder.job'
+
+    PRODUCTIVITY_FIELDS = {'inspector_id', 'scheduled_date', 'state', 'duration_minutes', 'route_id'}
+
+    def _productivity_pairs(self):
+        return {(job.inspector_id.id, job.scheduled_date) for job in self}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        jobs = super().create(vals_list)
+        self.env['property_fielder.inspector.productivity']._mark_dirty(jobs._productivity_pairs())
+        return jobs
+
+    def write(self, vals):
+        if not self.PRODUCTIVITY_FIELDS.intersection(vals):
+            return super().write(vals)
+        pairs = self._productivity_pairs()
+        result = super().write(vals)
+        pairs |= self._productivity_pairs()
+        self.env['property_fielder.inspector.productivity']._mark_dirty(pairs)
+        return result
+
+    def unlink(self):
+        self.env['property_fielder.inspector.productivity']._mark_dirty(self._productivity_pairs())
+        return super().unlink()
+
+
+class RouteProductivity(models.Model):
+    """Keep drive time and distance in the productivity fact table current."""
+
+    _inherit = 'property_fielder.route'
+
+    PRODUCTIVITY_FIELDS = {'inspector_id', 'route_date', 'total_drive_time_minutes', 'total_distance_km'}
+
+    def _productivity_pairs(self):
+        return {(route.inspector_id.id, route.route_date) for route in self}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        routes = super().create(vals_list)
+        self.env['property_fielder.inspector.productivity']._mark_dirty(routes._productivity_pairs())
+        return routes
+
+    def write(self, vals):
+        if not self.PRODUCTIVITY_FIELDS.intersection(vals):
+            return super().write(vals)
+        pairs = self._productivity_pairs()
+        result = super().write(vals)
+        pairs |= self._productivity_pairs()
+        self.env['property_fielder.inspector.productivity']._mark_dirty(pairs)
+        return result
+
+    def unlink(self):
+        self.env['property_fielder.inspector.productivity']._mark_dirty(self._productivity_pairs())
+        return super().unlink()
+
+
+class JobCheckinProductivity(models.Model):
+    """Feed on-site time from check-in durations into the fact table."""
+
+    _inherit = 'property_fielder.job.checkin'
+
+    def _productivity_pairs(self):
+        return {(checkin.job_id.inspector_id.id, checkin.job_id.scheduled_date) for checkin in self}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        checkins = super().create(vals_list)
+        self.env['property_fielder.inspector.productivity']._mark_dirty(checkins._productivity_pairs())
+        return checkins
+
+    def write(self, vals):
+        result = super().write(vals)
+        if {'checkin_time', 'checkout_time', 'job_id'}.intersection(vals):
+            self.env['property_fielder.inspector.productivity']._mark_dirty(self._productivity_pairs())
+        return result
+
+    def unlink(self):
+        self.env['property_fielder.inspector.productivity']._mark_dirty(self._productivity_pairs())
+        return super().unlink()
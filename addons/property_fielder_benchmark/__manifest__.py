@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+{
+    'name': 'Property Fielder Benchmark',
+    'version': '1.0.0',
+    'category': 'Fielder',
+    'summary': 'Synthetic load data and backend performance benchmarks',
+    'description': """
+Property Fielder Benchmark
+==========================
+
+Tooling to measure backend throughput on realistic data volumes:
+
+* Seeded, deterministic data generator (landlords, inspectors, properties,
+  certificates and jobs) with small / medium / large profiles up to
+  1M jobs, 50k properties and 500k certificates, created in chunked
+  batch inserts
+* Benchmark suite timing the optimizer request build and response
+  ingestion, mobile sync, compliance crons, dashboards, analytics,
+  imports and map queries (wall time and SQL query counts)
+
+Driven over XML-RPC by ``scripts/run_benchmarks.py``, which writes the
+results as JSON and flags regressions against a baseline run. Only
+system administrators can use it; install on benchmark databases only.
+    """,
+    'author': 'Property Fielder',
+    'website': 'https://www.propertyfielder.com',
+    'license': 'LGPL-3',
+    'depends': [
+        'property_fielder_field_service',
+        'property_fielder_field_service_mobile',
+        'property_fielder_property_management',
+        'property_fielder_analytics',
+    ],
+    'data': [],
+    'installable': True,
+    'application': False,
+    'auto_install': False,
+}
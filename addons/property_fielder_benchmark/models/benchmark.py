@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+import base64
+import json
+import logging
+import statistics
+import time as time_module
+from datetime import datetime, timedelta
+
+from odoo import models, fields, api, release, _
+from odoo.exceptions import UserError
+
+from .data_generator import CITIES, STREETS, bench_rng
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_REPEAT = 3
+MAX_REPEAT = 20
+# Viewports used by the map cases: (south, west, north, east, zoom)
+UK_VIEWPORT = (49.9, -8.2, 58.7, 1.8, 6)
+CENTRAL_LONDON_VIEWPORT = (51.49, -0.16, 51.53, -0.09, 15)
+GEO_QUERIES = 100
+MOBILE_SYNC_INSPECTORS = 20
+IMPORT_ROWS = 500
+
+
+class BenchmarkTimer:
+    """Measures the wall time and SQL queries of the timed part of a case."""
+
+    def __init__(self, env):
+        self.env = env
+        self.elapsed = 0.0
+        self.queries = 0
+
+    def __enter__(self):
+        self._queries = self.env.cr.sql_log_count
+        self._start = time_module.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            # Deferred ORM writes are part of the measured work
+            self.env.flush_all()
+        self.elapsed += time_module.perf_counter() - self._start
+        self.queries += self.env.cr.sql_log_count - self._queries
+
+
+class Benchmark(models.AbstractModel):
+    """Repeatable backend benchmark suite.
+
+    Each case runs ``repeat`` times inside a savepoint that is rolled back
+    afterwards, so cases that write (cron runs, imports, response
+    ingestion) leave the dataset unchanged and every run starts from the
+    same state. Only the part of a case wrapped in its timer is measured;
+    caches that the case exercises are cleared first, so figures are cold.
+
+    Cases are declared by ``_benchmark_cases``; other addons extend it.
+    """
+    _name = 'property_fielder.benchmark'
+    _description = 'Performance Benchmark Suite'
+
+    @api.model
+    def _benchmark_cases(self):
+        """Benchmark cases: {name: method}, each method(timer, seed) -> stats dict."""
+        return {
+            'optimizer.build_request': '_bench_optimizer_build_request',
+            'optimizer.ingest_response': '_bench_optimizer_ingest_response',
+            'mobile.sync': '_bench_mobile_sync',
+            'cron.certification_status': '_bench_cron_certification_status',
+            'cron.certification_expiry_reminders': '_bench_cron_expiry_reminders',
+            'dashboard.field_service': '_bench_dashboard_field_service',
+            'dashboard.compliance': '_bench_dashboard_compliance',
+            'analytics.compliance_trend': '_bench_analytics_compliance_trend',
+            'analytics.cost_breakdown': '_bench_analytics_cost_breakdown',
+            'import.properties': '_bench_import_properties',
+            'map.viewport_clustered': '_bench_map_viewport_clustered',
+            'map.viewport_detailed': '_bench_map_viewport_detailed',
+            'geo.nearest': '_bench_geo_nearest',
+        }
+
+    @api.model
+    def run(self, cases=None, repeat=DEFAULT_REPEAT, seed=42):
+        """Run the benchmark cases and return their measurements.
+
+        :param cases: names of the cases to run (default all)
+        :return: {'server_version', 'database', 'started_at', 'repeat',
+                  'dataset': {model: count}, 'cases': {name: result}}
+        """
+        self.env['property_fielder.benchmark.generator']._check_benchmark_access()
+        available = self._benchmark_cases()
+        unknown = set(cases or []) - set(available)
+        if unknown:
+            raise UserError(_('Unknown benchmark cases: %s') % ', '.join(sorted(unknown)))
+        repeat = max(1, min(int(repeat), MAX_REPEAT))
+        report = {
+            'server_version': release.version,
+            'database': self.env.cr.dbname,
+            'started_at': fields.Datetime.to_string(fields.Datetime.now()),
+            'repeat': repeat,
+            'dataset': self._dataset_counts(),
+            'cases': {},
+        }
+        for name, method in available.items():
+            if cases and name not in cases:
+                continue
+            report['cases'][name] = self._run_case(name, getattr(self, method), repeat, seed)
+        return report
+
+    @api.model
+    def _run_case(self, name, method, repeat, seed):
+        timings, queries, stats = [], [], {}
+        for _iteration in range(repeat):
+            timer = BenchmarkTimer(self.env)
+            try:
+                with self.env.cr.savepoint() as savepoint:
+                    stats = method(timer, seed) or {}
+                    savepoint.rollback()
+            except Exception as e:
+                _logger.warning('Benchmark case %s failed', name, exc_info=True)
+                return {'error': str(e)}
+            finally:
+                self.env.invalidate_all()
+            timings.append(timer.elapsed * 1000.0)
+            queries.append(timer.queries)
+        _logger.info('Benchmark %s: median %.1f ms, %d queries',
+                     name, statistics.median(timings), statistics.median(queries))
+        return dict(
+            stats,
+            runs=repeat,
+            median_ms=round(statistics.median(timings), 2),
+            min_ms=round(min(timings), 2),
+            max_ms=round(max(timings), 2),
+            queries=int(statistics.median(queries)),
+        )
+
+    @api.model
+    def _dataset_counts(self):
+        models_to_count = [
+            'res.partner', 'property_fielder.inspector', 'property_fielder.property',
+            'property_fielder.property.certification', 'property_fielder.job',
+            'property_fielder.route',
+        ]
+        return {name: self.env[name].sudo().with_context(active_test=False).search_count([])
+                for name in models_to_count}
+
+    @api.model
+    def _payload_size(self, payload):
+        return len(json.dumps(payload, default=str))
+
+    @api.model
+    def _busiest_date(self):
+        """Scheduling day with the most open jobs, the optimizer's worst case."""
+        groups = self.env['property_fielder.job']._read_group(
+            [('state', 'in', ['draft', 'pending', 'assigned'])],
+            ['scheduled_date:day'], ['__count'], order='__count desc', limit=1,
+        )
+        if not groups:
+            raise UserError(_('No open jobs to benchmark; generate benchmark data first.'))
+        return groups[0][0]
+
+    # ------------------------------------------------------------------
+    # Optimizer
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _new_optimization(self):
+        date = self._busiest_date()
+        jobs = self.env['property_fielder.job'].search([
+            ('scheduled_date', '=', date),
+            ('state', 'in', ['draft', 'pending', 'assigned']),
+        ])
+        return self.env['property_fielder.optimization'].create({
+            'name': 'Benchmark',
+            'optimization_date': date,
+            'job_ids': [(6, 0, jobs.ids)],
+            'inspector_ids': [(6, 0, self.env['property_fielder.inspector'].search([]).ids)],
+        })
+
+    @api.model
+    def _bench_optimizer_build_request(self, timer, seed):
+        optimization = self._new_optimization()
+        optimization.invalidate_recordset()
+        with timer:
+            payload = optimization._build_timefold_request()
+        return {'visits': len(payload['visits']), 'vehicles': len(payload['vehicles']),
+                'bytes': self._payload_size(payload)}
+
+    @api.model
+    def _bench_optimizer_ingest_response(self, timer, seed):
+        """Ingest a synthetic solution spreading the visits round-robin."""
+        optimization = self._new_optimization()
+        payload = optimization._build_timefold_request()
+        vehicles = [{'id': vehicle['id'], 'visits': [], 'totalDrivingTimeSeconds': 0}
+                    for vehicle in payload['vehicles']]
+        visits = []
+        for index, visit in enumerate(payload['visits']):
+            vehicle = vehicles[index % len(vehicles)]
+            arrival = datetime.combine(optimization.optimization_date, datetime.min.time()) \
+                + timedelta(hours=8, minutes=45 * len(vehicle['visits']))
+            vehicle['visits'].append(visit['id'])
+            vehicle['totalDrivingTimeSeconds'] += 900
+            visits.append({
+                'id': visit['id'],
+                'vehicle': vehicle['id'],
+                'arrivalTime': arrival.isoformat(),
+                'departureTime': (arrival + timedelta(milliseconds=visit['serviceDuration'])).isoformat(),
+            })
+        result = {'score': '0hard/0soft', 'vehicles': vehicles, 'visits': visits}
+        optimization.invalidate_recordset()
+        with timer:
+            optimization._process_timefold_response(result)
+        return {'visits': len(visits), 'vehicles': len(vehicles)}
+
+    # ------------------------------------------------------------------
+    # Mobile
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _bench_mobile_sync(self, timer, seed):
+        """Sync payloads of the inspectors with the most jobs today."""
+        today = fields.Date.context_today(self)
+        groups = self.env['property_fielder.job']._read_group(
+            [('scheduled_date', 'in', [today, today + timedelta(days=1)]),
+             ('inspector_id', '!=', False)],
+            ['inspector_id'], ['__count'], order='__count desc', limit=MOBILE_SYNC_INSPECTORS,
+        )
+        inspectors = [inspector for inspector, _count in groups]
+        Sync = self.env['property_fielder.mobile.sync']
+        payloads = []
+        with timer:
+            for inspector in inspectors:
+                payloads.append(Sync._sync_payload(inspector, today))
+        return {'inspectors': len(inspectors),
+                'jobs': sum(len(payload['jobs']) for payload in payloads),
+                'bytes': sum(self._payload_size(payload) for payload in payloads)}
+
+    # ------------------------------------------------------------------
+    # Crons
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _bench_cron_certification_status(self, timer, seed):
+        with timer:
+            self.env['property_fielder.property.certification']._cron_update_certification_status()
+
+    @api.model
+    def _bench_cron_expiry_reminders(self, timer, seed):
+        Mail = self.env['mail.mail'].sudo()
+        before = Mail.search_count([])
+        with timer:
+            self.env['property_fielder.property.certification']._cron_send_expiry_reminders()
+        return {'mails': Mail.search_count([]) - before}
+
+    # ------------------------------------------------------------------
+    # Dashboards and analytics
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _bench_dashboard_field_service(self, timer, seed):
+        self.env.registry.clear_cache()
+        with timer:
+            data = self.env['property_fielder.field.service.dashboard'].get_dashboard_data()
+        return {'bytes': self._payload_size(data)}
+
+    @api.model
+    def _bench_dashboard_compliance(self, timer, seed):
+        Dashboard = self.env['property_fielder.compliance.dashboard']
+        stat_fields = [name for name, field in Dashboard._fields.items()
+                       if field.compute and not field.store]
+        with timer:
+            Dashboard.create({}).read(stat_fields)
+
+    @api.model
+    def _bench_analytics_compliance_trend(self, timer, seed):
+        self.env.registry.clear_cache()
+        today = fields.Date.context_today(self)
+        with timer:
+            series = self.env['property_fielder.compliance.analytics'].get_trend_series(
+                today - timedelta(days=365), today, 'week')
+        return {'points': len(series)}
+
+    @api.model
+    def _bench_analytics_cost_breakdown(self, timer, seed):
+        today = fields.Date.context_today(self)
+        with timer:
+            breakdown = self.env['property_fielder.cost.analysis'].get_cost_breakdown(
+                today - timedelta(days=90), today)
+        return {'bytes': self._payload_size(breakdown)}
+
+    # ------------------------------------------------------------------
+    # Imports
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _bench_import_properties(self, timer, seed):
+        lines = ['name,street,city,postcode,property_type,bedrooms,bathrooms,owner_name,owner_email']
+        for i in range(IMPORT_ROWS):
+            rng = bench_rng(seed, 'import', i)
+            street = '%d %s' % (rng.randint(1, 400), rng.choice(STREETS))
+            lines.append('Import %s %d,%s,%s,IM%d %dAA,flat,%d,1,Import Landlord %d,import%d@bench.invalid' % (
+                seed, i, street, rng.choice(CITIES)[0], rng.randint(1, 20), rng.randint(1, 9),
+                rng.randint(1, 4), i % 50, i % 50,
+            ))
+        wizard = self.env['property_fielder.bulk.import.properties.wizard'].create({
+            'file': base64.b64encode('\n'.join(lines).encode()),
+            'filename': 'benchmark.csv',
+        })
+        with timer:
+            wizard.action_import()
+        return {'rows': IMPORT_ROWS}
+
+    # ------------------------------------------------------------------
+    # Maps
+    # ------------------------------------------------------------------
+
+    @api.model
+    def _bench_viewport(self, timer, viewport):
+        self.env.registry.clear_cache()
+        Tiles = self.env['property_fielder.map.tiles']
+        south, west, north, east, zoom = viewport
+        stats = {}
+        with timer:
+            for layer in ('jobs', 'properties'):
+                data = Tiles.get_viewport(layer, south, west, north, east, zoom)
+                stats['%s_tiles' % layer] = len(data['tiles'])
+                stats['%s_bytes' % layer] = self._payload_size(data)
+        return stats
+
+    @api.model
+    def _bench_map_viewport_clustered(self, timer, seed):
+        return self._bench_viewport(timer, UK_VIEWPORT)
+
+    @api.model
+    def _bench_map_viewport_detailed(self, timer, seed):
+        return self._bench_viewport(timer, CENTRAL_LONDON_VIEWPORT)
+
+    @api.model
+    def _bench_geo_nearest(self, timer, seed):
+        """Nearest properties around points spread like the generated data."""
+        points = []
+        for i in range(GEO_QUERIES):
+            rng = bench_rng(seed, 'geo', i)
+            _city, lat, lng, _weight = rng.choice(CITIES)
+            points.append((lat + rng.gauss(0, 0.05), lng + rng.gauss(0, 0.08)))
+        Property = self.env['property_fielder.property']
+        found = 0
+        with timer:
+            for lat, lng in points:
+                found += len(Property._geo_nearest(lat, lng, k=5))
+        return {'queries_run': GEO_QUERIES, 'found': found}
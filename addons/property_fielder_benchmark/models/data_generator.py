@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import random
+from datetime import datetime, time, timedelta
+
+from odoo import models, fields, api, _
+from odoo.exceptions import AccessError, UserError
+
+_logger = logging.getLogger(__name__)
+
+# Record counts per profile; certificates are spread evenly over properties
+PROFILES = {
+    'small': {
+        'owners': 500, 'inspectors': 20, 'properties': 5000,
+        'certificates': 50000, 'jobs': 10000, 'days': 20,
+    },
+    'medium': {
+        'owners': 5000, 'inspectors': 100, 'properties': 50000,
+        'certificates': 500000, 'jobs': 100000, 'days': 60,
+    },
+    'large': {
+        'owners': 5000, 'inspectors': 500, 'properties': 50000,
+        'certificates': 500000, 'jobs': 1000000, 'days': 250,
+    },
+}
+
+# Generation order: each entity references the ones before it
+ENTITIES = ['owners', 'inspectors', 'properties', 'certificates', 'jobs']
+
+# model, key field and key letter of each entity
+ENTITY_MODELS = {
+    'owners': ('res.partner', 'ref', 'O'),
+    'inspectors': ('property_fielder.inspector', 'name', 'I'),
+    'properties': ('property_fielder.property', 'property_number', 'P'),
+    'certificates': ('property_fielder.property.certification', 'name', 'C'),
+    'jobs': ('property_fielder.job', 'job_number', 'J'),
+}
+
+MAX_BATCH_SIZE = 5000
+
+# (city, latitude, longitude, weight): where generated properties cluster
+CITIES = [
+    ('London', 51.5074, -0.1278, 35),
+    ('Birmingham', 52.4862, -1.8904, 10),
+    ('Manchester', 53.4808, -2.2426, 10),
+    ('Leeds', 53.8008, -1.5491, 8),
+    ('Glasgow', 55.8642, -4.2518, 7),
+    ('Liverpool', 53.4084, -2.9916, 7),
+    ('Bristol', 51.4545, -2.5879, 6),
+    ('Newcastle', 54.9783, -1.6178, 6),
+    ('Cardiff', 51.4816, -3.1791, 5),
+    ('Edinburgh', 55.9533, -3.1883, 6),
+]
+CITY_WEIGHTS = [city[3] for city in CITIES]
+STREETS = ['High Street', 'Station Road', 'Church Lane', 'Victoria Road', 'Park Avenue',
+           'Mill Lane', 'Queens Road', 'Green Lane', 'Kings Road', 'London Road']
+FIRST_NAMES = ['Amelia', 'Oliver', 'Isla', 'George', 'Ava', 'Harry', 'Mia', 'Jack',
+               'Grace', 'Noah', 'Sophie', 'Leo', 'Emily', 'Oscar', 'Priya', 'Mohammed']
+LAST_NAMES = ['Smith', 'Jones', 'Taylor', 'Brown', 'Williams', 'Wilson', 'Patel',
+              'Evans', 'Khan', 'Thomas', 'Roberts', 'Walker', 'Wright', 'Hughes']
+PROPERTY_TYPES = ['flat', 'house', 'maisonette', 'bungalow', 'commercial']
+PROPERTY_TYPE_WEIGHTS = [45, 35, 10, 7, 3]
+PRIORITY_WEIGHTS = [20, 60, 15, 5]
+
+
+def bench_key(seed, entity, index):
+    """Stable identifier of the ``index``-th generated record of an entity."""
+    return 'BENCH-%s-%s%07d' % (seed, ENTITY_MODELS[entity][2], index)
+
+
+def bench_rng(seed, entity, index, salt=''):
+    """Random generator of one record, independent of batch boundaries."""
+    return random.Random('%s:%s:%s:%s' % (seed, entity, index, salt))
+
+
+def property_location(seed, index):
+    """(city, street, latitude, longitude) of a generated property."""
+    rng = bench_rng(seed, 'properties', index, 'location')
+    city, lat, lng, _weight = rng.choices(CITIES, weights=CITY_WEIGHTS)[0]
+    street = '%d %s' % (rng.randint(1, 250), rng.choice(STREETS))
+    return (city, street, round(lat + rng.gauss(0, 0.05), 6),
+            round(lng + rng.gauss(0, 0.08), 6))
+
+
+class BenchmarkDataGenerator(models.AbstractModel):
+    """Deterministic synthetic data for load tests and benchmarks.
+
+    Every record is derived from (seed, entity, index) only, so a profile
+    generated in any batch size, or resumed after an interruption, gives
+    the same data. Records carry a ``BENCH-<seed>-`` key, which is how
+    references between entities are resolved and how ``purge`` finds
+    them. Batches are created with one multi-record ``create`` and no
+    mail tracking; each RPC call is its own transaction.
+    """
+    _name = 'property_fielder.benchmark.generator'
+    _description = 'Benchmark Data Generator'
+
+    @api.model
+    def _check_benchmark_access(self):
+        if not self.env.is_system():
+            raise AccessError(_('Only administrators can generate benchmark data.'))
+
+    @api.model
+    def get_profiles(self):
+        return PROFILES
+
+    @api.model
+    def generate(self, profile, seed, entity, offset=0, limit=1000, start_date=None):
+        """Create the records ``offset`` to ``offset + limit`` of an entity.
+
+        Records that already exist are skipped, so a run can be resumed.
+
+        :param start_date: first scheduling day of the job window (default today)
+        :return: {'entity', 'total', 'created', 'next_offset'} where
+                 ``next_offset`` is False once the entity is complete
+        """
+        self._check_benchmark_access()
+        if profile not in PROFILES:
+            raise UserError(_('Unknown benchmark profile %s.') % profile)
+        if entity not in ENTITIES:
+            raise UserError(_('Unknown benchmark entity %s.') % entity)
+        config = PROFILES[profile]
+        total = config[entity]
+        limit = max(1, min(int(limit), MAX_BATCH_SIZE))
+        indexes = range(offset, min(offset + limit, total))
+
+        model_name = ENTITY_MODELS[entity][0]
+        existing = self._key_ids(entity, [bench_key(seed, entity, i) for i in indexes])
+        indexes = [i for i in indexes if bench_key(seed, entity, i) not in existing]
+        start_date = fields.Date.to_date(start_date) or fields.Date.context_today(self)
+
+        vals_list = getattr(self, '_generate_%s' % entity)(seed, config, indexes, start_date)
+        if vals_list:
+            self.env[model_name].with_context(
+                tracking_disable=True,
+                mail_create_nolog=True,
+                mail_create_nosubscribe=True,
+                mail_notrack=True,
+            ).create(vals_list)
+        next_offset = offset + limit
+        _logger.info('Benchmark data %s/%s: %d %s created (%d-%d of %d)',
+                     profile, seed, len(vals_list), entity, offset, next_offset, total)
+        return {
+            'entity': entity,
+            'total': total,
+            'created': len(vals_list),
+            'next_offset': next_offset if next_offset < total else False,
+        }
+
+    @api.model
+    def purge(self, seed, entity, limit=1000):
+        """Delete up to ``limit`` generated records of an entity.
+
+        :return: number of records deleted (0 once none are left)
+        """
+        self._check_benchmark_access()
+        model_name, key_field, letter = ENTITY_MODELS[entity]
+        records = self.env[model_name].with_context(active_test=False).search(
+            [(key_field, '=like', 'BENCH-%s-%s%%' % (seed, letter))],
+            limit=max(1, min(int(limit), MAX_BATCH_SIZE)),
+        )
+        count = len(records)
+        records.unlink()
+        return count
+
+    @api.model
+    def _key_ids(self, entity, keys):
+        """{key: id} of the generated records among ``keys``."""
+        if not keys:
+            return {}
+        model_name, key_field, _letter = ENTITY_MODELS[entity]
+        rows = self.env[model_name].with_context(active_test=False).search_read(
+            [(key_field, 'in', list(keys))], [key_field],
+        )
+        return {row[key_field]: row['id'] for row in rows}
+
+    @api.model
+    def _resolve(self, seed, entity, indexes):
+        """{index: id} of referenced records, which must exist already."""
+        keys = {i: bench_key(seed, entity, i) for i in set(indexes)}
+        ids = self._key_ids(entity, keys.values())
+        missing = [key for key in keys.values() if key not in ids]
+        if missing:
+            raise UserError(_('Generate %(entity)s first: %(key)s is missing.',
+                              entity=entity, key=missing[0]))
+        return {i: ids[key] for i, key in keys.items()}
+
+    # ------------------------------------------------------------------
+    # Entities
+    # ------------------------------------------------------------------
+
+    def _generate_owners(self, seed, config, indexes, start_date):
+        vals_list = []
+        for i in indexes:
+            rng = bench_rng(seed, 'owners', i)
+            is_company = rng.random() < 0.3
+            if is_company:
+                name = '%s %s Lettings Ltd' % (rng.choice(LAST_NAMES), rng.choice(STREETS).split()[0])
+            else:
+                name = '%s %s' % (rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))
+            vals_list.append({
+                'name': name,
+                'ref': bench_key(seed, 'owners', i),
+                'is_company': is_company,
+                'email': 'landlord%d.%s@bench.invalid' % (i, seed),
+                'city': rng.choice(CITIES)[0],
+            })
+        return vals_list
+
+    def _generate_inspectors(self, seed, config, indexes, start_date):
+        vals_list = []
+        for i in indexes:
+            rng = bench_rng(seed, 'inspectors', i)
+            _city, _street, lat, lng = property_location(seed, rng.randrange(config['properties']))
+            shift_start = rng.choice([7.0, 7.5, 8.0, 8.5, 9.0])
+            vals_list.append({
+                'name': bench_key(seed, 'inspectors', i),
+                'email': 'inspector%d.%s@bench.invalid' % (i, seed),
+                'home_latitude': lat,
+                'home_longitude': lng,
+                'shift_start': shift_start,
+                'shift_end': shift_start + rng.choice([8.0, 9.0, 10.0]),
+                'max_jobs_per_day': rng.randint(6, 10),
+                'vehicle_capacity': rng.randint(6, 10),
+            })
+        return vals_list
+
+    def _generate_properties(self, seed, config, indexes, start_date):
+        owners = self._resolve(seed, 'owners', [i % config['owners'] for i in indexes])
+        vals_list = []
+        for i in indexes:
+            rng = bench_rng(seed, 'properties', i)
+            city, street, lat, lng = property_location(seed, i)
+            vals_list.append({
+                'name': '%s, %s' % (street, city),
+                'property_number': bench_key(seed, 'properties', i),
+                'property_type': rng.choices(PROPERTY_TYPES, weights=PROPERTY_TYPE_WEIGHTS)[0],
+                'state': 'active',
+                'street': street,
+                'city': city,
+                'zip': '%s%d %d%s' % (city[:2].upper(), rng.randint(1, 28), rng.randint(1, 9),
+                                      ''.join(rng.choice('ABDEFGHJLNPQRSTUWXYZ') for _x in range(2))),
+                'latitude': lat,
+                'longitude': lng,
+                'bedrooms': rng.randint(1, 5),
+                'partner_id': owners[i % config['owners']],
+            })
+        return vals_list
+
+    def _generate_certificates(self, seed, config, indexes, start_date):
+        cert_types = self.env['property_fielder.certification.type'].search([], order='id')
+        if not cert_types:
+            raise UserError(_('Benchmark certificates need at least one certification type.'))
+        per_property = max(1, config['certificates'] // config['properties'])
+        properties = self._resolve(seed, 'properties', [i // per_property for i in indexes])
+        today = fields.Date.context_today(self)
+        vals_list = []
+        for i in indexes:
+            rng = bench_rng(seed, 'certificates', i)
+            cert_type = cert_types[i % len(cert_types)]
+            # Mostly valid, with a tail of expiring and expired certificates
+            expiry = today + timedelta(days=rng.randint(-90, cert_type.validity_period or 365))
+            vals_list.append({
+                'name': bench_key(seed, 'certificates', i),
+                'property_id': properties[i // per_property],
+                'certification_type_id': cert_type.id,
+                'issue_date': expiry - timedelta(days=cert_type.validity_period or 365),
+                'expiry_date': expiry,
+            })
+        return vals_list
+
+    def _generate_jobs(self, seed, config, indexes, start_date):
+        draws = {i: bench_rng(seed, 'jobs', i) for i in indexes}
+        property_index = {i: draws[i].randrange(config['properties']) for i in indexes}
+        inspector_index = {i: draws[i].randrange(config['inspectors']) for i in indexes}
+        properties = self._resolve(seed, 'properties', property_index.values())
+        owners = self._resolve(seed, 'owners', [p % config['owners'] for p in property_index.values()])
+        inspectors = self._resolve(seed, 'inspectors', inspector_index.values())
+        country = self.env.ref('base.uk')
+        today = fields.Date.context_today(self)
+        days = config['days']
+
+        vals_list = []
+        for i in indexes:
+            rng = draws[i]
+            prop = property_index[i]
+            city, street, lat, lng = property_location(seed, prop)
+            scheduled_date = start_date + timedelta(days=i % days)
+            earliest = datetime.combine(scheduled_date, time(8)) + timedelta(minutes=30 * rng.randint(0, 12))
+            roll = rng.random()
+            if roll < 0.03:
+                state, inspector_id = 'cancelled', False
+            elif scheduled_date < today:
+                state, inspector_id = 'completed', inspectors[inspector_index[i]]
+            elif roll < 0.6:
+                state, inspector_id = 'assigned', inspectors[inspector_index[i]]
+            else:
+                state, inspector_id = 'draft', False
+            vals_list.append({
+                'name': 'Compliance inspection %s' % street,
+                'job_number': bench_key(seed, 'jobs', i),
+                'partner_id': owners[prop % config['owners']],
+                'property_id': properties[prop],
+                'street': street,
+                'city': city,
+                'country_id': country.id,
+                'latitude': lat,
+                'longitude': lng,
+                'scheduled_date': scheduled_date,
+                'earliest_start': earliest,
+                'latest_end': earliest + timedelta(hours=rng.choice([2, 3, 4])),
+                'duration_minutes': rng.choice([30, 45, 60, 90]),
+                'priority': rng.choices(['0', '1', '2', '3'], weights=PRIORITY_WEIGHTS)[0],
+                'state': state,
+                'inspector_id': inspector_id,
+            })
+        return vals_list
@@ -42,6 +42,7 @@ Fault Code Categories:
         'data/ir_sequence_data.xml',
         'data/fault_code_data.xml',
         'data/contractor_email_template.xml',
+        'data/cron_data.xml',
         # Wizards
         'wizards/assign_contractor_wizard_views.xml',
         # Views
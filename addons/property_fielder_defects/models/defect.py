@@ -3,6 +3,20 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 from datetime import timedelta
+import logging
+
+_logger = logging.getLogger(__name__)
+
+# States in which a defect no longer counts against its SLA
+CLOSED_STATES = ['fixed', 'verified', 'closed']
+
+# Lower bound (days overdue) of each overdue bucket, ascending
+OVERDUE_BUCKETS = [
+    (1, '1_7'),
+    (8, '8_30'),
+    (31, '31_90'),
+    (91, '90_plus'),
+]
 
 
 class Defect(models.Model):
@@ -114,6 +128,7 @@ class Defect(models.Model):
         string='Deadline Date',
         compute='_compute_deadline_date',
         store=True,
+        index=True,
         tracking=True,
         help='SLA deadline for remediation'
     )
@@ -138,21 +153,35 @@ class Defect(models.Model):
         ('fixed', 'Fixed'),
         ('verified', 'Verified'),
         ('closed', 'Closed'),
-    ], string='Status', default='reported', required=True, tracking=True)
+    ], string='Status', default='reported', required=True, index=True, tracking=True)
     
     # SLA tracking
+    # is_breached and overdue_bucket are time-dependent; the scheduled SLA
+    # sweep (_cron_sla_sweep) recomputes them for defects whose deadline
+    # crossed a boundary since the previous sweep.
     is_breached = fields.Boolean(
         string='SLA Breached',
         compute='_compute_is_breached',
         store=True,
+        index=True,
         help='True if deadline has passed without resolution'
     )
     
     days_overdue = fields.Integer(
         string='Days Overdue',
         compute='_compute_days_overdue',
+        search='_search_days_overdue',
         help='Number of days past deadline'
     )
+
+    overdue_bucket = fields.Selection([
+        ('none', 'Not Overdue'),
+        ('1_7', '1-7 Days'),
+        ('8_30', '8-30 Days'),
+        ('31_90', '31-90 Days'),
+        ('90_plus', '90+ Days'),
+    ], string='Overdue Bucket', compute='_compute_overdue_bucket', store=True, index=True,
+        help='Days-overdue band, refreshed by the SLA sweep')
     
     # Contractor assignment
     assigned_contractor_id = fields.Many2one(
@@ -274,9 +303,9 @@ class Defect(models.Model):
     @api.depends('deadline_date', 'state')
     def _compute_is_breached(self):
         """Check if SLA is breached."""
-        today = fields.Date.today()
+        today = fields.Date.context_today(self)
         for record in self:
-            if record.state in ['fixed', 'verified', 'closed']:
+            if record.state in CLOSED_STATES:
                 record.is_breached = False
             elif record.deadline_date and today > record.deadline_date:
                 record.is_breached = True
@@ -285,13 +314,58 @@ class Defect(models.Model):
 
     def _compute_days_overdue(self):
         """Compute days overdue."""
-        today = fields.Date.today()
+        today = fields.Date.context_today(self)
         for record in self:
-            if record.deadline_date and today > record.deadline_date:
+            if (record.state not in CLOSED_STATES and record.deadline_date
+                    and today > record.deadline_date):
                 record.days_overdue = (today - record.deadline_date).days
             else:
                 record.days_overdue = 0
 
+    def _search_days_overdue(self, operator, value):
+        """Translate a days-overdue condition into an indexed deadline domain."""
+        if operator not in ('>', '>=', '<', '<=', '='):
+            raise ValidationError(_('Unsupported operator %s for Days Overdue') % operator)
+        today = fields.Date.context_today(self)
+        value = int(value or 0)
+
+        def overdue_more_than(days):
+            # days_overdue > days  <=>  open and deadline_date < today - days
+            if days < 0:
+                return [('id', '!=', False)]
+            return [
+                ('state', 'not in', CLOSED_STATES),
+                ('deadline_date', '<', today - timedelta(days=days)),
+            ]
+
+        if operator == '>':
+            return overdue_more_than(value)
+        if operator == '>=':
+            return overdue_more_than(value - 1)
+        if operator == '<':
+            return ['!'] + overdue_more_than(value - 1)
+        if operator == '<=':
+            return ['!'] + overdue_more_than(value)
+        if value <= 0:
+            return ['!'] + overdue_more_than(0)
+        return [
+            ('state', 'not in', CLOSED_STATES),
+            ('deadline_date', '=', today - timedelta(days=value)),
+        ]
+
+    @api.depends('deadline_date', 'state')
+    def _compute_overdue_bucket(self):
+        """Assign the stored days-overdue bucket."""
+        today = fields.Date.context_today(self)
+        for record in self:
+            bucket = 'none'
+            if record.state not in CLOSED_STATES and record.deadline_date:
+                days = (today - record.deadline_date).days
+                for lower_bound, code in OVERDUE_BUCKETS:
+                    if days >= lower_bound:
+                        bucket = code
+            record.overdue_bucket = bucket
+
     @api.depends('photo_ids')
     def _compute_photo_count(self):
         for record in self:
@@ -317,6 +391,53 @@ class Defect(models.Model):
                 ) or _('New')
         return super().create(vals_list)
 
+    # ============================================================
+    # SLA SWEEP
+    # ============================================================
+
+    @api.model
+    def _cron_sla_sweep(self):
+        """Incrementally refresh time-dependent SLA fields.
+
+        Only defects whose deadline (or an overdue bucket boundary) was
+        crossed between the previous sweep and today are recomputed, so the
+        cost is proportional to the number of state changes rather than the
+        number of open defects.
+        """
+        ICP = self.env['ir.config_parameter'].sudo()
+        param = 'property_fielder_defects.sla_last_sweep'
+        today = fields.Date.context_today(self)
+        last_sweep = fields.Date.to_date(ICP.get_param(param) or False)
+        if last_sweep and last_sweep >= today:
+            return 0
+
+        open_domain = [('state', 'not in', CLOSED_STATES), ('deadline_date', '!=', False)]
+        if not last_sweep:
+            # First run: everything currently past its deadline
+            domain = open_domain + [('deadline_date', '<', today)]
+        else:
+            # Defects crossing day 0 (breach) or a bucket boundary since last sweep:
+            # days_overdue >= N today but not at the last sweep
+            boundaries = [lower for lower, __ in OVERDUE_BUCKETS]
+            crossing = []
+            for lower in boundaries:
+                crossing.append(['&',
+                    ('deadline_date', '<=', today - timedelta(days=lower)),
+                    ('deadline_date', '>', last_sweep - timedelta(days=lower)),
+                ])
+            domain = open_domain + ['|'] * (len(crossing) - 1) + [
+                leaf for condition in crossing for leaf in condition
+            ]
+
+        defects = self.search(domain)
+        if defects:
+            self.env.add_to_compute(self._fields['is_breached'], defects)
+            self.env.add_to_compute(self._fields['overdue_bucket'], defects)
+            defects.flush_recordset(['is_breached', 'overdue_bucket'])
+        ICP.set_param(param, fields.Date.to_string(today))
+        _logger.info('Defect SLA sweep refreshed %d defects', len(defects))
+        return len(defects)
+
     # ============================================================
     # ACTIONS
     # ============================================================
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 {
     'name': 'Property Fielder Field Service',
-    'version': '1.0.2',  # Auto-assign Field Service/User group to inspector users
+    'version': '1.0.9',  # Optimization result cache, compressed payloads
     'category': 'Fielder',
     'summary': 'AI-Powered Job Dispatch and Route Optimization',
     'description': """
@@ -43,6 +43,7 @@ Technical:
         'base',
         'web',
         'mail',
+        'bus',  # Dispatch board live updates
         'contacts',
         'hr',  # For employee/inspector management
         'project',  # For job/task management
@@ -68,6 +69,7 @@ Technical:
         'views/dispatch_view.xml',  # Must load before dashboard (dashboard references dispatch actions)
         'views/dashboard.xml',
         'views/appointment_portal_templates.xml',
+        'views/perf_metric_views.xml',
         'views/menu.xml',  # Load menu last after all actions are defined
 
         # Wizards
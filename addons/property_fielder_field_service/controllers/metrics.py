@@ -0,0 +1,32 @@
+# -*- coding: utf-8 -*-
+
+import hmac
+
+from odoo import http
+from odoo.http import request
+
+from ..models.perf_metrics import flush
+
+
+class MetricsController(http.Controller):
+
+    @http.route('/metrics', type='http', auth='none', methods=['GET'], csrf=False, save_session=False)
+    def prometheus_metrics(self, **kwargs):
+        """Prometheus scrape endpoint.
+
+        Requires ``Authorization: Bearer <token>`` matching the
+        ``property_fielder.metrics_token`` system parameter; disabled while
+        that parameter is unset.
+        """
+        token = request.env['ir.config_parameter'].sudo().get_param('property_fielder.metrics_token')
+        authorization = request.httprequest.headers.get('Authorization', '')
+        if not token or not hmac.compare_digest(authorization.encode(), ('Bearer %s' % token).encode()):
+            return request.make_response('Unauthorized', status=401, headers=[
+                ('Content-Type', 'text/plain'), ('WWW-Authenticate', 'Bearer'),
+            ])
+        # Include what this worker measured since its last flush
+        flush(request.env.registry)
+        body = request.env['property_fielder.perf.metric'].sudo()._prometheus_text()
+        return request.make_response(body, headers=[
+            ('Content-Type', 'text/plain; version=0.0.4; charset=utf-8'),
+        ])
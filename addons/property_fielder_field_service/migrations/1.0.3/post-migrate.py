@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+
+def migrate(cr, version):
+    """Confirmation tokens moved from a clear-text job column to a hashed table."""
+    cr.execute("""
+        SELECT 1 FROM information_schema.columns
+         WHERE table_name = 'property_fielder_job' AND column_name = 'confirmation_token'
+    """)
+    if not cr.fetchone():
+        return
+    # Keep links that were already sent working until they expire
+    cr.execute("""
+        INSERT INTO property_fielder_job_token (token_hash, job_id, expiry)
+        SELECT encode(sha256(convert_to(confirmation_token, 'UTF8')), 'hex'),
+               id, confirmation_token_expiry
+          FROM property_fielder_job
+         WHERE confirmation_token IS NOT NULL
+           AND confirmation_token_expiry > (now() at time zone 'UTC')
+        ON CONFLICT DO NOTHING
+    """)
+    cr.execute("ALTER TABLE property_fielder_job DROP COLUMN confirmation_token")
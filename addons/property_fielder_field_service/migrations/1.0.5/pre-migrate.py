@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+
+
+def migrate(cr, version):
+    """Fill the new stored ``start_eligible_at`` column in SQL.
+
+    Creating the column here stops the ORM from recomputing every job
+    one record at a time when the module is updated.
+    """
+    cr.execute("""
+        ALTER TABLE property_fielder_job
+        ADD COLUMN IF NOT EXISTS start_eligible_at timestamp without time zone
+    """)
+    cr.execute("""
+        UPDATE property_fielder_job
+           SET start_eligible_at = CASE
+                   WHEN is_emergency_access AND COALESCE(emergency_access_reason, '') != ''
+                       THEN COALESCE(LEAST(tenant_notified_at + interval '24 hours', write_date),
+                                     now() at time zone 'UTC')
+                   WHEN tenant_notified AND tenant_notified_at IS NOT NULL
+                       THEN tenant_notified_at + interval '24 hours'
+               END
+    """)
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+from odoo import api, SUPERUSER_ID
+
+from odoo.addons.property_fielder_field_service.models.optimization import pack_payload
+
+_logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 100
+
+
+def migrate(cr, version):
+    """Optimization payloads moved from indented JSON text columns to gzipped attachments."""
+    cr.execute("""
+        SELECT 1 FROM information_schema.columns
+         WHERE table_name = 'property_fielder_optimization' AND column_name = 'request_json'
+    """)
+    if not cr.fetchone():
+        return
+    env = api.Environment(cr, SUPERUSER_ID, {})
+    Optimization = env['property_fielder.optimization']
+    cr.execute("""
+        SELECT id FROM property_fielder_optimization
+         WHERE request_json IS NOT NULL OR response_json IS NOT NULL
+         ORDER BY id
+    """)
+    ids = [row[0] for row in cr.fetchall()]
+    for start in range(0, len(ids), BATCH_SIZE):
+        cr.execute("""
+            SELECT id, request_json, response_json FROM property_fielder_optimization WHERE id = ANY(%s)
+        """, [ids[start:start + BATCH_SIZE]])
+        for opt_id, request_json, response_json in cr.fetchall():
+            vals = {}
+            for field, text in (('request_payload', request_json), ('response_payload', response_json)):
+                try:
+                    vals[field] = text and pack_payload(json.loads(text))
+                except ValueError:
+                    _logger.warning('Optimization %s: unreadable %s dropped', opt_id, field)
+            Optimization.browse(opt_id).write(vals)
+        env.flush_all()
+        env.invalidate_all()
+    cr.execute("ALTER TABLE property_fielder_optimization DROP COLUMN request_json, DROP COLUMN response_json")
@@ -1,10 +1,19 @@
 # -*- coding: utf-8 -*-
 
+from . import perf_metrics
+from . import ir_http
+from . import ir_cron
+from . import dispatch_bus
+from . import geo_index
 from . import skill
 from . import job
+from . import job_token
 from . import job_signature
 from . import inspector
+from . import inspector_location
 from . import route
+from . import route_geometry
+from . import map_tiles
 from . import optimization
 from . import change_request
 from . import field_service_dashboard
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+from collections import defaultdict
+
+from odoo import models, fields, api
+
+# Bus channel of the dispatch board for one date, e.g. property_fielder_dispatch_2025-01-31
+DISPATCH_CHANNEL_PREFIX = 'property_fielder_dispatch_'
+DISPATCH_NOTIFICATION = 'property_fielder.dispatch/diff'
+
+
+def dispatch_channel(date):
+    return DISPATCH_CHANNEL_PREFIX + fields.Date.to_string(date)
+
+
+class DispatchMixin(models.AbstractModel):
+    """Publish dispatch board diffs when records change.
+
+    Models inheriting this mixin set ``_dispatch_key`` (the payload section,
+    e.g. ``jobs``), ``_dispatch_fields`` (the fields the board displays) and
+    implement ``_dispatch_date``. Changes are collected during the
+    transaction and published once, at commit, on the bus channel of each
+    affected date: the records' current values plus the ids that left the
+    date (moved or deleted).
+    """
+    _name = 'property_fielder.dispatch.mixin'
+    _description = 'Dispatch Board Notification Mixin'
+
+    _dispatch_key = None
+    _dispatch_fields = []
+
+    PENDING_KEY = 'property_fielder.dispatch.pending'
+
+    def _dispatch_date(self):
+        """Date of the dispatch board showing this record (or False)."""
+        raise NotImplementedError()
+
+    def _dispatch_pending(self):
+        precommit = self.env.cr.precommit
+        pending = precommit.data.get(self.PENDING_KEY)
+        if pending is None:
+            pending = precommit.data[self.PENDING_KEY] = defaultdict(
+                lambda: {'ids': set(), 'previous': defaultdict(set)}
+            )
+
+            @precommit.add
+            def publish_dispatch_diffs():
+                self.env['property_fielder.dispatch.mixin'].sudo()._publish_dispatch_diffs(
+                    precommit.data.pop(self.PENDING_KEY, {})
+                )
+        return pending[self._name]
+
+    def _dispatch_mark(self, remember_dates=False):
+        if not self:
+            return
+        pending = self._dispatch_pending()
+        pending['ids'].update(self.ids)
+        if remember_dates:
+            for record in self:
+                date = record._dispatch_date()
+                if date:
+                    pending['previous'][record.id].add(date)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._dispatch_mark()
+        return records
+
+    def write(self, vals):
+        if not set(self._dispatch_fields).intersection(vals):
+            return super().write(vals)
+        self._dispatch_mark(remember_dates=True)
+        return super().write(vals)
+
+    def unlink(self):
+        self._dispatch_mark(remember_dates=True)
+        return super().unlink()
+
+    @api.model
+    def _publish_dispatch_diffs(self, pending):
+        """Send one compact diff per affected date."""
+        diffs = defaultdict(lambda: defaultdict(lambda: {'changed': [], 'removed': []}))
+        for model_name, changes in pending.items():
+            Model = self.env[model_name]
+            records = Model.browse(sorted(changes['ids'])).exists()
+            values = {row['id']: row for row in records.read(Model._dispatch_fields)}
+            current = {}
+            for record in records:
+                date = record._dispatch_date()
+                current[record.id] = date
+                if date:
+                    diffs[date][Model._dispatch_key]['changed'].append(values[record.id])
+            for record_id, dates in changes['previous'].items():
+                for date in dates:
+                    if date != current.get(record_id):
+                        diffs[date][Model._dispatch_key]['removed'].append(record_id)
+
+        if not diffs:
+            return
+        Bus = self.env['bus.bus']
+        for date, sections in diffs.items():
+            Bus._sendone(dispatch_channel(date), DISPATCH_NOTIFICATION,
+                         dict(sections, date=fields.Date.to_string(date)))
+
+
+class IrWebsocket(models.AbstractModel):
+    _inherit = 'ir.websocket'
+
+    def _build_bus_channel_list(self, channels):
+        # Only field service users may listen to dispatch board channels
+        if not self.env.user.has_group('property_fielder_field_service.group_field_service_user'):
+            channels = [
+                channel for channel in channels
+                if not (isinstance(channel, str) and channel.startswith(DISPATCH_CHANNEL_PREFIX))
+            ]
+        return super()._build_bus_channel_list(channels)
@@ -1,7 +1,22 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api
+from odoo.tools import SQL
 from datetime import timedelta
+import time
+
+from .perf_metrics import instrumented
+
+# Seconds a dashboard snapshot is shared between viewers
+SNAPSHOT_TTL = 10
+# Models counted by the snapshot, restricted by the viewer's record rules
+SNAPSHOT_MODELS = [
+    'property_fielder.job', 'property_fielder.inspector',
+    'property_fielder.route', 'property_fielder.change.request',
+]
+
+# Per-worker snapshots: {(dbname, today, scopes): (expires_at, snapshot)}
+_snapshot_cache = {}
 
 
 class FieldServiceDashboard(models.TransientModel):
@@ -13,174 +28,215 @@ class FieldServiceDashboard(models.TransientModel):
     name = fields.Char(string='Dashboard', default='Field Service Dashboard')
     
     # Today's Statistics
-    today_jobs_total = fields.Integer(string='Jobs Today', compute='_compute_today_stats')
-    today_jobs_pending = fields.Integer(string='Pending', compute='_compute_today_stats')
-    today_jobs_in_progress = fields.Integer(string='In Progress', compute='_compute_today_stats')
-    today_jobs_completed = fields.Integer(string='Completed', compute='_compute_today_stats')
-    today_completion_rate = fields.Float(string='Completion %', compute='_compute_today_stats')
+    today_jobs_total = fields.Integer(string='Jobs Today', compute='_compute_stats')
+    today_jobs_pending = fields.Integer(string='Pending', compute='_compute_stats')
+    today_jobs_in_progress = fields.Integer(string='In Progress', compute='_compute_stats')
+    today_jobs_completed = fields.Integer(string='Completed', compute='_compute_stats')
+    today_completion_rate = fields.Float(string='Completion %', compute='_compute_stats')
     
     # Inspector Statistics
-    active_inspectors = fields.Integer(string='Active Inspectors', compute='_compute_inspector_stats')
-    inspectors_on_job = fields.Integer(string='On Job', compute='_compute_inspector_stats')
-    inspectors_available = fields.Integer(string='Available', compute='_compute_inspector_stats')
-    inspector_utilization = fields.Float(string='Utilization %', compute='_compute_inspector_stats')
-    total_capacity = fields.Integer(string='Total Capacity', compute='_compute_inspector_stats')
-    jobs_assigned_today = fields.Integer(string='Jobs Assigned', compute='_compute_inspector_stats')
+    active_inspectors = fields.Integer(string='Active Inspectors', compute='_compute_stats')
+    inspectors_on_job = fields.Integer(string='On Job', compute='_compute_stats')
+    inspectors_available = fields.Integer(string='Available', compute='_compute_stats')
+    inspector_utilization = fields.Float(string='Utilization %', compute='_compute_stats')
+    total_capacity = fields.Integer(string='Total Capacity', compute='_compute_stats')
+    jobs_assigned_today = fields.Integer(string='Jobs Assigned', compute='_compute_stats')
     
     # Route Statistics  
-    today_routes = fields.Integer(string='Routes Today', compute='_compute_route_stats')
-    routes_acknowledged = fields.Integer(string='Acknowledged', compute='_compute_route_stats')
-    routes_pending = fields.Integer(string='Pending Ack', compute='_compute_route_stats')
+    today_routes = fields.Integer(string='Routes Today', compute='_compute_stats')
+    routes_acknowledged = fields.Integer(string='Acknowledged', compute='_compute_stats')
+    routes_pending = fields.Integer(string='Pending Ack', compute='_compute_stats')
     
     # Week Statistics
-    week_jobs_total = fields.Integer(string='Jobs This Week', compute='_compute_week_stats')
-    week_jobs_completed = fields.Integer(string='Completed This Week', compute='_compute_week_stats')
-    week_avg_completion_time = fields.Float(string='Avg Completion (min)', compute='_compute_week_stats')
+    week_jobs_total = fields.Integer(string='Jobs This Week', compute='_compute_stats')
+    week_jobs_completed = fields.Integer(string='Completed This Week', compute='_compute_stats')
+    week_avg_completion_time = fields.Float(string='Avg Completion (min)', compute='_compute_stats')
     
     # Confirmation Statistics
-    pending_confirmations = fields.Integer(string='Pending Confirmations', compute='_compute_confirmation_stats')
-    confirmed_today = fields.Integer(string='Confirmed Today', compute='_compute_confirmation_stats')
-    declined_today = fields.Integer(string='Declined Today', compute='_compute_confirmation_stats')
+    pending_confirmations = fields.Integer(string='Pending Confirmations', compute='_compute_stats')
+    confirmed_today = fields.Integer(string='Confirmed Today', compute='_compute_stats')
+    declined_today = fields.Integer(string='Declined Today', compute='_compute_stats')
     
     # Change Requests
-    pending_change_requests = fields.Integer(string='Pending Changes', compute='_compute_change_stats')
+    pending_change_requests = fields.Integer(string='Pending Changes', compute='_compute_stats')
     
     @api.depends_context('uid')
-    def _compute_today_stats(self):
-        Job = self.env['property_fielder.job']
-        today = fields.Date.today()
-        
+    def _compute_stats(self):
+        snapshot = self.get_dashboard_data()
         for rec in self:
-            today_jobs = Job.search([('scheduled_date', '=', today)])
-            rec.today_jobs_total = len(today_jobs)
-            rec.today_jobs_pending = len(today_jobs.filtered(lambda j: j.state in ['draft', 'scheduled']))
-            rec.today_jobs_in_progress = len(today_jobs.filtered(lambda j: j.state == 'in_progress'))
-            rec.today_jobs_completed = len(today_jobs.filtered(lambda j: j.state == 'completed'))
-            rec.today_completion_rate = (rec.today_jobs_completed / rec.today_jobs_total * 100) if rec.today_jobs_total else 0
-    
-    @api.depends_context('uid')
-    def _compute_inspector_stats(self):
-        Inspector = self.env['property_fielder.inspector']
-        Job = self.env['property_fielder.job']
-        today = fields.Date.today()
+            rec.today_jobs_total = snapshot['today']['total']
+            rec.today_jobs_pending = snapshot['today']['pending']
+            rec.today_jobs_in_progress = snapshot['today']['in_progress']
+            rec.today_jobs_completed = snapshot['today']['completed']
+            rec.today_completion_rate = snapshot['today']['completion_rate']
+            rec.active_inspectors = snapshot['inspectors']['active']
+            rec.inspectors_on_job = snapshot['inspectors']['on_job']
+            rec.inspectors_available = snapshot['inspectors']['available']
+            rec.inspector_utilization = snapshot['inspectors']['utilization']
+            rec.total_capacity = snapshot['inspectors']['total_capacity']
+            rec.jobs_assigned_today = snapshot['inspectors']['jobs_assigned']
+            rec.today_routes = snapshot['routes']['total']
+            rec.routes_acknowledged = snapshot['routes']['acknowledged']
+            rec.routes_pending = snapshot['routes']['pending']
+            rec.week_jobs_total = snapshot['week']['total']
+            rec.week_jobs_completed = snapshot['week']['completed']
+            rec.week_avg_completion_time = snapshot['week']['avg_completion_time']
+            rec.pending_confirmations = snapshot['confirmations']['pending']
+            rec.confirmed_today = snapshot['confirmations']['confirmed_today']
+            rec.declined_today = snapshot['confirmations']['declined_today']
+            rec.pending_change_requests = snapshot['change_requests']
 
-        for rec in self:
-            inspectors = Inspector.search([('active', '=', True)])
-            rec.active_inspectors = len(inspectors)
+    @api.model
+    @instrumented()
+    def get_dashboard_data(self):
+        """Return dashboard data as dict for JS widget
 
-            # Inspectors with in-progress jobs
-            inspectors_with_active = Job.search([
-                ('scheduled_date', '=', today),
-                ('state', '=', 'in_progress')
-            ]).mapped('inspector_id')
-            rec.inspectors_on_job = len(inspectors_with_active)
-            rec.inspectors_available = rec.active_inspectors - rec.inspectors_on_job
+        The whole payload comes from one snapshot query, shared for
+        SNAPSHOT_TTL seconds by the viewers whose record rules yield the
+        same scope.
+        """
+        today = fields.Date.context_today(self)
+        scopes = {model: self._snapshot_scope(model) for model in SNAPSHOT_MODELS}
+        key = (self.env.cr.dbname, today,
+               tuple(repr((scope.code, scope.params)) for scope in scopes.values()))
+        now = time.monotonic()
+        cached = _snapshot_cache.get(key)
+        if cached and cached[0] > now:
+            return cached[1]
+        snapshot = self._get_snapshot(today, scopes)
+        for stale_key, (expires_at, _snapshot) in list(_snapshot_cache.items()):
+            if expires_at <= now:
+                _snapshot_cache.pop(stale_key, None)
+        _snapshot_cache[key] = (now + SNAPSHOT_TTL, snapshot)
+        return snapshot
 
-            # Calculate capacity and utilization
-            rec.total_capacity = sum(inspectors.mapped('max_jobs_per_day'))
-            rec.jobs_assigned_today = Job.search_count([
-                ('scheduled_date', '=', today),
-                ('inspector_id', '!=', False)
-            ])
-            rec.inspector_utilization = (rec.jobs_assigned_today / rec.total_capacity * 100) if rec.total_capacity else 0
-    
-    @api.depends_context('uid')
-    def _compute_route_stats(self):
-        Route = self.env['property_fielder.route']
-        today = fields.Date.today()
-        
-        for rec in self:
-            today_routes = Route.search([('route_date', '=', today)])
-            rec.today_routes = len(today_routes)
-            rec.routes_acknowledged = len(today_routes.filtered(lambda r: r.inspector_acknowledged))
-            rec.routes_pending = rec.today_routes - rec.routes_acknowledged
-    
-    @api.depends_context('uid')
-    def _compute_week_stats(self):
-        Job = self.env['property_fielder.job']
-        today = fields.Date.today()
-        week_start = today - timedelta(days=today.weekday())
-        
-        for rec in self:
-            week_jobs = Job.search([
-                ('scheduled_date', '>=', week_start),
-                ('scheduled_date', '<=', today)
-            ])
-            rec.week_jobs_total = len(week_jobs)
-            rec.week_jobs_completed = len(week_jobs.filtered(lambda j: j.state == 'completed'))
-            rec.week_avg_completion_time = 0  # TODO: Calculate from check-in/out
-    
-    @api.depends_context('uid')
-    def _compute_confirmation_stats(self):
-        Job = self.env['property_fielder.job']
-        today = fields.Date.today()
-        today_start = fields.Datetime.to_datetime(today)
-        today_end = fields.Datetime.to_datetime(today + timedelta(days=1))
+    @api.model
+    def _snapshot_scope(self, model):
+        """Condition restricting ``model`` rows to those the user may read."""
+        Model = self.env[model].with_context(active_test=False)
+        query = Model._search([])
+        if not query.where_clause:
+            return SQL("TRUE")
+        return SQL("%s IN %s", SQL.identifier(Model._table, 'id'), query.subselect())
 
-        for rec in self:
-            rec.pending_confirmations = Job.search_count([
-                ('confirmation_state', '=', 'pending'),
-                ('owner_notified', '=', True)
-            ])
-            rec.confirmed_today = Job.search_count([
-                ('confirmation_state', '=', 'confirmed'),
-                ('confirmation_date', '>=', today_start),
-                ('confirmation_date', '<', today_end)
-            ])
-            rec.declined_today = Job.search_count([
-                ('confirmation_state', '=', 'declined'),
-                ('confirmation_date', '>=', today_start),
-                ('confirmation_date', '<', today_end)
-            ])
-    
-    @api.depends_context('uid')
-    def _compute_change_stats(self):
-        for rec in self:
-            rec.pending_change_requests = self.env['property_fielder.change.request'].search_count([
-                ('state', '=', 'pending')
-            ])
-    
     @api.model
-    def get_dashboard_data(self):
-        """Return dashboard data as dict for JS widget"""
-        rec = self.create({})
-        rec._compute_today_stats()
-        rec._compute_inspector_stats()
-        rec._compute_route_stats()
-        rec._compute_week_stats()
-        rec._compute_confirmation_stats()
-        rec._compute_change_stats()
-        
+    def _get_snapshot(self, today, scopes):
+        for model in SNAPSHOT_MODELS:
+            self.env[model].flush_model()
+
+        # Average time on site from check-in/out (mobile module, optional)
+        if 'property_fielder.job.checkin' in self.env:
+            self.env['property_fielder.job.checkin'].flush_model()
+            completion_query = SQL("""
+                SELECT AVG(EXTRACT(EPOCH FROM (c.checkout_time - c.checkin_time)) / 60.0) AS avg_minutes
+                  FROM property_fielder_job_checkin c
+                  JOIN property_fielder_job ON property_fielder_job.id = c.job_id
+                 WHERE property_fielder_job.scheduled_date BETWEEN %s AND %s
+                   AND property_fielder_job.state = 'completed'
+                   AND c.checkout_time IS NOT NULL
+                   AND %s
+            """, today - timedelta(days=today.weekday()), today, scopes['property_fielder.job'])
+        else:
+            completion_query = SQL("SELECT NULL::float AS avg_minutes")
+
+        day_start = fields.Datetime.to_datetime(today)
+        self.env.cr.execute(SQL("""
+            WITH today_jobs AS (
+                SELECT COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE state IN ('draft', 'scheduled')) AS pending,
+                       COUNT(*) FILTER (WHERE state = 'in_progress') AS in_progress,
+                       COUNT(*) FILTER (WHERE state = 'completed') AS completed,
+                       COUNT(*) FILTER (WHERE inspector_id IS NOT NULL) AS assigned,
+                       COUNT(DISTINCT inspector_id) FILTER (WHERE state = 'in_progress') AS on_job
+                  FROM property_fielder_job
+                 WHERE scheduled_date = %(today)s AND %(job_scope)s
+            ), inspectors AS (
+                SELECT COUNT(*) AS active,
+                       COALESCE(SUM(max_jobs_per_day), 0) AS capacity
+                  FROM property_fielder_inspector
+                 WHERE active AND %(inspector_scope)s
+            ), routes AS (
+                SELECT COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE inspector_acknowledged) AS acknowledged
+                  FROM property_fielder_route
+                 WHERE route_date = %(today)s AND %(route_scope)s
+            ), week_jobs AS (
+                SELECT COUNT(*) AS total,
+                       COUNT(*) FILTER (WHERE state = 'completed') AS completed
+                  FROM property_fielder_job
+                 WHERE scheduled_date BETWEEN %(week_start)s AND %(today)s AND %(job_scope)s
+            ), confirmations AS (
+                SELECT COUNT(*) FILTER (WHERE confirmation_state = 'pending' AND owner_notified) AS pending,
+                       COUNT(*) FILTER (WHERE confirmation_state = 'confirmed'
+                                          AND confirmation_date >= %(day_start)s
+                                          AND confirmation_date < %(day_end)s) AS confirmed_today,
+                       COUNT(*) FILTER (WHERE confirmation_state = 'declined'
+                                          AND confirmation_date >= %(day_start)s
+                                          AND confirmation_date < %(day_end)s) AS declined_today
+                  FROM property_fielder_job
+                 WHERE confirmation_state IN ('pending', 'confirmed', 'declined') AND %(job_scope)s
+            ), change_requests AS (
+                SELECT COUNT(*) AS pending
+                  FROM property_fielder_change_request
+                 WHERE state = 'pending' AND %(change_request_scope)s
+            ), completion AS (
+                %(completion_query)s
+            )
+            SELECT t.total, t.pending, t.in_progress, t.completed, t.assigned, t.on_job,
+                   i.active, i.capacity,
+                   r.total, r.acknowledged,
+                   w.total, w.completed, c.avg_minutes,
+                   f.pending, f.confirmed_today, f.declined_today,
+                   cr.pending
+              FROM today_jobs t, inspectors i, routes r, week_jobs w,
+                   completion c, confirmations f, change_requests cr
+        """,
+            today=today,
+            week_start=today - timedelta(days=today.weekday()),
+            day_start=day_start,
+            day_end=day_start + timedelta(days=1),
+            job_scope=scopes['property_fielder.job'],
+            inspector_scope=scopes['property_fielder.inspector'],
+            route_scope=scopes['property_fielder.route'],
+            change_request_scope=scopes['property_fielder.change.request'],
+            completion_query=completion_query,
+        ))
+        (today_total, today_pending, today_in_progress, today_completed, assigned, on_job,
+         active_inspectors, capacity, routes_total, routes_acknowledged,
+         week_total, week_completed, avg_minutes,
+         pending_confirmations, confirmed_today, declined_today,
+         pending_changes) = self.env.cr.fetchone()
+
         return {
             'today': {
-                'total': rec.today_jobs_total,
-                'pending': rec.today_jobs_pending,
-                'in_progress': rec.today_jobs_in_progress,
-                'completed': rec.today_jobs_completed,
-                'completion_rate': rec.today_completion_rate,
+                'total': today_total,
+                'pending': today_pending,
+                'in_progress': today_in_progress,
+                'completed': today_completed,
+                'completion_rate': (today_completed / today_total * 100) if today_total else 0,
             },
             'inspectors': {
-                'active': rec.active_inspectors,
-                'on_job': rec.inspectors_on_job,
-                'available': rec.inspectors_available,
-                'utilization': rec.inspector_utilization,
-                'total_capacity': rec.total_capacity,
-                'jobs_assigned': rec.jobs_assigned_today,
+                'active': active_inspectors,
+                'on_job': on_job,
+                'available': active_inspectors - on_job,
+                'utilization': (assigned / capacity * 100) if capacity else 0,
+                'total_capacity': capacity,
+                'jobs_assigned': assigned,
             },
             'routes': {
-                'total': rec.today_routes,
-                'acknowledged': rec.routes_acknowledged,
-                'pending': rec.routes_pending,
+                'total': routes_total,
+                'acknowledged': routes_acknowledged,
+                'pending': routes_total - routes_acknowledged,
             },
             'week': {
-                'total': rec.week_jobs_total,
-                'completed': rec.week_jobs_completed,
+                'total': week_total,
+                'completed': week_completed,
+                'avg_completion_time': round(avg_minutes or 0.0, 1),
             },
             'confirmations': {
-                'pending': rec.pending_confirmations,
-                'confirmed_today': rec.confirmed_today,
-                'declined_today': rec.declined_today,
+                'pending': pending_confirmations,
+                'confirmed_today': confirmed_today,
+                'declined_today': declined_today,
             },
-            'change_requests': rec.pending_change_requests,
+            'change_requests': pending_changes,
         }
-
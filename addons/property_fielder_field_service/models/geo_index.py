@@ -0,0 +1,276 @@
+# -*- coding: utf-8 -*-
+
+import logging
+from math import cos, radians
+
+from odoo import models, fields, api, tools
+from odoo.tools import SQL
+
+from .route_geometry import haversine_km
+
+_logger = logging.getLogger(__name__)
+
+GEOHASH_ALPHABET = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Stored precision: cells of about 150 m × 150 m
+GEOHASH_PRECISION = 7
+# Most geohash ranges OR-ed in one fallback query
+MAX_COVER_CELLS = 32
+# Nearest-neighbour searches widen their radius up to this distance
+KNN_START_RADIUS_M = 1000
+KNN_MAX_RADIUS_M = 200000
+METERS_PER_DEGREE = 111320.0
+
+
+def geohash_encode(lat, lng, precision=GEOHASH_PRECISION):
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, bit_count, even = 0, 0, True
+    while len(chars) < precision:
+        interval, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (interval[0] + interval[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            interval[0] = mid
+        else:
+            interval[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def geohash_cell_size(precision):
+    """(height, width) in degrees of a geohash cell."""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / 2 ** lat_bits, 360.0 / 2 ** lng_bits
+
+
+def geohash_cover(south, west, north, east, max_cells=MAX_COVER_CELLS):
+    """Geohash prefixes covering a bounding box with at most ``max_cells`` cells.
+
+    The finest precision that fits the budget is used, so small boxes get
+    tight covers and large ones a few coarse cells.
+    """
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        height, width = geohash_cell_size(precision)
+        rows = int((north - south) / height) + 2
+        cols = int((east - west) / width) + 2
+        if rows * cols > max_cells * 4 and precision > 1:
+            continue
+        cells = set()
+        lat = south
+        while lat < north + height:
+            lng = west
+            while lng < east + width:
+                cells.add(geohash_encode(min(lat, north), min(lng, east), precision))
+                lng += width
+            lat += height
+        if len(cells) <= max_cells or precision == 1:
+            return sorted(cells)
+    return []
+
+
+def radius_bbox(lat, lng, radius_m):
+    """(south, west, north, east) of a circle, clamped to valid coordinates."""
+    dlat = radius_m / METERS_PER_DEGREE
+    dlng = radius_m / (METERS_PER_DEGREE * max(cos(radians(lat)), 0.01))
+    return (max(lat - dlat, -90.0), max(lng - dlng, -180.0),
+            min(lat + dlat, 90.0), min(lng + dlng, 180.0))
+
+
+class GeoMixin(models.AbstractModel):
+    """Spatial index over a latitude/longitude pair.
+
+    Inheriting models set ``_geo_lat_field``/``_geo_lng_field``. When the
+    PostGIS extension is installed a GiST index on the point geography is
+    created and radius queries use ``ST_DWithin``; otherwise a stored,
+    indexed geohash narrows candidates to a few btree ranges. Candidates
+    are then filtered by exact distance and by the caller's domain (so
+    access rules apply).
+
+    Each table also keeps a revision sequence, bumped after any commit that
+    moves, adds or removes a record (or changes one of
+    ``_geo_revision_fields``), which map caches use as their key.
+    """
+    _name = 'property_fielder.geo.mixin'
+    _description = 'Spatial Index Mixin'
+
+    _geo_lat_field = 'latitude'
+    _geo_lng_field = 'longitude'
+    # Extra fields whose changes invalidate cached map tiles
+    _geo_revision_fields = []
+
+    geohash = fields.Char(
+        string='Geohash',
+        compute='_compute_geohash',
+        store=True,
+        index=True,
+        help='Location cell used by spatial searches'
+    )
+
+    @api.depends(lambda self: (self._geo_lat_field, self._geo_lng_field))
+    def _compute_geohash(self):
+        for record in self:
+            lat = record[self._geo_lat_field]
+            lng = record[self._geo_lng_field]
+            record.geohash = geohash_encode(lat, lng) if lat and lng else False
+
+    def init(self):
+        super().init()
+        if self._abstract:
+            return
+        self.env.cr.execute("CREATE SEQUENCE IF NOT EXISTS %s_geo_rev" % self._table)
+        if self._geo_postgis():
+            self.env.cr.execute("""
+                CREATE INDEX IF NOT EXISTS %s_geo_gist ON %s USING gist ((%s))
+            """ % (self._table, self._table, self._geo_point_sql()))
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        records._geo_bump_revision()
+        return records
+
+    def write(self, vals):
+        tracked = {self._geo_lat_field, self._geo_lng_field, 'active', *self._geo_revision_fields}
+        if tracked.intersection(vals):
+            self._geo_bump_revision()
+        return super().write(vals)
+
+    def unlink(self):
+        self._geo_bump_revision()
+        return super().unlink()
+
+    def _geo_bump_revision(self):
+        """Advance the table revision once this transaction has committed.
+
+        Bumping after commit guarantees that a reader seeing the new
+        revision also sees the new data.
+        """
+        if not self:
+            return
+        postcommit = self.env.cr.postcommit
+        tables = postcommit.data.setdefault('property_fielder.geo.revisions', set())
+        if not tables:
+            registry = self.env.registry
+
+            @postcommit.add
+            def bump_geo_revisions():
+                with registry.cursor() as cr:
+                    for table in sorted(tables):
+                        cr.execute("SELECT nextval('%s_geo_rev')" % table)
+        tables.add(self._table)
+
+    @api.model
+    def _geo_revision(self):
+        self.env.cr.execute("SELECT last_value FROM %s_geo_rev" % self._table)
+        return self.env.cr.fetchone()[0]
+
+    @api.model
+    @tools.ormcache()
+    def _geo_postgis(self):
+        self.env.cr.execute("SELECT 1 FROM pg_extension WHERE extname = 'postgis'")
+        return bool(self.env.cr.fetchone())
+
+    @api.model
+    def _geo_point_sql(self):
+        return 'ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography' % (
+            self._geo_lng_field, self._geo_lat_field,
+        )
+
+    @api.model
+    def _geo_bbox_sql(self, south, west, north, east):
+        """Index-backed SQL condition selecting the rows inside a bounding box."""
+        lat_col = SQL.identifier(self._table, self._geo_lat_field)
+        lng_col = SQL.identifier(self._table, self._geo_lng_field)
+        box = SQL("%s BETWEEN %s AND %s AND %s BETWEEN %s AND %s",
+                  lat_col, south, north, lng_col, west, east)
+        if self._geo_postgis():
+            point = SQL("ST_SetSRID(ST_MakePoint(%s, %s), 4326)::geography", lng_col, lat_col)
+            return SQL("%s && ST_MakeEnvelope(%s, %s, %s, %s, 4326)::geography AND %s",
+                       point, west, south, east, north, box)
+        geohash_col = SQL.identifier(self._table, 'geohash')
+        ranges = SQL(" OR ").join(
+            SQL("%s BETWEEN %s AND %s", geohash_col, cell,
+                cell + 'z' * (GEOHASH_PRECISION - len(cell)))
+            for cell in geohash_cover(south, west, north, east)
+        )
+        return SQL("(%s) AND %s", ranges, box)
+
+    @api.model
+    def _geo_candidates(self, south, west, north, east):
+        """Rows inside a bounding box: [(id, lat, lng)]."""
+        self.flush_model([self._geo_lat_field, self._geo_lng_field, 'geohash'])
+        self.env.cr.execute(SQL(
+            "SELECT id, %s, %s FROM %s WHERE %s",
+            SQL.identifier(self._geo_lat_field), SQL.identifier(self._geo_lng_field),
+            SQL.identifier(self._table), self._geo_bbox_sql(south, west, north, east),
+        ))
+        return self.env.cr.fetchall()
+
+    @api.model
+    def _geo_filter(self, ids, domain):
+        """Apply the caller's domain and access rules to candidate ids."""
+        if not ids:
+            return set()
+        return set(self.search([('id', 'in', list(ids))] + list(domain or [])).ids)
+
+    @api.model
+    def _geo_radius(self, lat, lng, radius_m, domain=None, limit=None):
+        """Records within ``radius_m`` metres, nearest first.
+
+        :return: list of (record, distance in metres)
+        """
+        rows = self._geo_candidates(*radius_bbox(lat, lng, radius_m))
+        distances = {}
+        for record_id, row_lat, row_lng in rows:
+            distance = haversine_km(lng, lat, row_lng, row_lat) * 1000.0
+            if distance <= radius_m:
+                distances[record_id] = distance
+        allowed = self._geo_filter(distances, domain)
+        ordered = sorted((distance, record_id) for record_id, distance in distances.items()
+                         if record_id in allowed)
+        if limit:
+            ordered = ordered[:limit]
+        return [(self.browse(record_id), distance) for distance, record_id in ordered]
+
+    @api.model
+    def _geo_nearest(self, lat, lng, k=5, domain=None, max_radius_m=KNN_MAX_RADIUS_M):
+        """The ``k`` nearest records, searching in widening circles.
+
+        :return: list of (record, distance in metres)
+        """
+        radius = min(KNN_START_RADIUS_M, max_radius_m)
+        while True:
+            found = self._geo_radius(lat, lng, radius, domain=domain, limit=k)
+            if len(found) >= k or radius >= max_radius_m:
+                return found
+            radius = min(radius * 4, max_radius_m)
+
+    @api.model
+    def _geo_bbox(self, south, west, north, east, domain=None):
+        """Records inside a bounding box (e.g. the map viewport)."""
+        rows = self._geo_candidates(south, west, north, east)
+        allowed = self._geo_filter([row[0] for row in rows], domain)
+        return self.browse(sorted(allowed))
+
+    @api.model
+    def geo_search_radius(self, lat, lng, radius_m, domain=None, limit=None):
+        """RPC: ids and distances of records within a radius."""
+        return [{'id': record.id, 'distance_m': round(distance, 1)}
+                for record, distance in self._geo_radius(lat, lng, radius_m, domain, limit)]
+
+    @api.model
+    def geo_search_nearest(self, lat, lng, k=5, domain=None):
+        """RPC: ids and distances of the k nearest records."""
+        return [{'id': record.id, 'distance_m': round(distance, 1)}
+                for record, distance in self._geo_nearest(lat, lng, k, domain)]
+
+    @api.model
+    def geo_search_bbox(self, south, west, north, east, domain=None):
+        """RPC: ids of records inside a bounding box."""
+        return self._geo_bbox(south, west, north, east, domain).ids
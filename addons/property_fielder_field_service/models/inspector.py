@@ -11,7 +11,11 @@ class FieldServiceInspector(models.Model):
     
     _name = 'property_fielder.inspector'
     _description = 'Field Service Inspector'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'property_fielder.geo.mixin']
+
+    # Spatial index over the home location (see property_fielder.geo.mixin)
+    _geo_lat_field = 'home_latitude'
+    _geo_lng_field = 'home_longitude'
     _order = 'name'
     
     # Basic Information
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+import logging
+import math
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api
+
+from .geo_index import geohash_encode
+from .perf_metrics import instrumented
+
+_logger = logging.getLogger(__name__)
+
+# Coordinates are stored as integer microdegrees (~0.1 m), half the size of floats
+COORD_SCALE = 1000000
+# Points accepted per upload; larger batches must be split by the app
+MAX_POINTS_PER_UPLOAD = 2000
+# Points older than this (or in the future by more than the skew) are rejected
+MAX_POINT_AGE_DAYS = 7
+MAX_CLOCK_SKEW_SECONDS = 300
+DEFAULT_RETENTION_DAYS = 90
+
+
+def parse_points(points):
+    """Normalise uploaded points to sorted (epoch, lat_e6, lon_e6, accuracy) tuples.
+
+    Points are either packed arrays ``[epoch, lat, lng, accuracy]`` or dicts
+    with ``t``/``lat``/``lng``/``accuracy`` keys (``t`` in seconds or
+    milliseconds since the epoch). Invalid points are dropped and duplicate
+    timestamps keep their last occurrence.
+    """
+    now = time.time()
+    oldest = now - MAX_POINT_AGE_DAYS * 86400
+    newest = now + MAX_CLOCK_SKEW_SECONDS
+    parsed = {}
+    for point in points[:MAX_POINTS_PER_UPLOAD]:
+        try:
+            if isinstance(point, dict):
+                epoch = float(point['t'])
+                lat = float(point['lat'])
+                lng = float(point.get('lng', point.get('lon')))
+                accuracy = point.get('accuracy')
+            else:
+                epoch, lat, lng = float(point[0]), float(point[1]), float(point[2])
+                accuracy = point[3] if len(point) > 3 else None
+        except (KeyError, IndexError, TypeError, ValueError):
+            continue
+        if epoch > 1e11:
+            epoch /= 1000.0
+        if not (oldest <= epoch <= newest and -90 <= lat <= 90 and -180 <= lng <= 180):
+            continue
+        if not (math.isfinite(lat) and math.isfinite(lng)):
+            continue
+        try:
+            accuracy = min(int(accuracy), 32767) if accuracy is not None else None
+        except (TypeError, ValueError):
+            accuracy = None
+        parsed[round(epoch, 3)] = (
+            round(lat * COORD_SCALE), round(lng * COORD_SCALE), accuracy,
+        )
+    return [(epoch,) + values for epoch, values in sorted(parsed.items())]
+
+
+class InspectorBreadcrumb(models.Model):
+    """Append-only GPS history of inspectors.
+
+    One narrow row per point (integer microdegree coordinates, no ORM
+    audit columns), inserted in bulk by ``_ingest``. The unique
+    (inspector, timestamp) index serves track queries and makes retried
+    uploads idempotent; a BRIN index on the timestamp keeps retention
+    purges cheap.
+    """
+    _name = 'property_fielder.inspector.breadcrumb'
+    _description = 'Inspector GPS Breadcrumb'
+    _log_access = False
+    _order = 'inspector_id, recorded_at'
+
+    inspector_id = fields.Many2one(
+        'property_fielder.inspector',
+        string='Inspector',
+        required=True,
+        ondelete='cascade'
+    )
+    recorded_at = fields.Datetime(string='Recorded At', required=True)
+    lat_e6 = fields.Integer(string='Latitude (µ°)', required=True)
+    lon_e6 = fields.Integer(string='Longitude (µ°)', required=True)
+    accuracy = fields.Integer(string='Accuracy (m)')
+
+    _check_point_unique = models.Constraint(
+        'UNIQUE(inspector_id, recorded_at)',
+        'An inspector can only be at one place at a time!',
+    )
+    _recorded_at_brin = models.Index('USING brin (recorded_at)')
+
+    @api.model
+    def _ingest(self, inspector, points):
+        """Store a batch of points in one statement and refresh the hot position.
+
+        :param inspector: inspector record the points belong to
+        :param points: packed arrays or dicts, see ``parse_points``
+        :return: number of new points stored
+        """
+        rows = parse_points(points or [])
+        if not rows:
+            return 0
+        epochs, lats, lngs, accuracies = (list(column) for column in zip(*rows))
+        self.env.cr.execute("""
+            INSERT INTO property_fielder_inspector_breadcrumb
+                        (inspector_id, recorded_at, lat_e6, lon_e6, accuracy)
+                 SELECT %s, to_timestamp(v.epoch) at time zone 'UTC', v.lat, v.lng, v.accuracy
+                   FROM unnest(%s::float8[], %s::int[], %s::int[], %s::int[])
+                        AS v(epoch, lat, lng, accuracy)
+            ON CONFLICT DO NOTHING
+        """, (inspector.id, epochs, lats, lngs, accuracies))
+        inserted = self.env.cr.rowcount
+        self.env['property_fielder.inspector.position']._record(inspector, rows[-1])
+        return inserted
+
+    @api.model
+    def get_track(self, inspector_id, date_from, date_to, max_points=500):
+        """Downsampled track of an inspector between two datetimes.
+
+        The period is split into ``max_points`` equal time buckets and the
+        most accurate point of each bucket is kept, so a full day renders
+        with a bounded number of vertices.
+
+        :return: packed arrays {'t': [epoch], 'lat': [...], 'lng': [...]}
+        """
+        self.check_access('read')
+        date_from = fields.Datetime.to_datetime(date_from)
+        date_to = fields.Datetime.to_datetime(date_to)
+        max_points = max(2, min(int(max_points), 5000))
+        self.env.cr.execute("""
+            SELECT DISTINCT ON (bucket)
+                   extract(epoch from recorded_at), lat_e6, lon_e6
+              FROM (
+                  SELECT recorded_at, lat_e6, lon_e6, accuracy,
+                         width_bucket(extract(epoch from recorded_at),
+                                      extract(epoch from %(from)s::timestamp),
+                                      extract(epoch from %(to)s::timestamp) + 1,
+                                      %(buckets)s) AS bucket
+                    FROM property_fielder_inspector_breadcrumb
+                   WHERE inspector_id = %(inspector)s
+                     AND recorded_at >= %(from)s AND recorded_at < %(to)s
+              ) points
+             ORDER BY bucket, accuracy NULLS LAST, recorded_at
+        """, {'inspector': inspector_id, 'from': date_from, 'to': date_to, 'buckets': max_points})
+        track = {'t': [], 'lat': [], 'lng': []}
+        for epoch, lat, lng in self.env.cr.fetchall():
+            track['t'].append(int(epoch))
+            track['lat'].append(lat / COORD_SCALE)
+            track['lng'].append(lng / COORD_SCALE)
+        return track
+
+    @api.model
+    def _cron_purge_breadcrumbs(self):
+        """Drop points older than the retention period."""
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'property_fielder.breadcrumb_retention_days', DEFAULT_RETENTION_DAYS
+        ))
+        self.env.cr.execute("""
+            DELETE FROM property_fielder_inspector_breadcrumb
+             WHERE recorded_at < (now() at time zone 'UTC') - %s * interval '1 day'
+        """, (days,))
+        if self.env.cr.rowcount:
+            _logger.info('Purged %d inspector breadcrumbs older than %d days', self.env.cr.rowcount, days)
+
+
+class InspectorPosition(models.Model):
+    """Latest known position per inspector.
+
+    A one-row-per-inspector hot table upserted on every upload, so the
+    dispatch board reads live positions without touching the history.
+    Changes are pushed to the board through the dispatch bus.
+    """
+    _name = 'property_fielder.inspector.position'
+    _description = 'Inspector Live Position'
+    _inherit = ['property_fielder.dispatch.mixin', 'property_fielder.geo.mixin']
+    _log_access = False
+    _rec_name = 'inspector_id'
+
+    # Dispatch board diffs (see property_fielder.dispatch.mixin)
+    _dispatch_key = 'positions'
+    _dispatch_fields = ['inspector_id', 'recorded_at', 'latitude', 'longitude', 'accuracy']
+
+    inspector_id = fields.Many2one(
+        'property_fielder.inspector',
+        string='Inspector',
+        required=True,
+        ondelete='cascade'
+    )
+    recorded_at = fields.Datetime(string='Recorded At', required=True)
+    latitude = fields.Float(string='Latitude', digits=(10, 7), required=True)
+    longitude = fields.Float(string='Longitude', digits=(10, 7), required=True)
+    accuracy = fields.Integer(string='Accuracy (m)')
+
+    _check_inspector_unique = models.Constraint(
+        'UNIQUE(inspector_id)',
+        'An inspector has a single live position!',
+    )
+
+    def _dispatch_date(self):
+        return fields.Date.to_date(self.recorded_at)
+
+    @api.model
+    def _record(self, inspector, point):
+        """Upsert the latest point of an inspector, ignoring stale ones."""
+        epoch, lat_e6, lon_e6, accuracy = point
+        self.env.cr.execute("""
+            INSERT INTO property_fielder_inspector_position
+                        (inspector_id, recorded_at, latitude, longitude, accuracy, geohash)
+                 VALUES (%s, to_timestamp(%s) at time zone 'UTC', %s, %s, %s, %s)
+            ON CONFLICT (inspector_id) DO UPDATE
+                    SET recorded_at = EXCLUDED.recorded_at,
+                        latitude = EXCLUDED.latitude,
+                        longitude = EXCLUDED.longitude,
+                        accuracy = EXCLUDED.accuracy,
+                        geohash = EXCLUDED.geohash
+                  WHERE property_fielder_inspector_position.recorded_at < EXCLUDED.recorded_at
+              RETURNING id
+        """, (inspector.id, epoch, lat_e6 / COORD_SCALE, lon_e6 / COORD_SCALE, accuracy,
+              geohash_encode(lat_e6 / COORD_SCALE, lon_e6 / COORD_SCALE)))
+        row = self.env.cr.fetchone()
+        if row:
+            position = self.browse(row[0])
+            position.invalidate_recordset()
+            position._dispatch_mark()
+        return bool(row)
+
+    @api.model
+    @instrumented()
+    def get_latest_positions(self, inspector_ids=None, max_age_minutes=None):
+        """Live positions for the dispatch board.
+
+        :return: list of {inspector_id, recorded_at, latitude, longitude, accuracy}
+        """
+        domain = []
+        if inspector_ids:
+            domain.append(('inspector_id', 'in', inspector_ids))
+        if max_age_minutes:
+            domain.append(('recorded_at', '>=', fields.Datetime.now() - timedelta(minutes=max_age_minutes)))
+        return self.search_read(domain, self._dispatch_fields)
@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models
+
+from .perf_metrics import Measure
+
+
+class IrCron(models.Model):
+    _inherit = 'ir.cron'
+
+    def _callback(self, cron_name, server_action_id, *args, **kwargs):
+        """Measure every scheduled action run."""
+        with Measure(self.env, 'cron', cron_name):
+            return super()._callback(cron_name, server_action_id, *args, **kwargs)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+
+import threading
+
+from odoo import models
+from odoo.http import request
+
+from .perf_metrics import Measure, get_buffer
+
+# Route being measured by the current thread, completed with the response size
+_current = threading.local()
+
+
+def instrumented_route(endpoint):
+    """Route pattern of Property Fielder endpoints, None for any other."""
+    method = getattr(endpoint, 'original_endpoint', endpoint)
+    module = getattr(method, '__module__', None) or ''
+    if not module.startswith('odoo.addons.property_fielder_'):
+        return None
+    routes = getattr(endpoint, 'routing', {}).get('routes') or []
+    if not routes or routes[0] == '/metrics':
+        return None
+    return routes[0]
+
+
+class IrHttp(models.AbstractModel):
+    _inherit = 'ir.http'
+
+    @classmethod
+    def _dispatch(cls, endpoint):
+        """Measure the routes of the Property Fielder addons."""
+        route = _current.route = instrumented_route(endpoint)
+        if not route:
+            return super()._dispatch(endpoint)
+        with Measure(request.env, 'route', route):
+            return super()._dispatch(endpoint)
+
+    @classmethod
+    def _post_dispatch(cls, response):
+        super()._post_dispatch(response)
+        route = getattr(_current, 'route', None)
+        if route:
+            _current.route = None
+            size = response.calculate_content_length() if hasattr(response, 'calculate_content_length') else None
+            if size:
+                get_buffer(request.env.registry.db_name).add_bytes('route', route, size)
@@ -9,9 +9,22 @@ class FieldServiceJob(models.Model):
     
     _name = 'property_fielder.job'
     _description = 'Field Service Job'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'property_fielder.dispatch.mixin',
+                'property_fielder.geo.mixin']
     _order = 'scheduled_date desc, priority desc, id desc'
+
+    # Dispatch board diffs (see property_fielder.dispatch.mixin)
+    _dispatch_key = 'jobs'
+    _dispatch_fields = [
+        'name', 'job_number', 'partner_id', 'street', 'city', 'zip', 'latitude', 'longitude',
+        'state', 'inspector_id', 'route_id', 'duration_minutes', 'sequence_in_route',
+        'priority', 'skill_ids', 'earliest_start', 'latest_end', 'scheduled_date',
+        'scheduled_arrival_time', 'scheduled_departure_time', 'confirmation_state',
+    ]
     
+    # Map tiles are refreshed when these change (see property_fielder.geo.mixin)
+    _geo_revision_fields = ['scheduled_date', 'inspector_id', 'state', 'priority']
+
     # Basic Information
     name = fields.Char(
         string='Job Name',
@@ -93,6 +106,14 @@ class FieldServiceJob(models.Model):
         tracking=True,
         help='Latest time the job must be completed'
     )
+
+    due_date = fields.Date(
+        string='Due By',
+        index=True,
+        tracking=True,
+        help='Hard deadline, e.g. the expiry of the certificate the visit renews. '
+             'Rolling-horizon planning never schedules the job after this date.'
+    )
     
     duration_minutes = fields.Integer(
         string='Duration (minutes)',
@@ -181,10 +202,11 @@ class FieldServiceJob(models.Model):
     ], string='Job Type', default='inspection', tracking=True)
 
     # Confirmation Token (for email links)
-    confirmation_token = fields.Char(
-        string='Confirmation Token',
-        copy=False,
-        help='Secure token for confirmation links'
+    confirmation_token_ids = fields.One2many(
+        'property_fielder.job.token',
+        'job_id',
+        string='Confirmation Tokens',
+        help='Hashed tokens of the confirmation links sent for this job'
     )
     confirmation_token_expiry = fields.Datetime(
         string='Token Expiry',
@@ -282,10 +304,22 @@ class FieldServiceJob(models.Model):
         help='Required justification for emergency access without 24-hour notice'
     )
 
+    # Hours of notice Section 11 requires before entry
+    SECTION_11_NOTICE_HOURS = 24
+
+    start_eligible_at = fields.Datetime(
+        string='Can Start From',
+        compute='_compute_start_eligible_at',
+        store=True,
+        index='btree_not_null',
+        help='When the Section 11 notice period ends (notification + 24 hours); '
+             'empty while the tenant has not been notified'
+    )
     # Computed: Check if job can start based on notification
     can_start_job = fields.Boolean(
         string='Can Start',
         compute='_compute_can_start_job',
+        search='_search_can_start_job',
         help='Whether the job can start based on Section 11 notification requirements'
     )
     hours_since_notification = fields.Float(
@@ -294,24 +328,38 @@ class FieldServiceJob(models.Model):
         help='Hours elapsed since tenant was notified'
     )
 
-    @api.depends('tenant_notified', 'tenant_notified_at', 'is_emergency_access')
+    @api.depends('tenant_notified', 'tenant_notified_at', 'is_emergency_access', 'emergency_access_reason')
+    def _compute_start_eligible_at(self):
+        """Precompute when Section 11 allows the job to start.
+
+        Only changes when the notification or emergency status does, so
+        eligibility checks are a comparison with the current time.
+        """
+        from datetime import timedelta
+        for job in self:
+            if job.is_emergency_access and job.emergency_access_reason:
+                # Emergency access: notice waived from the moment it is declared
+                now = fields.Datetime.now()
+                job.start_eligible_at = min(job.start_eligible_at, now) if job.start_eligible_at else now
+            elif job.tenant_notified and job.tenant_notified_at:
+                job.start_eligible_at = job.tenant_notified_at + timedelta(hours=self.SECTION_11_NOTICE_HOURS)
+            else:
+                job.start_eligible_at = False
+
+    @api.depends('start_eligible_at')
     def _compute_can_start_job(self):
         """Check if job can start based on Section 11 requirements."""
         now = fields.Datetime.now()
         for job in self:
-            # Emergency access - can always start if reason provided
-            if job.is_emergency_access and job.emergency_access_reason:
-                job.can_start_job = True
-            # Not notified - cannot start
-            elif not job.tenant_notified:
-                job.can_start_job = False
-            # Notified - check if 24 hours have passed
-            elif job.tenant_notified_at:
-                from datetime import timedelta
-                hours_24 = timedelta(hours=24)
-                job.can_start_job = (now - job.tenant_notified_at) >= hours_24
-            else:
-                job.can_start_job = False
+            job.can_start_job = bool(job.start_eligible_at) and job.start_eligible_at <= now
+
+    def _search_can_start_job(self, operator, value):
+        if operator not in ('=', '!='):
+            return NotImplemented
+        now = fields.Datetime.now()
+        if (operator == '=') == bool(value):
+            return [('start_eligible_at', '<=', now)]
+        return ['|', ('start_eligible_at', '=', False), ('start_eligible_at', '>', now)]
 
     @api.depends('tenant_notified_at')
     def _compute_hours_since_notification(self):
@@ -340,6 +388,24 @@ class FieldServiceJob(models.Model):
             if vals.get('job_number', _('New')) == _('New'):
                 vals['job_number'] = self.env['ir.sequence'].next_by_code('property_fielder.job') or _('New')
         return super().create(vals_list)
+
+    ROUTE_GEOMETRY_FIELDS = {'route_id', 'sequence_in_route', 'latitude', 'longitude', 'duration_minutes'}
+
+    def write(self, vals):
+        if not self.ROUTE_GEOMETRY_FIELDS.intersection(vals):
+            return super().write(vals)
+        routes = self.route_id
+        result = super().write(vals)
+        routes |= self.route_id
+        if 'route_id' in vals:
+            # Routes list their jobs on the dispatch board
+            routes._dispatch_mark()
+        # Re-sequenced or moved stops need new road geometry
+        routes._schedule_geometry_refresh()
+        return result
+
+    def _dispatch_date(self):
+        return self.scheduled_date
     
     @api.constrains('earliest_start', 'latest_end')
     def _check_time_window(self):
@@ -364,34 +430,109 @@ class FieldServiceJob(models.Model):
             },
         }
 
+    # ============================================================
+    # NEAREST INSPECTOR
+    # ============================================================
+
+    # Live GPS positions older than this fall back to the home location
+    LIVE_POSITION_MAX_AGE = 30
+
+    def _find_nearest_inspectors(self, limit=5):
+        """Active inspectors holding the job's skills, nearest first.
+
+        Recent live positions take precedence over home locations; both
+        lookups go through the spatial index.
+
+        :return: list of (inspector, distance in metres)
+        """
+        from datetime import timedelta
+
+        self.ensure_one()
+        if not (self.latitude and self.longitude):
+            return []
+        domain = [('active', '=', True)]
+        for skill in self.skill_ids:
+            domain.append(('skill_ids', 'in', skill.id))
+        Inspector = self.env['property_fielder.inspector']
+        eligible_ids = Inspector.search(domain).ids
+        if not eligible_ids:
+            return []
+
+        fresh = fields.Datetime.now() - timedelta(minutes=self.LIVE_POSITION_MAX_AGE)
+        distances = {}
+        for position, distance in self.env['property_fielder.inspector.position']._geo_nearest(
+                self.latitude, self.longitude, k=limit,
+                domain=[('inspector_id', 'in', eligible_ids), ('recorded_at', '>=', fresh)]):
+            distances[position.inspector_id] = distance
+        for inspector, distance in Inspector._geo_nearest(
+                self.latitude, self.longitude, k=limit,
+                domain=[('id', 'in', eligible_ids)]):
+            distances.setdefault(inspector, distance)
+        return sorted(distances.items(), key=lambda item: item[1])[:limit]
+
+    def action_assign_nearest_inspector(self):
+        """Assign the nearest suitable inspector (emergency dispatch)."""
+        for job in self:
+            if not job._assign_nearest():
+                raise UserError(_('No inspector with the required skills has a known location near %s.') % job.name)
+        return True
+
+    def _assign_nearest(self):
+        """Assign this job to the nearest suitable inspector, if any.
+
+        :return: the assigned inspector, or an empty recordset when no
+                 inspector with the required skills has a known location
+        """
+        self.ensure_one()
+        nearest = self._find_nearest_inspectors(limit=1)
+        if not nearest:
+            return self.env['property_fielder.inspector']
+        inspector, distance = nearest[0]
+        vals = {'inspector_id': inspector.id}
+        if self.state in ('draft', 'pending'):
+            vals['state'] = 'assigned'
+        self.write(vals)
+        self.message_post(
+            body=_('Assigned to nearest inspector %(name)s (%(km).1f km away)',
+                   name=inspector.name, km=distance / 1000.0),
+            message_type='notification'
+        )
+        return inspector
+
     # ============================================================
     # CONFIRMATION TOKEN METHODS
     # ============================================================
 
     def _generate_confirmation_token(self):
         """Generate a secure confirmation token for this job."""
-        import secrets
+        self.ensure_one()
+        return self._generate_confirmation_tokens()[self.id]
+
+    def _generate_confirmation_tokens(self, extra_vals=None):
+        """Issue confirmation tokens for many jobs at once.
+
+        Previous tokens are revoked, the shared values (expiry, state and
+        ``extra_vals``) go through a single ORM write so tracking still
+        applies, and the hashed tokens are inserted in one statement.
+
+        :return: dict {job id: clear token}; only the hashes are stored, so
+                 callers must render the links from this result
+        """
         from datetime import timedelta
 
-        self.ensure_one()
-        token = secrets.token_urlsafe(32)
-        expiry = fields.Datetime.now() + timedelta(hours=72)
-        self.write({
-            'confirmation_token': token,
-            'confirmation_token_expiry': expiry,
-            'confirmation_state': 'pending',
-        })
-        return token
+        if not self:
+            return {}
+        Token = self.env['property_fielder.job.token'].sudo()
+        Token._revoke(self)
+        self.write(dict(extra_vals or {},
+                        confirmation_token_expiry=fields.Datetime.now() + timedelta(hours=72),
+                        confirmation_state='pending'))
+        return Token._issue(self, hours=72)
 
     def _validate_confirmation_token(self, token):
         """Validate a confirmation token. Returns the job if valid, False otherwise."""
-        if not token:
-            return False
-        job = self.sudo().search([
-            ('confirmation_token', '=', token),
-            ('confirmation_token_expiry', '>', fields.Datetime.now()),
-        ], limit=1)
-        return job if job else False
+        job = self.env['property_fielder.job.token'].sudo()._lookup(token)
+        return job.sudo() if job else False
 
     def action_confirm_appointment(self, method='email_link'):
         """Confirm the appointment."""
@@ -400,9 +541,10 @@ class FieldServiceJob(models.Model):
             'confirmation_state': 'confirmed',
             'confirmation_date': fields.Datetime.now(),
             'confirmation_method': method,
-            'confirmation_token': False,  # Clear token after use
             'confirmation_token_expiry': False,
         })
+        # Tokens are single use
+        self.env['property_fielder.job.token'].sudo()._revoke(self)
         self.message_post(
             body=_('Appointment confirmed by owner via %s') % method,
             message_type='notification'
@@ -415,9 +557,9 @@ class FieldServiceJob(models.Model):
             'confirmation_state': 'declined',
             'confirmation_date': fields.Datetime.now(),
             'reschedule_reason': reason,
-            'confirmation_token': False,
             'confirmation_token_expiry': False,
         })
+        self.env['property_fielder.job.token'].sudo()._revoke(self)
         # Create change request for dispatcher
         self.env['property_fielder.change.request'].create({
             'job_id': self.id,
@@ -476,18 +618,25 @@ class FieldServiceJob(models.Model):
         - hours_remaining: float (if waiting for 24h)
         """
         self.ensure_one()
+        now = fields.Datetime.now()
+
+        if self.start_eligible_at and self.start_eligible_at <= now:
+            return {
+                'can_start': True,
+                # Without a documented reason the emergency waiver does not apply:
+                # the job is eligible because the notice was given
+                'reason': _('Emergency access - 24h notice waived.')
+                if self.is_emergency_access and self.emergency_access_reason
+                else _('Section 11 compliant - 24-hour notice given.'),
+            }
 
-        # Emergency access - can always start
+        # Emergency access without a documented reason
         if self.is_emergency_access:
             if not self.emergency_access_reason:
                 return {
                     'can_start': False,
                     'reason': _('Emergency access declared but no reason provided.'),
                 }
-            return {
-                'can_start': True,
-                'reason': _('Emergency access - 24h notice waived.'),
-            }
 
         # Not notified
         if not self.tenant_notified:
@@ -503,18 +652,11 @@ class FieldServiceJob(models.Model):
                 'reason': _('Notification timestamp missing.'),
             }
 
-        hours = self.hours_since_notification
-        if hours < 24:
-            hours_remaining = 24 - hours
-            return {
-                'can_start': False,
-                'reason': _('24-hour notice period not complete. %.1f hours remaining.') % hours_remaining,
-                'hours_remaining': hours_remaining,
-            }
-
+        hours_remaining = (self.start_eligible_at - now).total_seconds() / 3600
         return {
-            'can_start': True,
-            'reason': _('Section 11 compliant - 24-hour notice given.'),
+            'can_start': False,
+            'reason': _('24-hour notice period not complete. %.1f hours remaining.') % hours_remaining,
+            'hours_remaining': hours_remaining,
         }
 
     def action_navigate_google_maps(self):
@@ -555,9 +697,9 @@ class FieldServiceJob(models.Model):
             'proposed_reschedule_date': proposed_date,
             'proposed_reschedule_time': proposed_time,
             'reschedule_reason': reason,
-            'confirmation_token': False,
             'confirmation_token_expiry': False,
         })
+        self.env['property_fielder.job.token'].sudo()._revoke(self)
         # Create change request for dispatcher
         self.env['property_fielder.change.request'].create({
             'job_id': self.id,
@@ -598,61 +740,130 @@ class FieldServiceJob(models.Model):
     # CRON JOBS
     # ============================================================
 
+    # Jobs claimed, rendered and queued per transaction by the reminder cron
+    REMINDER_BATCH_SIZE = 200
+    # Seconds the reminder cron works before handing over to a fresh run
+    REMINDER_TIME_BUDGET = 240
+
     @api.model
-    def _cron_send_appointment_reminders(self):
-        """Send 24-hour appointment reminders for confirmed jobs."""
+    def _cron_send_appointment_reminders(self, batch_size=None):
+        """Queue 24-hour appointment reminders for confirmed jobs.
+
+        Jobs are claimed in chunks with ``FOR UPDATE SKIP LOCKED``; each
+        chunk is rendered in bulk, queued in the mail outbox and flagged
+        ``reminder_sent`` in the same transaction, then committed. A crash
+        therefore never re-sends a committed chunk nor skips an uncommitted
+        one, and concurrent runs split the remaining jobs between them.
+        """
         from datetime import timedelta
         import logging
+        import time
         _logger = logging.getLogger(__name__)
 
-        tomorrow = fields.Date.today() + timedelta(days=1)
-
-        # Find jobs scheduled for tomorrow that are confirmed but haven't received reminder
-        jobs = self.search([
-            ('scheduled_date', '=', tomorrow),
-            ('confirmation_state', '=', 'confirmed'),
-            ('reminder_sent', '=', False),
-            ('owner_notified', '=', True),
-            ('state', 'not in', ['completed', 'cancelled']),
-        ])
-
-        _logger.info(f'Sending appointment reminders for {len(jobs)} jobs')
-
         template = self.env.ref('property_fielder_field_service.email_template_appointment_reminder', raise_if_not_found=False)
+        if not template:
+            return True
         base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+        template = template.with_context(base_url=base_url)
 
-        for job in jobs:
+        tomorrow = fields.Date.today() + timedelta(days=1)
+        batch_size = batch_size or self.REMINDER_BATCH_SIZE
+        auto_commit = not self.env.registry.in_test_mode()
+        deadline = time.monotonic() + self.REMINDER_TIME_BUDGET
+        failed_ids = []
+        queued = 0
+
+        while True:
+            job_ids = self._claim_reminder_batch(tomorrow, batch_size, failed_ids)
+            if not job_ids:
+                break
             try:
-                if template and job.partner_id.email:
-                    template.with_context(base_url=base_url).send_mail(job.id, force_send=True)
-                    job.write({
-                        'reminder_sent': True,
-                        'reminder_sent_date': fields.Datetime.now(),
-                    })
-                    _logger.info(f'Reminder sent for job {job.name}')
+                with self.env.cr.savepoint():
+                    template.send_mail_batch(job_ids)
+                    self._mark_reminders_sent(job_ids)
+                sent_ids = job_ids
             except Exception as e:
-                _logger.error(f'Failed to send reminder for job {job.name}: {e}')
-
+                # Isolate the jobs that cannot be rendered, queue the others
+                _logger.warning('Reminder batch failed (%s), retrying jobs one by one', e)
+                sent_ids = []
+                for job_id in job_ids:
+                    try:
+                        with self.env.cr.savepoint():
+                            template.send_mail_batch([job_id])
+                            self._mark_reminders_sent([job_id])
+                        sent_ids.append(job_id)
+                    except Exception as e:
+                        _logger.error(f'Failed to queue reminder for job {job_id}: {e}')
+                        failed_ids.append(job_id)
+            queued += len(sent_ids)
+            if auto_commit:
+                self.env.cr.commit()
+            if time.monotonic() > deadline:
+                # Resume in a fresh run instead of hitting limit_time_real
+                self.env.ref('property_fielder_field_service.ir_cron_appointment_reminder').sudo()._trigger()
+                break
+
+        if queued:
+            _logger.info(f'Queued appointment reminders for {queued} jobs')
+            self.env.ref('mail.ir_cron_mail_scheduler_action').sudo()._trigger()
         return True
 
+    @api.model
+    def _claim_reminder_batch(self, scheduled_date, limit, exclude_ids=()):
+        """Lock and return up to ``limit`` job ids still due a reminder.
+
+        Rows locked by a concurrent run are skipped rather than waited for.
+        """
+        self.flush_model(['scheduled_date', 'confirmation_state', 'reminder_sent',
+                          'owner_notified', 'state', 'partner_id'])
+        self.env['res.partner'].flush_model(['email'])
+        self.env.cr.execute("""
+            SELECT j.id
+              FROM property_fielder_job j
+              JOIN res_partner p ON p.id = j.partner_id
+             WHERE j.scheduled_date = %s
+               AND j.confirmation_state = 'confirmed'
+               AND j.reminder_sent IS NOT TRUE
+               AND j.owner_notified
+               AND j.state NOT IN ('completed', 'cancelled')
+               AND COALESCE(p.email, '') != ''
+               AND j.id != ALL(%s)
+             ORDER BY j.id
+             LIMIT %s
+               FOR UPDATE OF j SKIP LOCKED
+        """, (scheduled_date, list(exclude_ids), limit))
+        return [row[0] for row in self.env.cr.fetchall()]
+
+    @api.model
+    def _mark_reminders_sent(self, job_ids):
+        """Flag jobs as reminded in one statement."""
+        self.env.cr.execute("""
+            UPDATE property_fielder_job
+               SET reminder_sent = TRUE,
+                   reminder_sent_date = (now() at time zone 'UTC'),
+                   write_date = (now() at time zone 'UTC'),
+                   write_uid = %s
+             WHERE id = ANY(%s)
+        """, (self.env.uid, list(job_ids)))
+        self.browse(job_ids).invalidate_recordset(['reminder_sent', 'reminder_sent_date'])
+
     @api.model
     def _cron_cleanup_expired_tokens(self):
         """Cleanup expired confirmation tokens."""
         import logging
         _logger = logging.getLogger(__name__)
 
-        # Find jobs with expired tokens
-        expired_jobs = self.search([
-            ('confirmation_token', '!=', False),
-            ('confirmation_token_expiry', '<', fields.Datetime.now()),
-        ])
-
-        if expired_jobs:
-            _logger.info(f'Cleaning up {len(expired_jobs)} expired confirmation tokens')
-            expired_jobs.write({
-                'confirmation_token': False,
-                'confirmation_token_expiry': False,
-            })
+        purged = self.env['property_fielder.job.token'].sudo()._purge_expired()
+        if purged:
+            _logger.info(f'Cleaned up {purged} expired confirmation tokens')
+
+        self.flush_model(['confirmation_token_expiry'])
+        self.env.cr.execute("""
+            UPDATE property_fielder_job
+               SET confirmation_token_expiry = NULL
+             WHERE confirmation_token_expiry < (now() at time zone 'UTC')
+        """)
+        self.invalidate_model(['confirmation_token_expiry'])
 
         return True
 
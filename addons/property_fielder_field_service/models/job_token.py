@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import secrets
+import time
+from datetime import timedelta
+
+from odoo import models, fields, api
+from odoo.tools import lru
+
+# Invalid token hashes remembered per worker, so repeated guesses skip the DB
+NEGATIVE_CACHE_SIZE = 4096
+NEGATIVE_CACHE_TTL = 300
+_invalid_tokens = lru.LRU(NEGATIVE_CACHE_SIZE)
+
+
+def hash_token(token):
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+class JobToken(models.Model):
+    """Hashed appointment confirmation tokens.
+
+    Only the SHA-256 of each token is stored, under a unique index, so a
+    public confirmation link is resolved with a single index lookup and a
+    leaked table does not expose usable links. A job may have several live
+    tokens (e.g. one emailed, one sent by SMS).
+    """
+    _name = 'property_fielder.job.token'
+    _description = 'Appointment Confirmation Token'
+    _log_access = False
+
+    token_hash = fields.Char(string='Token Hash', required=True)
+    job_id = fields.Many2one(
+        'property_fielder.job',
+        string='Job',
+        required=True,
+        index=True,
+        ondelete='cascade'
+    )
+    expiry = fields.Datetime(string='Expiry', required=True, index=True)
+
+    _check_token_hash_unique = models.Constraint(
+        'UNIQUE(token_hash)',
+        'Confirmation tokens must be unique!',
+    )
+
+    @api.model
+    def _issue(self, jobs, hours=72):
+        """Issue one token per job in a single insert.
+
+        :return: dict {job id: clear token}, the only place the token exists
+        """
+        tokens = {job.id: secrets.token_urlsafe(32) for job in jobs}
+        expiry = fields.Datetime.now() + timedelta(hours=hours)
+        self.create([{
+            'token_hash': hash_token(token),
+            'job_id': job_id,
+            'expiry': expiry,
+        } for job_id, token in tokens.items()])
+        return tokens
+
+    @api.model
+    def _lookup(self, token):
+        """Return the job a live token belongs to (or an empty recordset)."""
+        Job = self.env['property_fielder.job']
+        if not token or len(token) > 128:
+            return Job
+        token_hash = hash_token(token)
+        seen = _invalid_tokens.get(token_hash)
+        if seen and time.monotonic() - seen < NEGATIVE_CACHE_TTL:
+            return Job
+        self.env.cr.execute("""
+            SELECT job_id FROM property_fielder_job_token
+             WHERE token_hash = %s AND expiry > (now() at time zone 'UTC')
+        """, (token_hash,))
+        row = self.env.cr.fetchone()
+        if not row:
+            _invalid_tokens[token_hash] = time.monotonic()
+            return Job
+        return Job.browse(row[0])
+
+    @api.model
+    def _revoke(self, jobs):
+        """Invalidate every token of the given jobs."""
+        if jobs:
+            self.flush_model()
+            self.env.cr.execute(
+                "DELETE FROM property_fielder_job_token WHERE job_id = ANY(%s)", (jobs.ids,)
+            )
+            self.invalidate_model()
+
+    @api.model
+    def _purge_expired(self):
+        """Delete expired tokens in one statement; return how many."""
+        self.flush_model()
+        self.env.cr.execute("""
+            DELETE FROM property_fielder_job_token
+             WHERE expiry <= (now() at time zone 'UTC')
+        """)
+        self.invalidate_model()
+        return self.env.cr.rowcount
@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+
+import math
+import time
+
+from odoo import models, api, _
+from odoo.exceptions import AccessError, UserError
+from odoo.tools import SQL
+
+from .perf_metrics import instrumented
+
+# Zoom from which individual features are returned instead of clusters
+CLUSTER_MAX_ZOOM = 14
+MAX_TILE_ZOOM = 18
+# Clusters per tile side (256 px tiles → 64 px clusters)
+CLUSTER_GRID = 4
+MAX_TILES_PER_REQUEST = 64
+MAX_TILE_FEATURES = 2000
+# Stored statuses recomputed by the ORM refresh tiles at least this often
+TILE_TTL = 60
+MAX_CACHED_TILES = 4096
+
+# Per-worker tiles: {(dbname, layer, zoom, x, y, scope, revision): (expires_at, tile)}
+_tile_cache = {}
+
+
+def lng_to_tile_x(lng, zoom):
+    return int((lng + 180.0) / 360.0 * 2 ** zoom)
+
+
+def lat_to_tile_y(lat, zoom):
+    lat = max(min(lat, 85.0511), -85.0511)
+    rad = math.radians(lat)
+    return int((1.0 - math.log(math.tan(rad) + 1.0 / math.cos(rad)) / math.pi) / 2.0 * 2 ** zoom)
+
+
+def tile_bounds(zoom, x, y):
+    """(south, west, north, east) of a slippy map tile."""
+    n = 2 ** zoom
+
+    def tile_lat(tile_y):
+        return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * tile_y / n))))
+
+    return tile_lat(y + 1), x / n * 360.0 - 180.0, tile_lat(y), (x + 1) / n * 360.0 - 180.0
+
+
+def viewport_tiles(south, west, north, east, zoom):
+    """Tile (x, y) pairs covering a viewport."""
+    n = 2 ** zoom
+    x_min, x_max = lng_to_tile_x(west, zoom), lng_to_tile_x(east, zoom)
+    y_min, y_max = lat_to_tile_y(north, zoom), lat_to_tile_y(south, zoom)
+    return [
+        (x, y)
+        for x in range(max(x_min, 0), min(x_max, n - 1) + 1)
+        for y in range(max(y_min, 0), min(y_max, n - 1) + 1)
+    ]
+
+
+class MapTiles(models.AbstractModel):
+    """Viewport map data served as cached, clustered tiles.
+
+    A viewport is split into slippy map tiles. Below ``CLUSTER_MAX_ZOOM``
+    each tile is aggregated in SQL into a small grid of clusters (count,
+    centroid and worst status); from that zoom on, individual features are
+    returned. Tiles are cached for ``TILE_TTL`` seconds per layer, filter,
+    record rule scope and table revision (see ``property_fielder.geo.mixin``),
+    so panning back over an area or several dispatchers looking at the same
+    region hit the cache, while moving a record invalidates its layer at the
+    next commit.
+
+    Layers are declared by ``_map_layers``; other addons extend it.
+    """
+    _name = 'property_fielder.map.tiles'
+    _description = 'Map Tile Service'
+
+    @api.model
+    def _map_layers(self):
+        """Map layers: {name: {model, group, status_field, severity, filters}}.
+
+        ``severity`` lists status values from best to worst; ``filters`` maps
+        an accepted filter key to the field it constrains.
+        """
+        return {
+            'jobs': {
+                'model': 'property_fielder.job',
+                'group': 'property_fielder_field_service.group_field_service_user',
+                'status_field': 'priority',
+                'severity': ['0', '1', '2', '3'],
+                'filters': {
+                    'date': 'scheduled_date',
+                    'inspector_ids': 'inspector_id',
+                    'states': 'state',
+                },
+            },
+        }
+
+    @api.model
+    def _get_layer(self, layer):
+        config = self._map_layers().get(layer)
+        if not config:
+            raise UserError(_('Unknown map layer %s.') % layer)
+        if not self.env.user.has_group(config['group']):
+            raise AccessError(_('You are not allowed to view the %s map layer.') % layer)
+        self.env[config['model']].check_access('read')
+        return config
+
+    @api.model
+    @instrumented()
+    def get_viewport(self, layer, south, west, north, east, zoom, filters=None):
+        """Clustered or individual features of a layer inside a viewport.
+
+        :return: {'zoom', 'clustered', 'tiles': {'z/x/y': tile}} where a
+                 clustered tile is packed as {'lat', 'lng', 'count', 'status'}
+                 arrays and a detailed one as {'id', 'lat', 'lng', 'status'}
+        """
+        config = self._get_layer(layer)
+        zoom = max(0, min(int(zoom), MAX_TILE_ZOOM))
+        tiles = viewport_tiles(south, west, north, east, zoom)
+        while len(tiles) > MAX_TILES_PER_REQUEST and zoom > 0:
+            zoom -= 1
+            tiles = viewport_tiles(south, west, north, east, zoom)
+
+        Model = self.env[config['model']]
+        Model.flush_model()
+        query = Model._search(self._filter_domain(config, filters or {}))
+        scope = repr((query.from_clause.code, query.where_clause.code, query.where_clause.params))
+        revision = Model._geo_revision()
+
+        now = time.monotonic()
+        result = {}
+        for x, y in tiles:
+            key = (self.env.cr.dbname, layer, zoom, x, y, scope, revision)
+            cached = _tile_cache.get(key)
+            if cached and cached[0] > now:
+                tile = cached[1]
+            else:
+                tile = self._get_tile(config, query, zoom, x, y)
+                if len(_tile_cache) >= MAX_CACHED_TILES:
+                    _tile_cache.clear()
+                _tile_cache[key] = (now + TILE_TTL, tile)
+            result['%s/%s/%s' % (zoom, x, y)] = tile
+        return {
+            'zoom': zoom,
+            'clustered': zoom < CLUSTER_MAX_ZOOM,
+            'tiles': result,
+        }
+
+    @api.model
+    def _filter_domain(self, config, filters):
+        """Normalised domain of the accepted filters."""
+        domain = []
+        for name, value in sorted(filters.items()):
+            if name not in config['filters'] or value in (None, False, '', []):
+                continue
+            if isinstance(value, (list, tuple)):
+                domain.append((config['filters'][name], 'in', sorted(value)))
+            else:
+                domain.append((config['filters'][name], '=', value))
+        return domain
+
+    @api.model
+    def _get_tile(self, config, query, zoom, x, y):
+        """Clusters or features of one tile among the rows of ``query``."""
+        Model = self.env[config['model']]
+        south, west, north, east = tile_bounds(zoom, x, y)
+        where = SQL("%s AND %s", query.where_clause or SQL("TRUE"),
+                    Model._geo_bbox_sql(south, west, north, east))
+        status_col = SQL.identifier(Model._table, config['status_field'])
+        lat_col = SQL.identifier(Model._table, Model._geo_lat_field)
+        lng_col = SQL.identifier(Model._table, Model._geo_lng_field)
+
+        if zoom >= CLUSTER_MAX_ZOOM:
+            self.env.cr.execute(SQL(
+                "SELECT %s, %s, %s, %s FROM %s WHERE %s ORDER BY %s LIMIT %s",
+                SQL.identifier(Model._table, 'id'), lat_col, lng_col, status_col,
+                query.from_clause, where, SQL.identifier(Model._table, 'id'), MAX_TILE_FEATURES,
+            ))
+            tile = {'id': [], 'lat': [], 'lng': [], 'status': []}
+            for record_id, lat, lng, status in self.env.cr.fetchall():
+                tile['id'].append(record_id)
+                tile['lat'].append(round(lat, 6))
+                tile['lng'].append(round(lng, 6))
+                tile['status'].append(status or False)
+            return tile
+
+        severity = SQL("CASE %s %s ELSE 0 END", status_col, SQL(" ").join(
+            SQL("WHEN %s THEN %s", value, rank)
+            for rank, value in enumerate(config['severity'], start=1)
+        ))
+        self.env.cr.execute(SQL(
+            """SELECT COUNT(*), AVG(%(lat)s), AVG(%(lng)s), MAX(%(severity)s)
+                 FROM %(table)s
+                WHERE %(where)s
+                GROUP BY width_bucket(%(lng)s, %(west)s, %(east)s, %(grid)s),
+                         width_bucket(%(lat)s, %(south)s, %(north)s, %(grid)s)""",
+            lat=lat_col, lng=lng_col, severity=severity, where=where,
+            west=west, east=east, south=south, north=north, grid=CLUSTER_GRID,
+            table=query.from_clause,
+        ))
+        tile = {'lat': [], 'lng': [], 'count': [], 'status': []}
+        for count, lat, lng, rank in self.env.cr.fetchall():
+            tile['count'].append(count)
+            tile['lat'].append(round(lat, 6))
+            tile['lng'].append(round(lng, 6))
+            tile['status'].append(config['severity'][rank - 1] if rank else False)
+        return tile
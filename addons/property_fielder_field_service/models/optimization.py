@@ -2,12 +2,119 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+import base64
+import gzip
+import hashlib
 import json
+import math
+import re
 import requests
 import logging
+import time
+
+from .geo_index import METERS_PER_DEGREE
+from .perf_metrics import Measure, instrumented
 
 _logger = logging.getLogger(__name__)
 
+# Seconds between two polls of a running Timefold plan
+POLL_INTERVAL = 2
+# Plans solved at the same time on the Timefold service, unless
+# property_fielder.timefold.max_parallel says otherwise
+DEFAULT_MAX_PARALLEL = 4
+# Never give a plan less solver time than this
+MIN_SOLVER_SECONDS = 5
+# Start location of inspectors without a home or work address (central
+# London), unless property_fielder.depot_latitude/longitude are set
+DEFAULT_DEPOT = (51.5074, -0.1278)
+# Planning capacity of inspectors without max_jobs_per_day
+DEFAULT_MAX_JOBS_PER_DAY = 10
+# Plans with more visits than this are split into geographic regions,
+# unless property_fielder.optimization.partition_size says otherwise (0 disables)
+DEFAULT_PARTITION_SIZE = 250
+KMEANS_ITERATIONS = 20
+# Adaptive solver time of a plan: base + per visit + per vehicle, capped by
+# property_fielder.optimization.max_solver_seconds
+SOLVER_BASE_SECONDS = 10
+SOLVER_SECONDS_PER_VISIT = 0.2
+SOLVER_SECONDS_PER_VEHICLE = 1.0
+DEFAULT_MAX_SOLVER_SECONDS = 300
+# Solver budget of a run started from the UI, below the default limit_time_real
+# (120 s) of the worker serving the request, unless
+# property_fielder.optimization.interactive_max_seconds says otherwise.
+# Longer solves are queued and run by a scheduled action
+DEFAULT_INTERACTIVE_MAX_SECONDS = 90
+# Share of the solver time a warm start gets: it only improves the current routes
+WARM_START_TIME_RATIO = 0.25
+# A run reuses the solution of an identical problem solved this recently,
+# unless property_fielder.optimization.cache_hours says otherwise (0 disables)
+DEFAULT_CACHE_HOURS = 24
+SCORE_RE = re.compile(r'^(-?\d+)hard/(-?\d+)soft$')
+
+
+def farthest_points(points, count):
+    """Spread-out starting centres: each point is the farthest from those chosen."""
+    x = sum(point[0] for point in points) / len(points)
+    y = sum(point[1] for point in points) / len(points)
+    nearest = [math.hypot(point[0] - x, point[1] - y) for point in points]
+    centres = []
+    for _index in range(count):
+        chosen = points[max(range(len(points)), key=nearest.__getitem__)]
+        centres.append(chosen)
+        nearest = [min(distance, math.hypot(point[0] - chosen[0], point[1] - chosen[1]))
+                   for distance, point in zip(nearest, points)]
+    return centres
+
+
+def kmeans(points, centres, iterations=KMEANS_ITERATIONS):
+    """Lloyd's k-means of planar ``points`` starting from ``centres``.
+
+    :return: (centres, region index of each point)
+    """
+    labels = [None] * len(points)
+    for _iteration in range(iterations):
+        changed = False
+        for index, (x, y) in enumerate(points):
+            label = min(range(len(centres)),
+                        key=lambda region: (centres[region][0] - x) ** 2 + (centres[region][1] - y) ** 2)
+            if label != labels[index]:
+                labels[index] = label
+                changed = True
+        if not changed:
+            break
+        sums = [[0.0, 0.0, 0] for _centre in centres]
+        for (x, y), label in zip(points, labels):
+            sums[label][0] += x
+            sums[label][1] += y
+            sums[label][2] += 1
+        centres = [(sx / n, sy / n) if n else centre for (sx, sy, n), centre in zip(sums, centres)]
+    return centres, labels
+
+
+def pack_payload(data):
+    """Compact gzipped JSON, base64 encoded for a Binary field."""
+    return base64.b64encode(gzip.compress(json.dumps(data, separators=(',', ':')).encode()))
+
+
+def unpack_payload(value):
+    return json.loads(gzip.decompress(base64.b64decode(value))) if value else None
+
+
+def combine_scores(scores):
+    """Sum Timefold ``<n>hard/<n>soft`` scores of independently solved plans."""
+    if len(scores) == 1:
+        return str(scores[0])
+    hard = soft = 0
+    for score in scores:
+        match = SCORE_RE.match(str(score))
+        if not match:
+            return str(scores[-1]) if scores else 'N/A'
+        hard += int(match.group(1))
+        soft += int(match.group(2))
+    return f'{hard}hard/{soft}soft'
+
 
 class FieldServiceOptimization(models.Model):
     """Route optimization runs using Timefold Solver"""
@@ -29,7 +136,27 @@ class FieldServiceOptimization(models.Model):
         string='Optimization Date',
         required=True,
         default=fields.Date.context_today,
-        help='Date to optimize routes for'
+        help='Date to optimize routes for (first day of the horizon)'
+    )
+
+    planning_mode = fields.Selection([
+        ('day', 'Single Day'),
+        ('horizon', 'Rolling Horizon'),
+    ], string='Planning Mode', default='day', required=True,
+        help='Single Day routes the jobs on the optimization date. Rolling Horizon also '
+             'chooses the day of each job within the horizon, before its due date, '
+             'balancing the work across days and inspectors.'
+    )
+
+    horizon_days = fields.Integer(
+        string='Horizon (days)',
+        default=5,
+        help='Number of days planned in Rolling Horizon mode, starting on the optimization date'
+    )
+
+    horizon_end_date = fields.Date(
+        string='Horizon End',
+        compute='_compute_horizon_end_date'
     )
     
     # Configuration
@@ -44,6 +171,23 @@ class FieldServiceOptimization(models.Model):
         default=30,
         help='How long to run the optimization'
     )
+
+    warm_start = fields.Boolean(
+        string='Warm Start',
+        help='Start from the current routes: inspectors keep their sequenced visits, started '
+             'and confirmed jobs are pinned and the solver only runs a short improvement phase, '
+             'so few visits move'
+    )
+
+    adaptive_solver_time = fields.Boolean(
+        string='Adapt Solver Time',
+        default=False,
+        help='Give each plan solver time in proportion to its visits and inspectors, '
+             'up to property_fielder.optimization.max_solver_seconds, instead of the '
+             'fixed solver time. Runs started interactively stay within '
+             'property_fielder.optimization.interactive_max_seconds: use Run in Background '
+             'for longer solves'
+    )
     
     # Input
     job_ids = fields.Many2many(
@@ -75,6 +219,7 @@ class FieldServiceOptimization(models.Model):
     # Results
     state = fields.Selection([
         ('draft', 'Draft'),
+        ('queued', 'Queued'),
         ('running', 'Running'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
@@ -110,10 +255,63 @@ class FieldServiceOptimization(models.Model):
         string='Error Message',
         readonly=True
     )
+
+    moved_job_count = fields.Integer(
+        string='Jobs Moved',
+        readonly=True,
+        help='Jobs that were already routed and changed inspector or day in the last run'
+    )
+
+    plan_count = fields.Integer(
+        string='Plans Solved',
+        readonly=True,
+        help='Sub-problems (days and regions) solved separately in the last run'
+    )
+
+    unplanned_job_ids = fields.Many2many(
+        'property_fielder.job',
+        string='Unplanned Jobs',
+        compute='_compute_unplanned_jobs',
+        help='Jobs of this run that did not end up on any route'
+    )
+
+    unplanned_job_count = fields.Integer(
+        string='Jobs Unplanned',
+        compute='_compute_unplanned_jobs'
+    )
+
+    # Phase timings of the last run
+    build_ms = fields.Float(string='Request Build (ms)', readonly=True, digits=(10, 1))
+    submit_ms = fields.Float(string='Submit (ms)', readonly=True, digits=(10, 1))
+    solve_ms = fields.Float(string='Solve (ms)', readonly=True, digits=(10, 1))
+    ingest_ms = fields.Float(string='Result Ingestion (ms)', readonly=True, digits=(10, 1))
     
     # Technical
-    request_json = fields.Text(string='Request JSON', readonly=True)
-    response_json = fields.Text(string='Response JSON', readonly=True)
+    fingerprint = fields.Char(
+        string='Problem Fingerprint',
+        readonly=True,
+        copy=False,
+        index=True,
+        help='Hash of the plans sent to the solver and the solver settings'
+    )
+    cached_from_id = fields.Many2one(
+        'property_fielder.optimization',
+        string='Reused Solution Of',
+        readonly=True,
+        copy=False,
+        ondelete='set null',
+        help='Earlier run of the identical problem whose solution was reused instead of solving again'
+    )
+    # Gzipped JSON lists of plans ({date, time_limit, request}) and of solver results
+    request_payload = fields.Binary(string='Request', attachment=True, readonly=True, copy=False)
+    response_payload = fields.Binary(string='Response', attachment=True, readonly=True, copy=False)
+    request_json = fields.Text(string='Request JSON', compute='_compute_payload_json')
+    response_json = fields.Text(string='Response JSON', compute='_compute_payload_json')
+
+    _check_horizon_days = models.Constraint(
+        'CHECK(horizon_days BETWEEN 1 AND 14)',
+        'The planning horizon must be between 1 and 14 days.',
+    )
     
     @api.depends('route_ids', 'route_ids.job_count', 'route_ids.total_distance_km')
     def _compute_route_stats(self):
@@ -123,20 +321,46 @@ class FieldServiceOptimization(models.Model):
             opt.total_jobs_assigned = sum(route.job_count for route in opt.route_ids)
             opt.total_distance_km = sum(route.total_distance_km for route in opt.route_ids)
 
+    @api.depends('optimization_date', 'planning_mode', 'horizon_days')
+    def _compute_horizon_end_date(self):
+        for opt in self:
+            days = opt.horizon_days if opt.planning_mode == 'horizon' else 1
+            opt.horizon_end_date = opt.optimization_date and \
+                opt.optimization_date + timedelta(days=max(days, 1) - 1)
+
+    @api.depends('request_payload', 'response_payload', 'cached_from_id')
+    def _compute_payload_json(self):
+        for opt in self:
+            source = opt.cached_from_id or opt
+            request_data = unpack_payload(source.request_payload)
+            response_data = unpack_payload(source.response_payload)
+            opt.request_json = request_data and json.dumps(request_data, indent=2)
+            opt.response_json = response_data and json.dumps(response_data, indent=2)
+
+    @api.depends('job_ids', 'route_ids.job_ids')
+    def _compute_unplanned_jobs(self):
+        for opt in self:
+            opt.unplanned_job_ids = opt.job_ids - opt.route_ids.job_ids
+            opt.unplanned_job_count = len(opt.unplanned_job_ids)
+
     @api.model
-    def run_optimization(self, job_ids, inspector_ids, optimization_date):
+    @instrumented()
+    def run_optimization(self, job_ids, inspector_ids, optimization_date, planning_mode='day', horizon_days=None,
+                         warm_start=None):
         """Create and run optimization - called from JavaScript dispatch view
 
         Args:
             job_ids: List of job IDs to optimize
             inspector_ids: List of inspector IDs to use
             optimization_date: Date string (YYYY-MM-DD) for the optimization
+            planning_mode: 'day' or 'horizon' (choose the day of each job too)
+            horizon_days: Number of days planned in horizon mode
+            warm_start: Start from the current routes; by default, when some
+                of the jobs are already routed
 
         Returns:
             dict with optimization results
         """
-        from datetime import datetime
-
         if not job_ids:
             raise UserError(_('Please select jobs to optimize'))
         if not inspector_ids:
@@ -149,13 +373,24 @@ class FieldServiceOptimization(models.Model):
             opt_date = optimization_date
 
         # Create optimization record
-        optimization = self.create({
+        vals = {
             'name': f'Dispatch Optimization {opt_date}',
             'optimization_date': opt_date,
+            'planning_mode': planning_mode,
             'job_ids': [(6, 0, job_ids)],
             'inspector_ids': [(6, 0, inspector_ids)],
             'state': 'draft',
-        })
+        }
+        if horizon_days:
+            vals['horizon_days'] = horizon_days
+        if warm_start is None:
+            warm_start = bool(self.env['property_fielder.job'].search_count([
+                ('id', 'in', job_ids),
+                ('route_id', '!=', False),
+                ('route_id.state', 'not in', ('completed', 'cancelled')),
+            ], limit=1))
+        vals['warm_start'] = warm_start
+        optimization = self.create(vals)
 
         # Run the optimization
         optimization.action_run_optimization()
@@ -169,9 +404,42 @@ class FieldServiceOptimization(models.Model):
             'total_routes': optimization.total_routes,
             'total_jobs_assigned': optimization.total_jobs_assigned,
             'total_distance_km': optimization.total_distance_km,
+            'unplanned_jobs': optimization.unplanned_job_count,
+            'moved_jobs': optimization.moved_job_count,
             'error_message': optimization.error_message,
         }
 
+    def action_queue_optimization(self):
+        """Solve in a scheduled action, without the time limit of a web request."""
+        self.write({'state': 'queued', 'error_message': False})
+        self.env.ref('property_fielder_field_service.ir_cron_run_optimizations').sudo()._trigger()
+        return {
+            'type': 'ir.actions.client',
+            'tag': 'display_notification',
+            'params': {
+                'title': _('Optimization Queued'),
+                'message': _('The optimization runs in the background; its routes appear once it is completed.'),
+                'type': 'info',
+                'sticky': False,
+            }
+        }
+
+    @api.model
+    def _cron_run_queued_optimizations(self):
+        """Run queued optimizations one by one, committing each result.
+
+        Runs started here are not bound by the interactive solver budget.
+        """
+        auto_commit = not self.env.registry.in_test_mode()
+        for optimization in self.search([('state', '=', 'queued')], order='create_date'):
+            try:
+                with self.env.cr.savepoint():
+                    optimization.with_context(optimization_background=True).action_run_optimization()
+            except UserError as e:
+                optimization.write({'state': 'failed', 'error_message': str(e)})
+            if auto_commit:
+                self.env.cr.commit()
+
     def action_run_optimization(self):
         """Run route optimization using Timefold Solver"""
         self.ensure_one()
@@ -186,89 +454,63 @@ class FieldServiceOptimization(models.Model):
         self.write({'state': 'running'})
 
         try:
-            import time
-
             # Get Timefold server URL from system parameters
             timefold_url = self.env['ir.config_parameter'].sudo().get_param(
                 'property_fielder.timefold.url',
                 'https://job-dispatch.up.railway.app'
             )
 
-            # Build request payload
-            request_data = self._build_timefold_request()
-            self.request_json = json.dumps(request_data, indent=2)
-
-            # Submit to Timefold API (async - returns job ID)
-            _logger.info(f'Submitting to Timefold API at {timefold_url}')
-            _logger.info(f'Request: {len(request_data.get("visits", []))} visits, '
-                        f'{len(request_data.get("vehicles", []))} vehicles')
-
-            response = requests.post(
-                f'{timefold_url}/route-plans',
-                json=request_data,
-                headers={'Content-Type': 'application/json'},
-                timeout=30
-            )
-
-            response.raise_for_status()
-            job_id = response.text.strip().strip('"')  # Response is plain text job ID
-            _logger.info(f'Timefold job submitted: {job_id}')
-
-            # Poll for result
-            max_wait = self.solver_time_seconds + 30
-            poll_interval = 2  # seconds
-            elapsed = 0
-            result = None
-
-            while elapsed < max_wait:
-                time.sleep(poll_interval)
-                elapsed += poll_interval
-
-                # Get current solution
-                status_response = requests.get(
-                    f'{timefold_url}/route-plans/{job_id}',
-                    timeout=30
-                )
-                status_response.raise_for_status()
-                result = status_response.json()
-
-                solver_status = result.get('solverStatus', 'UNKNOWN')
-                score = result.get('score', 'N/A')
-                _logger.info(f'Timefold status: {solver_status}, score: {score}, elapsed: {elapsed}s')
-
-                # Check if solving is complete
-                if solver_status == 'NOT_SOLVING':
-                    _logger.info(f'Optimization complete after {elapsed}s')
-                    break
-
-                # If we've waited long enough, terminate early
-                if elapsed >= self.solver_time_seconds:
-                    _logger.info(f'Terminating solver after {elapsed}s')
-                    try:
-                        requests.delete(f'{timefold_url}/route-plans/{job_id}', timeout=10)
-                    except Exception:
-                        pass
-                    break
-
-            if not result:
-                raise UserError(_('No result received from Timefold'))
-
-            self.response_json = json.dumps(result, indent=2)
+            # Build one request per sub-problem (days and regions)
+            with Measure(self.env, 'optimization', 'build') as build:
+                problems = self._build_problems()
+                fingerprint = self._fingerprint(problems)
+                cached, cached_problems, results = self._find_cached_run(fingerprint)
+
+            if cached:
+                # Identical problem solved recently: reuse its solution, split as it was solved
+                problems = cached_problems
+                _logger.info('Optimization %s: same problem as run %s, reusing its solution', self.id, cached.id)
+                submit_seconds = solve_seconds = 0.0
+                self.write({'fingerprint': fingerprint, 'cached_from_id': cached.id})
+            else:
+                self.write({
+                    'fingerprint': fingerprint,
+                    'cached_from_id': False,
+                    'request_payload': pack_payload([
+                        dict(problem, date=problem['date'].isoformat()) for problem in problems
+                    ]),
+                })
+                # Submit to Timefold API and poll the plans until solved
+                with Measure(self.env, 'optimization', 'solve') as solve:
+                    results, submit_seconds = self._solve_problems(timefold_url, problems)
+                solve_seconds = solve.duration - submit_seconds
+                self.response_payload = pack_payload(results)
 
             # Process results
-            self._process_timefold_response(result)
+            with Measure(self.env, 'optimization', 'ingest') as ingest:
+                self._process_timefold_results(problems, results)
+                self.env.flush_all()
 
+            score = combine_scores([result.get('score', 'N/A') for result in results])
             self.write({
                 'state': 'completed',
-                'score': str(result.get('score', 'N/A'))
+                'score': score,
+                'plan_count': len(problems),
+                'build_ms': build.duration * 1000.0,
+                'submit_ms': submit_seconds * 1000.0,
+                'solve_ms': solve_seconds * 1000.0,
+                'ingest_ms': ingest.duration * 1000.0,
             })
+            _logger.info('Optimization %s: %d plan(s), build %.0f ms, submit %.0f ms, solve %.0f ms, ingest %.0f ms',
+                         self.id, len(problems), build.duration * 1000.0, submit_seconds * 1000.0,
+                         solve_seconds * 1000.0, ingest.duration * 1000.0)
 
             return {
                 'type': 'ir.actions.client',
                 'tag': 'display_notification',
                 'params': {
                     'title': _('Success'),
-                    'message': _('Optimization completed! Score: %s') % result.get('score', 'N/A'),
+                    'message': _('Optimization completed! Score: %s') % score,
                     'type': 'success',
                     'sticky': False,
                 }
@@ -289,20 +531,444 @@ class FieldServiceOptimization(models.Model):
             })
             raise UserError(_('Optimization failed: %s') % str(e))
 
-    def _build_timefold_request(self):
+    # ============================================================
+    # PROBLEM DECOMPOSITION
+    # ============================================================
+
+    def _build_problems(self):
+        """Split the run into plans that are solved independently.
+
+        A single-day run starts as one plan. In horizon mode every job
+        first gets a day (see :meth:`_assign_days`) and each day becomes
+        its own plan with the inspectors working that day. Large plans are
+        then split into geographic regions (see :meth:`_partition`), except
+        for warm starts where the current routes already divide the work.
+
+        :return: list of dicts with the route ``date``, the Timefold
+                 ``request`` and the solver ``time_limit`` in seconds
+        """
+        self.ensure_one()
+        if self.planning_mode != 'horizon':
+            days = [(self.optimization_date, self.job_ids, self.inspector_ids)]
+        else:
+            dates = self._planning_days()
+            availability = self._inspector_availability(dates)
+            planned, unplanned = self._assign_days(dates, availability)
+            if unplanned:
+                _logger.warning('Optimization %s: %d job(s) fit no day of the horizon before their due date: %s',
+                                self.id, len(unplanned), unplanned.mapped('job_number'))
+            days = [
+                (day, planned[day], self.inspector_ids.filtered(lambda inspector: day in availability[inspector.id]))
+                for day in dates if planned.get(day)
+            ]
+            if not days:
+                raise UserError(_('No job can be planned between %(start)s and %(end)s: '
+                                  'check the due dates and inspector availability.',
+                                  start=self.optimization_date, end=self.horizon_end_date))
+
+        problems = []
+        for day, jobs, inspectors in days:
+            regions = [(jobs, inspectors)] if self.warm_start else self._partition(jobs, inspectors)
+            if len(regions) > 1:
+                _logger.info('Optimization %s: %d visits on %s split into %d regions of %s visits',
+                             self.id, len(jobs), day, len(regions), [len(region[0]) for region in regions])
+            for region_jobs, region_inspectors in regions:
+                problems.append({
+                    'date': day,
+                    'request': self._build_timefold_request(region_jobs, region_inspectors, day),
+                    'time_limit': self._solver_time(len(region_jobs), len(region_inspectors)),
+                })
+        return problems
+
+    def _solver_time(self, visit_count, vehicle_count):
+        """Solver time of one plan: fixed, or grown with its size.
+
+        A warm start only gets a share of it for local improvement.
+        """
+        if self.adaptive_solver_time:
+            seconds = SOLVER_BASE_SECONDS + SOLVER_SECONDS_PER_VISIT * visit_count \
+                + SOLVER_SECONDS_PER_VEHICLE * vehicle_count
+            seconds = min(max(round(seconds), MIN_SOLVER_SECONDS), self._max_solver_seconds())
+        else:
+            seconds = self.solver_time_seconds
+        if self.warm_start:
+            seconds = max(round(seconds * WARM_START_TIME_RATIO), MIN_SOLVER_SECONDS)
+        return seconds
+
+    def _max_solver_seconds(self):
+        params = self.env['ir.config_parameter'].sudo()
+        return int(params.get_param('property_fielder.optimization.max_solver_seconds', DEFAULT_MAX_SOLVER_SECONDS))
+
+    def _partition(self, jobs, inspectors):
+        """Split a plan into geographic regions solved independently.
+
+        Plans with more visits than ``property_fielder.optimization.partition_size``
+        are clustered with k-means on the visit coordinates. Every region
+        gets its nearest inspector, then each other inspector joins the
+        nearest region still short of capacity. A boundary repair finally
+        moves jobs their region cannot take, for lack of a skilled inspector
+        or of capacity, to the nearest neighbouring region that can.
+
+        :return: list of (jobs, inspectors) pairs
+        """
+        params = self.env['ir.config_parameter'].sudo()
+        partition_size = int(params.get_param('property_fielder.optimization.partition_size', DEFAULT_PARTITION_SIZE))
+        if partition_size <= 0 or len(jobs) <= partition_size or len(inspectors) < 2:
+            return [(jobs, inspectors)]
+        count = min(math.ceil(len(jobs) / partition_size), len(inspectors))
+
+        # Equirectangular projection around the plan, in metres
+        scale = math.cos(math.radians(sum(jobs.mapped('latitude')) / len(jobs)))
+
+        def project(lat, lng):
+            return lat * METERS_PER_DEGREE, lng * METERS_PER_DEGREE * scale
+
+        def distance(a, b):
+            return math.hypot(a[0] - b[0], a[1] - b[1])
+
+        points = [project(job.latitude, job.longitude) for job in jobs]
+        centres, labels = kmeans(points, farthest_points(points, count))
+        # Drop regions k-means left empty
+        used = sorted(set(labels))
+        centres = [centres[label] for label in used]
+        labels = [used.index(label) for label in labels]
+        count = len(centres)
+        if count == 1:
+            return [(jobs, inspectors)]
+
+        homes = {inspector.id: project(*self._start_location(inspector)) for inspector in inspectors}
+        capacity = {inspector.id: inspector.max_jobs_per_day or DEFAULT_MAX_JOBS_PER_DAY for inspector in inspectors}
+        skills = {inspector.id: set(inspector.skill_ids.ids) for inspector in inspectors}
+        demand = [labels.count(region) for region in range(count)]
+        members = [[] for _region in range(count)]
+        supply = [0] * count
+
+        free = list(inspectors.ids)
+        for region in sorted(range(count), key=lambda region: -demand[region]):
+            inspector_id = min(free, key=lambda inspector_id: distance(homes[inspector_id], centres[region]))
+            free.remove(inspector_id)
+            members[region].append(inspector_id)
+            supply[region] += capacity[inspector_id]
+        free.sort(key=lambda inspector_id: min(distance(homes[inspector_id], centre) for centre in centres))
+        for inspector_id in free:
+            short = [region for region in range(count) if supply[region] < demand[region]] or range(count)
+            region = min(short, key=lambda region: distance(homes[inspector_id], centres[region]))
+            members[region].append(inspector_id)
+            supply[region] += capacity[inspector_id]
+
+        # Boundary repair
+        def can_serve(region, job):
+            required = set(job.skill_ids.ids)
+            return any(required <= skills[inspector_id] for inspector_id in members[region])
+
+        def neighbours(index):
+            return sorted((region for region in range(count) if region != labels[index]),
+                          key=lambda region: distance(points[index], centres[region]))
+
+        load = list(demand)
+        for index, job in enumerate(jobs):
+            if can_serve(labels[index], job):
+                continue
+            target = next((region for region in neighbours(index) if can_serve(region, job)), None)
+            if target is not None:
+                load[labels[index]] -= 1
+                load[target] += 1
+                labels[index] = target
+        # Jobs nearest to another region move first out of overloaded regions
+        boundary = sorted(range(len(points)), key=lambda index: distance(points[index], centres[neighbours(index)[0]])
+                          - distance(points[index], centres[labels[index]]))
+        for index in boundary:
+            region = labels[index]
+            if load[region] <= supply[region]:
+                continue
+            target = next((other for other in neighbours(index)
+                           if load[other] < supply[other] and can_serve(other, jobs[index])), None)
+            if target is not None:
+                load[region] -= 1
+                load[target] += 1
+                labels[index] = target
+
+        Job = self.env['property_fielder.job']
+        Inspector = self.env['property_fielder.inspector']
+        return [
+            (Job.browse([job.id for job, label in zip(jobs, labels) if label == region]), Inspector.browse(members[region]))
+            for region in range(count) if region in labels
+        ]
+
+    def _fingerprint(self, problems):
+        """Canonical hash of the inputs of the run and the solver settings.
+
+        Covers, per day, the visits with their windows, skills and
+        priorities and the vehicles with their shifts, homes and skills,
+        plus the solver time and routing settings. What only reflects the
+        current routes is left out (the visits a warm start is seeded
+        with, pinning, the split into regions and the warm-start share of
+        the solver time), so running again on unchanged inputs reuses the
+        previous solution even once its routes are the current ones.
+        """
+        days = defaultdict(lambda: {'visits': {}, 'vehicles': {}})
+        for problem in problems:
+            day = days[problem['date'].isoformat()]
+            for visit in problem['request']['visits']:
+                day['visits'][visit['id']] = {key: value for key, value in visit.items() if key != 'pinned'}
+            for vehicle in problem['request']['vehicles']:
+                day['vehicles'][vehicle['id']] = {key: value for key, value in vehicle.items() if key != 'visits'}
+        canonical = {
+            'use_osrm': self.use_osrm,
+            'adaptive_solver_time': self.adaptive_solver_time,
+            'solver_time_seconds': self.solver_time_seconds,
+            'days': days,
+        }
+        return hashlib.sha256(json.dumps(canonical, sort_keys=True, separators=(',', ':')).encode()).hexdigest()
+
+    def _find_cached_run(self, fingerprint):
+        """Recent completed run of the same problem whose solution can be reused.
+
+        :return: (run, its plans, its results), or (empty recordset, None, None)
+        """
+        params = self.env['ir.config_parameter'].sudo()
+        hours = int(params.get_param('property_fielder.optimization.cache_hours', DEFAULT_CACHE_HOURS))
+        if hours <= 0:
+            return self.browse(), None, None
+        cached = self.search([
+            ('fingerprint', '=', fingerprint),
+            ('state', '=', 'completed'),
+            ('cached_from_id', '=', False),
+            ('id', '!=', self.id),
+            ('create_date', '>=', fields.Datetime.now() - timedelta(hours=hours)),
+        ], order='id desc', limit=1)
+        plans = unpack_payload(cached.request_payload) if cached else None
+        results = unpack_payload(cached.response_payload) if cached else None
+        if not plans or not results or len(results) != len(plans):
+            return self.browse(), None, None
+        return cached, [dict(plan, date=fields.Date.to_date(plan['date'])) for plan in plans], results
+
+    def _planning_days(self):
+        self.ensure_one()
+        return [self.optimization_date + timedelta(days=offset)
+                for offset in range((self.horizon_end_date - self.optimization_date).days + 1)]
+
+    def _inspector_availability(self, days):
+        """Days of ``days`` each inspector works.
+
+        Comes from the working schedule of the inspector's employee (or the
+        company's) minus public holidays and time off. Inspectors without a
+        schedule are available every day.
+
+        :return: dict {inspector id: set of dates}
+        """
+        start = datetime.combine(days[0], datetime.min.time()).replace(tzinfo=timezone.utc)
+        stop = datetime.combine(days[-1] + timedelta(days=1), datetime.min.time()).replace(tzinfo=timezone.utc)
+        by_calendar = defaultdict(lambda: self.env['property_fielder.inspector'])
+        for inspector in self.inspector_ids:
+            calendar = inspector.employee_id.resource_calendar_id or self.env.company.resource_calendar_id
+            by_calendar[calendar] |= inspector
+
+        availability = {}
+        for calendar, inspectors in by_calendar.items():
+            if not calendar:
+                availability.update((inspector.id, set(days)) for inspector in inspectors)
+                continue
+            intervals = calendar._work_intervals_batch(start, stop, resources=inspectors.employee_id.resource_id)
+            for inspector in inspectors:
+                worked = {interval[0].date() for interval in intervals[inspector.employee_id.resource_id.id]}
+                availability[inspector.id] = worked.intersection(days)
+        return availability
+
+    def _assign_days(self, days, availability):
+        """Spread the jobs over the horizon, most urgent first.
+
+        Jobs are taken by due date (their ``due_date``, or the end of a
+        time window spanning several days) and each goes to the least
+        loaded day of its window on which an available inspector with the
+        required skills still has room. A job is never planned after its
+        due date: when no day fits it stays unplanned. Appointments
+        confirmed by the tenant and time windows within one day are kept
+        on their own date; only the other jobs move.
+
+        :return: ({date: jobs}, unplanned jobs)
+        """
+        Job = self.env['property_fielder.job']
+        remaining = {
+            (inspector.id, day): inspector.max_jobs_per_day or DEFAULT_MAX_JOBS_PER_DAY
+            for inspector in self.inspector_ids
+            for day in days if day in availability[inspector.id]
+        }
+        capacity = defaultdict(int)
+        for (_inspector_id, day), slots in remaining.items():
+            capacity[day] += slots
+        skills = {inspector.id: set(inspector.skill_ids.ids) for inspector in self.inspector_ids}
+
+        windows = {}
+        for job in self.job_ids:
+            first, last = days[0], days[-1]
+            start, end = job.earliest_start, job.latest_end
+            if job.confirmation_state == 'confirmed' or (start and end and start.date() == end.date()):
+                fixed = start.date() if start else job.scheduled_date
+                if fixed:
+                    first = last = fixed
+            elif start and end:
+                first = max(first, start.date())
+                last = min(last, end.date())
+            if job.due_date:
+                last = min(last, job.due_date)
+            route_date = job.route_id.route_date
+            if self.warm_start and route_date and first <= route_date <= last:
+                # Already routed: stays on its day
+                first = last = route_date
+            windows[job.id] = (first, last)
+
+        load = defaultdict(int)
+        planned = defaultdict(list)
+        unplanned = []
+        for job in self.job_ids.sorted(lambda job: (windows[job.id][1], -int(job.priority or 0), job.id)):
+            first, last = windows[job.id]
+            required = set(job.skill_ids.ids)
+            best = None
+            for day in days:
+                if not first <= day <= last:
+                    continue
+                candidates = [inspector_id for inspector_id, inspector_skills in skills.items()
+                              if remaining.get((inspector_id, day)) and required <= inspector_skills]
+                if not candidates:
+                    continue
+                ratio = load[day] / capacity[day]
+                if best is None or ratio < best[0]:
+                    best = (ratio, day, max(candidates, key=lambda inspector_id: remaining[inspector_id, day]))
+            if best is None:
+                unplanned.append(job.id)
+                continue
+            _ratio, day, inspector_id = best
+            remaining[inspector_id, day] -= 1
+            load[day] += 1
+            planned[day].append(job.id)
+        return {day: Job.browse(job_ids) for day, job_ids in planned.items()}, Job.browse(unplanned)
+
+    def _solve_problems(self, timefold_url, problems):
+        """Solve the plans concurrently on the Timefold service.
+
+        Up to ``property_fielder.timefold.max_parallel`` plans solve at the
+        same time. When there are more, the solver time is split between
+        the waves so the whole run stays within its time budget:
+        ``solver_time_seconds``, or the adaptive maximum. Outside of the
+        background runs that budget is capped so the request finishes
+        before the worker's time limit.
+
+        :return: (list of results in the order of ``problems``, seconds spent submitting)
+        """
+        params = self.env['ir.config_parameter'].sudo()
+        max_parallel = max(int(params.get_param('property_fielder.timefold.max_parallel', DEFAULT_MAX_PARALLEL)), 1)
+        run_budget = self._max_solver_seconds() if self.adaptive_solver_time else self.solver_time_seconds
+        if not self.env.context.get('optimization_background'):
+            run_budget = min(run_budget, int(params.get_param(
+                'property_fielder.optimization.interactive_max_seconds', DEFAULT_INTERACTIVE_MAX_SECONDS)))
+        budget = max(run_budget // math.ceil(len(problems) / max_parallel), MIN_SOLVER_SECONDS)
+
+        results = [None] * len(problems)
+        pending = list(range(len(problems)))
+        running = {}  # problem index -> (Timefold job id, start, time limit)
+        submit_seconds = 0.0
+        try:
+            while pending or running:
+                while pending and len(running) < max_parallel:
+                    index = pending.pop(0)
+                    request_data = problems[index]['request']
+                    _logger.info('Submitting to Timefold API at %s: %d visits, %d vehicles',
+                                 timefold_url, len(request_data['visits']), len(request_data['vehicles']))
+                    with Measure(self.env, 'optimization', 'submit') as submit:
+                        response = requests.post(
+                            f'{timefold_url}/route-plans',
+                            json=request_data,
+                            headers={'Content-Type': 'application/json'},
+                            timeout=30
+                        )
+                        response.raise_for_status()
+                    submit_seconds += submit.duration
+                    job_id = response.text.strip().strip('"')  # Response is plain text job ID
+                    _logger.info(f'Timefold job submitted: {job_id}')
+                    running[index] = (job_id, time.monotonic(), min(problems[index]['time_limit'], budget))
+
+                time.sleep(POLL_INTERVAL)
+                for index, (job_id, started, time_limit) in list(running.items()):
+                    # Get current solution
+                    status_response = requests.get(f'{timefold_url}/route-plans/{job_id}', timeout=30)
+                    status_response.raise_for_status()
+                    results[index] = status_response.json()
+
+                    elapsed = time.monotonic() - started
+                    solver_status = results[index].get('solverStatus', 'UNKNOWN')
+                    _logger.info('Timefold %s status: %s, score: %s, elapsed: %.0fs',
+                                 job_id, solver_status, results[index].get('score', 'N/A'), elapsed)
+                    if solver_status == 'NOT_SOLVING':
+                        del running[index]
+                    elif elapsed >= time_limit:
+                        # Waited long enough, terminate early and keep the best solution so far
+                        _logger.info(f'Terminating solver {job_id} after {elapsed:.0f}s')
+                        try:
+                            requests.delete(f'{timefold_url}/route-plans/{job_id}', timeout=10)
+                        except Exception:
+                            pass
+                        del running[index]
+        finally:
+            # A failed submit or poll must not leave the other plans solving
+            for job_id, _started, _time_limit in running.values():
+                try:
+                    requests.delete(f'{timefold_url}/route-plans/{job_id}', timeout=10)
+                except Exception:
+                    pass
+
+        if not all(results):
+            raise UserError(_('No result received from Timefold'))
+        return results, submit_seconds
+
+    def _depot_location(self, inspector):
+        """Start location of an inspector without a home address.
+
+        The work address of the inspector's employee, else the address of
+        their company, else the ``property_fielder.depot_latitude/longitude``
+        parameters.
+        """
+        company = inspector.employee_id.company_id or self.env.company
+        for partner in (inspector.employee_id.address_id, company.partner_id):
+            if partner.partner_latitude and partner.partner_longitude:
+                return [partner.partner_latitude, partner.partner_longitude]
+        params = self.env['ir.config_parameter'].sudo()
+        return [
+            float(params.get_param('property_fielder.depot_latitude') or DEFAULT_DEPOT[0]),
+            float(params.get_param('property_fielder.depot_longitude') or DEFAULT_DEPOT[1]),
+        ]
+
+    def _start_location(self, inspector):
+        """[lat, lng] an inspector's day starts and ends at."""
+        if inspector.home_latitude and inspector.home_longitude:
+            return [inspector.home_latitude, inspector.home_longitude]
+        return self._depot_location(inspector)
+
+    def _build_timefold_request(self, jobs=None, inspectors=None, route_date=None):
         """Build request payload for Timefold API
 
         Format matches the Timefold vehicle-routing service:
         - locations are [lat, lng] arrays
         - serviceDuration is in seconds
         - time fields are ISO datetime strings
+
+        ``jobs``, ``inspectors`` and ``route_date`` restrict the plan to a
+        sub-problem; they default to the whole run.
+
+        For a warm start each vehicle carries its current visits in route
+        order, and started or confirmed visits are sent with ``pinned`` so
+        the solver leaves them where they are.
         """
         self.ensure_one()
-        from datetime import datetime, timedelta
+        jobs = self.job_ids if jobs is None else jobs
+        inspectors = self.inspector_ids if inspectors is None else inspectors
+        route_date = route_date or self.optimization_date
+        current_visits = self._current_visits(jobs, inspectors, route_date) if self.warm_start else {}
+        seeded = {job.id for visit_jobs in current_visits.values() for job in visit_jobs}
 
         # Build visits from jobs
         visits = []
-        for job in self.job_ids:
+        for job in jobs:
             visit = {
                 'id': str(job.id),
                 'name': job.name,
@@ -327,13 +993,16 @@ class FieldServiceOptimization(models.Model):
             if job.priority:
                 visit['priority'] = 10 - int(job.priority) * 3  # Convert 0-3 to 10-1
 
+            if job.id in seeded and self._is_pinned(job):
+                visit['pinned'] = True
+
             visits.append(visit)
 
         # Build vehicles from inspectors
         vehicles = []
-        for inspector in self.inspector_ids:
-            # Calculate departure and shift end times from optimization date + shift hours
-            opt_date = self.optimization_date
+        for inspector in inspectors:
+            # Calculate departure and shift end times from route date + shift hours
+            opt_date = route_date
             shift_start = inspector.shift_start or 8.0
             shift_end = inspector.shift_end or 18.0
 
@@ -355,14 +1024,12 @@ class FieldServiceOptimization(models.Model):
             vehicle = {
                 'id': str(inspector.id),
                 'capacity': inspector.vehicle_capacity or 8,  # Default 8 jobs per inspector
-                'homeLocation': [
-                    inspector.home_latitude or 51.5074,  # Default to London if not set
-                    inspector.home_longitude or -0.1278
-                ],
+                'homeLocation': self._start_location(inspector),
                 'departureTime': departure_dt.isoformat(),
                 'shiftEndTime': shift_end_dt.isoformat(),
                 'maxWorkingMinutes': max_working_minutes,
-                'visits': [],  # Must be initialized as empty array for Timefold
+                # Must be an array for Timefold: empty, or the current visits for a warm start
+                'visits': [str(job.id) for job in current_visits.get(inspector.id, [])],
             }
 
             # Add skills if any
@@ -377,8 +1044,84 @@ class FieldServiceOptimization(models.Model):
             'visits': visits,
         }
 
-    def _process_timefold_response(self, result):
-        """Process Timefold response and create routes
+    def _current_visits(self, jobs, inspectors, route_date):
+        """Visits of ``jobs`` already routed to ``inspectors`` on ``route_date``.
+
+        :return: dict {inspector id: [jobs in route order]}
+        """
+        current = defaultdict(list)
+        for job in jobs.sorted(lambda job: (job.sequence_in_route, job.id)):
+            if job.route_id.route_date == route_date and job.inspector_id in inspectors \
+                    and job.state not in ('completed', 'cancelled'):
+                current[job.inspector_id.id].append(job)
+        return current
+
+    def _is_pinned(self, job):
+        """Started and tenant-confirmed visits keep their inspector and place."""
+        return job.state == 'in_progress' or job.confirmation_state == 'confirmed'
+
+    def _process_timefold_results(self, problems, results):
+        """Replace the routes of this run with the solved plans.
+
+        A warm start updates the inspectors' current routes in place; a
+        cold start replaces the routes of this run. Routes of earlier runs
+        left empty because their jobs were planned again here are removed,
+        unless the inspector already works them. Started and confirmed jobs
+        the solver moved anyway to another route, inspector or day are put
+        back on their route, in their place and at their times; their
+        sequence and times on their own route are the solver's to change.
+        """
+        self.ensure_one()
+
+        def placement(job):
+            return {
+                'route_id': job.route_id.id,
+                'inspector_id': job.inspector_id.id,
+                'sequence_in_route': job.sequence_in_route,
+                'scheduled_date': job.scheduled_date,
+                'scheduled_arrival_time': job.scheduled_arrival_time,
+                'scheduled_departure_time': job.scheduled_departure_time,
+            }
+
+        routes = self.job_ids.route_id | self.route_ids
+        before = {job.id: (job.inspector_id.id, job.route_id.route_date) for job in self.job_ids if job.route_id}
+        # A cold start drops the routes of this run, their jobs have no place to keep
+        pinned = {
+            job.id: placement(job) for job in self.job_ids
+            if job.route_id and self._is_pinned(job) and (self.warm_start or job.route_id not in self.route_ids)
+        }
+        if self.warm_start:
+            reusable = {
+                (route.inspector_id.id, route.route_date): route
+                for route in routes.filtered(lambda route: route.state not in ('completed', 'cancelled'))
+            }
+        else:
+            reusable = {}
+            self.route_ids.unlink()
+        for problem, result in zip(problems, results):
+            self._process_timefold_response(result, route_date=problem['date'], routes=reusable)
+
+        broken = self.job_ids.filtered(lambda job: job.id in pinned and any(
+            placement(job)[fname] != pinned[job.id][fname]
+            for fname in ('route_id', 'inspector_id', 'scheduled_date')
+        ))
+        if broken:
+            _logger.warning('Optimization %s: pinned jobs %s were moved by the solver, restoring them',
+                            self.id, broken.mapped('job_number'))
+            for job in broken:
+                job.write(pinned[job.id])
+        routes.exists().filtered(
+            lambda route: route.state in ('draft', 'optimized') and not route.job_ids
+        ).unlink()
+
+        self.moved_job_count = len([job for job in self.job_ids.filtered(lambda job: job.id in before)
+                                    if (job.inspector_id.id, job.route_id.route_date) != before[job.id]])
+
+    def _process_timefold_response(self, result, route_date=None, routes=None):
+        """Process Timefold response and create routes for ``route_date``
+
+        ``routes`` maps (inspector id, date) to existing routes to update
+        instead of creating new ones.
 
         Timefold returns:
         {
@@ -405,10 +1148,7 @@ class FieldServiceOptimization(models.Model):
         }
         """
         self.ensure_one()
-        from datetime import datetime
-
-        # Clear existing routes
-        self.route_ids.unlink()
+        route_date = route_date or self.optimization_date
 
         # Build a lookup of visit data for arrival/departure times
         visits_lookup = {}
@@ -439,18 +1179,28 @@ class FieldServiceOptimization(models.Model):
             else:
                 visit_ids = [str(first_visit)]
 
-            # Create route
-            route = self.env['property_fielder.route'].create({
-                'name': f'Route for Inspector {inspector_id}',
-                'inspector_id': inspector_id,
-                'route_date': self.optimization_date,
+            route_vals = {
                 'optimization_id': self.id,
                 'total_distance_km': vehicle_data.get('totalDistanceMeters', 0) / 1000.0,
                 'total_drive_time_minutes': vehicle_data.get('totalDrivingTimeSeconds', 0) / 60,
                 'total_work_time_minutes': vehicle_data.get('totalWorkTimeSeconds', 0) / 60,
                 'optimization_score': str(result.get('score', 'N/A')),
-                'state': 'optimized'
-            })
+            }
+            route = (routes or {}).get((inspector_id, route_date))
+            if route:
+                # Warm start: keep the route the inspector knows, and its state once assigned
+                if route.state == 'draft':
+                    route_vals['state'] = 'optimized'
+                route.write(route_vals)
+            else:
+                # Create route
+                route = self.env['property_fielder.route'].create(dict(
+                    route_vals,
+                    name=f'Route for Inspector {inspector_id}',
+                    inspector_id=inspector_id,
+                    route_date=route_date,
+                    state='optimized',
+                ))
 
             # Assign jobs to route with scheduled times
             for seq, visit_id in enumerate(visit_ids, start=1):
@@ -469,9 +1219,12 @@ class FieldServiceOptimization(models.Model):
                 job_data = {
                     'route_id': route.id,
                     'inspector_id': inspector_id,
-                    'state': 'assigned',
                     'sequence_in_route': seq,
+                    'scheduled_date': route_date,
                 }
+                # Never send a started job back to assigned
+                if job.state in ('draft', 'pending'):
+                    job_data['state'] = 'assigned'
 
                 # Parse arrival time
                 arrival_time = visit_data.get('arrivalTime')
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+
+import functools
+import heapq
+import json
+import logging
+import threading
+import time
+
+from odoo import models, fields, api, SUPERUSER_ID
+from odoo.tools import SQL
+
+_logger = logging.getLogger(__name__)
+
+# Latency histogram bounds (seconds) and the columns counting them
+BUCKETS = [
+    (0.05, 'le_50ms'), (0.1, 'le_100ms'), (0.25, 'le_250ms'), (0.5, 'le_500ms'),
+    (1.0, 'le_1s'), (2.5, 'le_2500ms'), (5.0, 'le_5s'), (10.0, 'le_10s'),
+]
+COUNTERS = ['count', 'error_count', 'duration_sum', 'query_count_sum',
+            'query_time_sum', 'bytes_sum'] + [column for _bound, column in BUCKETS]
+# Measurements are buffered per worker and written at most this often
+FLUSH_INTERVAL = 30
+DEFAULT_SLOW_MS = 2000
+# At most one slow sample per name and worker in this many seconds
+SAMPLE_INTERVAL = 60
+TOP_QUERIES = 5
+MAX_QUERY_LENGTH = 2000
+DEFAULT_SAMPLE_RETENTION_DAYS = 14
+
+KINDS = [
+    ('route', 'HTTP Route'),
+    ('cron', 'Scheduled Action'),
+    ('rpc', 'RPC Method'),
+    ('optimization', 'Optimization Phase'),
+]
+
+
+class MetricsBuffer:
+    """Measurements of one database not yet written by this worker."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.metrics = {}
+        self.samples = []
+        self.last_flush = time.monotonic()
+        self.last_sample = {}
+        self.slow_ms = DEFAULT_SLOW_MS
+
+    def add(self, kind, name, duration, queries, query_time, size, error):
+        with self.lock:
+            values = self.metrics.get((kind, name))
+            if values is None:
+                values = self.metrics[(kind, name)] = dict.fromkeys(COUNTERS, 0)
+            values['count'] += 1
+            values['error_count'] += int(error)
+            values['duration_sum'] += duration
+            values['query_count_sum'] += queries
+            values['query_time_sum'] += query_time
+            values['bytes_sum'] += size
+            for bound, column in BUCKETS:
+                if duration <= bound:
+                    values[column] += 1
+
+    def add_bytes(self, kind, name, size):
+        with self.lock:
+            values = self.metrics.setdefault((kind, name), dict.fromkeys(COUNTERS, 0))
+            values['bytes_sum'] += size
+
+    def wants_sample(self, kind, name, duration):
+        if duration * 1000.0 < self.slow_ms:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            last = self.last_sample.get((kind, name))
+            if last is not None and now - last < SAMPLE_INTERVAL:
+                return False
+            self.last_sample[(kind, name)] = now
+            return True
+
+    def add_sample(self, values):
+        with self.lock:
+            self.samples.append(values)
+
+    def is_due(self):
+        return time.monotonic() - self.last_flush >= FLUSH_INTERVAL
+
+    def take(self):
+        with self.lock:
+            metrics, samples = self.metrics, self.samples
+            self.metrics, self.samples = {}, []
+            self.last_flush = time.monotonic()
+            return metrics, samples
+
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def get_buffer(db_name):
+    with _buffers_lock:
+        if db_name not in _buffers:
+            _buffers[db_name] = MetricsBuffer()
+        return _buffers[db_name]
+
+
+def flush(registry):
+    """Write this worker's buffered measurements in their own transaction."""
+    buffer = get_buffer(registry.db_name)
+    metrics, samples = buffer.take()
+    if registry.in_test_mode():
+        return
+    try:
+        with registry.cursor() as cr:
+            env = api.Environment(cr, SUPERUSER_ID, {})
+            if metrics:
+                env['property_fielder.perf.metric']._accumulate(metrics)
+            if samples:
+                env['property_fielder.perf.sample'].create(samples)
+            buffer.slow_ms = int(env['ir.config_parameter'].get_param(
+                'property_fielder.slow_request_ms', DEFAULT_SLOW_MS
+            ))
+    except Exception:
+        _logger.warning('Could not store performance metrics', exc_info=True)
+
+
+class Measure:
+    """Record wall time, SQL queries and response size of one execution.
+
+    Used as a context manager around a route, cron or method::
+
+        with Measure(env, 'route', '/mobile/api/sync') as measure:
+            ...
+        measure.duration  # seconds
+
+    Query count and time come from the per-thread counters the cursor
+    maintains; the slowest statements are kept through a thread query
+    hook so that a slow execution can be sampled with its top queries
+    (statements only, never their parameters).
+    """
+
+    def __init__(self, env, kind, name):
+        self.registry = env.registry
+        self.uid = env.uid
+        self.kind = kind
+        self.name = name
+        self.response_bytes = 0
+        self.duration = 0.0
+        self._top = []
+
+    def _query_hook(self, cr, query, params, start, delay):
+        entry = (delay, len(self._top), str(query)[:MAX_QUERY_LENGTH])
+        if len(self._top) < TOP_QUERIES:
+            heapq.heappush(self._top, entry)
+        elif delay > self._top[0][0]:
+            heapq.heapreplace(self._top, entry)
+
+    def __enter__(self):
+        thread = self._thread = threading.current_thread()
+        if not hasattr(thread, 'query_count'):
+            # Cron and job threads: make the cursor count for us
+            thread.query_count = 0
+            thread.query_time = 0
+        if not hasattr(thread, 'query_hooks'):
+            thread.query_hooks = []
+        thread.query_hooks.append(self._query_hook)
+        self._queries = thread.query_count
+        self._query_time = thread.query_time
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._start
+        thread = self._thread
+        thread.query_hooks.remove(self._query_hook)
+        queries = thread.query_count - self._queries
+        query_time = thread.query_time - self._query_time
+        error = exc_type is not None
+
+        buffer = get_buffer(self.registry.db_name)
+        buffer.add(self.kind, self.name, self.duration, queries, query_time,
+                   self.response_bytes, error)
+        if buffer.wants_sample(self.kind, self.name, self.duration):
+            buffer.add_sample({
+                'kind': self.kind,
+                'name': self.name,
+                'recorded_at': fields.Datetime.now(),
+                'user_id': self.uid or False,
+                'duration_ms': self.duration * 1000.0,
+                'query_count': queries,
+                'query_time_ms': query_time * 1000.0,
+                'response_bytes': self.response_bytes,
+                'error': error,
+                'top_queries': json.dumps([
+                    {'ms': round(delay * 1000.0, 2), 'query': query}
+                    for delay, _order, query in sorted(self._top, reverse=True)
+                ], indent=1),
+            })
+        if buffer.is_due():
+            flush(self.registry)
+        return False
+
+
+def instrumented(kind='rpc', name=None):
+    """Decorator measuring every call of a model method.
+
+    The metric is named ``<model>.<method>`` unless ``name`` is given.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with Measure(self.env, kind, name or '%s.%s' % (self._name, method.__name__)):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class PerfMetric(models.Model):
+    """Cumulative latency counters per route, cron, RPC method or phase.
+
+    Workers add their buffered measurements with one upsert every
+    ``FLUSH_INTERVAL`` seconds, so the table holds totals across all
+    workers; ``/metrics`` exports it in the Prometheus text format.
+    """
+    _name = 'property_fielder.perf.metric'
+    _description = 'Performance Metric'
+    _log_access = False
+    _order = 'kind, name'
+
+    kind = fields.Selection(KINDS, string='Kind', required=True)
+    name = fields.Char(string='Name', required=True)
+    count = fields.Integer(string='Calls')
+    error_count = fields.Integer(string='Errors')
+    duration_sum = fields.Float(string='Total Time (s)')
+    query_count_sum = fields.Float(string='SQL Queries', digits=(16, 0))
+    query_time_sum = fields.Float(string='SQL Time (s)')
+    bytes_sum = fields.Float(string='Response Bytes', digits=(16, 0))
+    le_50ms = fields.Integer(string='≤ 50 ms')
+    le_100ms = fields.Integer(string='≤ 100 ms')
+    le_250ms = fields.Integer(string='≤ 250 ms')
+    le_500ms = fields.Integer(string='≤ 500 ms')
+    le_1s = fields.Integer(string='≤ 1 s')
+    le_2500ms = fields.Integer(string='≤ 2.5 s')
+    le_5s = fields.Integer(string='≤ 5 s')
+    le_10s = fields.Integer(string='≤ 10 s')
+
+    avg_ms = fields.Float(string='Average (ms)', compute='_compute_averages', digits=(10, 1))
+    avg_queries = fields.Float(string='Queries / Call', compute='_compute_averages', digits=(10, 1))
+
+    _check_name_unique = models.Constraint(
+        'UNIQUE(kind, name)',
+        'Metric names must be unique per kind!',
+    )
+
+    @api.depends('count', 'duration_sum', 'query_count_sum')
+    def _compute_averages(self):
+        for metric in self:
+            calls = metric.count or 1
+            metric.avg_ms = metric.duration_sum * 1000.0 / calls
+            metric.avg_queries = metric.query_count_sum / calls
+
+    @api.model
+    def _accumulate(self, metrics):
+        """Add buffered counters {(kind, name): {counter: value}} in one upsert."""
+        columns = ['kind', 'name'] + COUNTERS
+        placeholders = '(%s)' % ', '.join(['%s'] * len(columns))
+        self.env.cr.execute(SQL(
+            """INSERT INTO property_fielder_perf_metric (%s) VALUES %s
+               ON CONFLICT (kind, name) DO UPDATE SET %s""",
+            SQL(', ').join(SQL.identifier(column) for column in columns),
+            SQL(', ').join(
+                SQL(placeholders, kind, name, *(values[counter] for counter in COUNTERS))
+                for (kind, name), values in sorted(metrics.items())
+            ),
+            SQL(', ').join(
+                SQL('%s = property_fielder_perf_metric.%s + EXCLUDED.%s',
+                    SQL.identifier(counter), SQL.identifier(counter), SQL.identifier(counter))
+                for counter in COUNTERS
+            ),
+        ))
+
+    @api.model
+    def _prometheus_text(self):
+        """All metrics in the Prometheus text exposition format."""
+        self.env.cr.execute(SQL(
+            "SELECT kind, name, %s FROM property_fielder_perf_metric ORDER BY kind, name",
+            SQL(', ').join(SQL.identifier(counter) for counter in COUNTERS),
+        ))
+        rows = [dict(zip(['kind', 'name'] + COUNTERS, row)) for row in self.env.cr.fetchall()]
+        prefix = 'property_fielder'
+        lines = [
+            '# HELP %s_duration_seconds Wall time of routes, crons, RPC methods and optimization phases.' % prefix,
+            '# TYPE %s_duration_seconds histogram' % prefix,
+        ]
+        for row in rows:
+            labels = 'kind="%s",name="%s"' % (escape_label(row['kind']), escape_label(row['name']))
+            for bound, column in BUCKETS:
+                lines.append('%s_duration_seconds_bucket{%s,le="%s"} %d' % (prefix, labels, bound, row[column]))
+            lines.append('%s_duration_seconds_bucket{%s,le="+Inf"} %d' % (prefix, labels, row['count']))
+            lines.append('%s_duration_seconds_sum{%s} %s' % (prefix, labels, repr(float(row['duration_sum']))))
+            lines.append('%s_duration_seconds_count{%s} %d' % (prefix, labels, row['count']))
+        for metric, column, help_text in [
+            ('errors_total', 'error_count', 'Executions that raised an error.'),
+            ('sql_queries_total', 'query_count_sum', 'SQL statements executed.'),
+            ('sql_seconds_total', 'query_time_sum', 'Time spent in SQL statements.'),
+            ('response_bytes_total', 'bytes_sum', 'Response bytes sent by routes.'),
+        ]:
+            lines.append('# HELP %s_%s %s' % (prefix, metric, help_text))
+            lines.append('# TYPE %s_%s counter' % (prefix, metric))
+            for row in rows:
+                lines.append('%s_%s{kind="%s",name="%s"} %s' % (
+                    prefix, metric, escape_label(row['kind']), escape_label(row['name']),
+                    repr(float(row[column])),
+                ))
+        return '\n'.join(lines) + '\n'
+
+    def action_reset(self):
+        """Restart the counters from zero."""
+        self.unlink()
+
+
+class PerfSample(models.Model):
+    """Executions slower than ``property_fielder.slow_request_ms``.
+
+    Each worker keeps at most one sample per name every
+    ``SAMPLE_INTERVAL`` seconds, with its slowest SQL statements.
+    """
+    _name = 'property_fielder.perf.sample'
+    _description = 'Slow Request Sample'
+    _log_access = False
+    _order = 'recorded_at desc'
+    _rec_name = 'name'
+
+    kind = fields.Selection(KINDS, string='Kind', required=True)
+    name = fields.Char(string='Name', required=True)
+    recorded_at = fields.Datetime(string='Recorded At', required=True, index=True)
+    user_id = fields.Many2one('res.users', string='User', ondelete='set null')
+    duration_ms = fields.Float(string='Duration (ms)', digits=(10, 1))
+    query_count = fields.Integer(string='SQL Queries')
+    query_time_ms = fields.Float(string='SQL Time (ms)', digits=(10, 1))
+    response_bytes = fields.Integer(string='Response Bytes')
+    error = fields.Boolean(string='Error')
+    top_queries = fields.Text(string='Slowest Queries')
+
+    @api.model
+    def _cron_purge_samples(self):
+        """Drop samples older than the retention period."""
+        days = int(self.env['ir.config_parameter'].sudo().get_param(
+            'property_fielder.perf_sample_retention_days', DEFAULT_SAMPLE_RETENTION_DAYS
+        ))
+        self.env.cr.execute("""
+            DELETE FROM property_fielder_perf_sample
+             WHERE recorded_at < (now() at time zone 'UTC') - %s * interval '1 day'
+        """, (days,))
@@ -1,6 +1,10 @@
 # -*- coding: utf-8 -*-
 
 from odoo import models, fields, api, _
+import json
+import logging
+
+_logger = logging.getLogger(__name__)
 
 
 class FieldServiceRoute(models.Model):
@@ -8,8 +12,15 @@ class FieldServiceRoute(models.Model):
     
     _name = 'property_fielder.route'
     _description = 'Field Service Route'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'property_fielder.dispatch.mixin']
     _order = 'route_date desc, id desc'
+
+    # Dispatch board diffs (see property_fielder.dispatch.mixin)
+    _dispatch_key = 'routes'
+    _dispatch_fields = [
+        'name', 'route_number', 'inspector_id', 'job_ids', 'state', 'start_time',
+        'total_distance_km', 'total_time_minutes', 'optimization_score', 'route_date',
+    ]
     
     # Basic Information
     name = fields.Char(
@@ -115,6 +126,15 @@ class FieldServiceRoute(models.Model):
         string='Route Geometry',
         help='GeoJSON geometry for route visualization'
     )
+    route_legs = fields.Json(
+        string='Route Legs',
+        help='Per-leg distance, drive time and ETA, computed with the geometry'
+    )
+    route_waypoint_hash = fields.Char(
+        string='Waypoint Hash',
+        copy=False,
+        help='Hash of the waypoints and schedule the stored geometry was computed for'
+    )
 
     # ============================================================
     # RE-OPTIMIZATION & INSPECTOR ACKNOWLEDGMENT
@@ -143,7 +163,8 @@ class FieldServiceRoute(models.Model):
     )
     inspector_acknowledgment_token = fields.Char(
         string='Acknowledgment Token',
-        copy=False
+        copy=False,
+        index='btree_not_null'
     )
 
     # Confirmation Stats (computed)
@@ -178,7 +199,61 @@ class FieldServiceRoute(models.Model):
         for vals in vals_list:
             if vals.get('route_number', _('New')) == _('New'):
                 vals['route_number'] = self.env['ir.sequence'].next_by_code('property_fielder.route') or _('New')
-        return super().create(vals_list)
+        routes = super().create(vals_list)
+        routes._schedule_geometry_refresh()
+        return routes
+
+    def write(self, vals):
+        result = super().write(vals)
+        if {'inspector_id', 'start_time', 'job_ids'}.intersection(vals):
+            self._schedule_geometry_refresh()
+        return result
+
+    def _dispatch_date(self):
+        return self.route_date
+
+    # ============================================================
+    # ROUTE GEOMETRY
+    # ============================================================
+
+    def _schedule_geometry_refresh(self):
+        """Compute road geometry in the background once the change commits."""
+        cron = self.env.ref(
+            'property_fielder_field_service.ir_cron_route_geometry',
+            raise_if_not_found=False
+        )
+        if cron and self:
+            cron.sudo()._trigger()
+
+    @api.model
+    def _cron_refresh_route_geometry(self):
+        """Refresh geometry of upcoming routes whose waypoints changed."""
+        routes = self.search([
+            ('route_date', '>=', fields.Date.context_today(self)),
+            ('state', 'not in', ('completed', 'cancelled')),
+        ])
+        updated = self.env['property_fielder.route.geometry'].refresh_routes(routes)
+        if updated:
+            _logger.info('Refreshed geometry for %d routes', len(updated))
+
+    @api.model
+    def get_map_geometry(self, route_ids):
+        """Stored geometry and legs for the map.
+
+        Geometry is only read here; it is computed by the geometry cron, which
+        route changes trigger. Routes without geometry yet are drawn with
+        straight lines by the map.
+
+        :return: {route_id: {'geometry': GeoJSON dict or False, 'legs': [...]}}
+        """
+        routes = self.browse(route_ids).exists()
+        return {
+            route.id: {
+                'geometry': json.loads(route.route_geometry) if route.route_geometry else False,
+                'legs': route.route_legs or [],
+            }
+            for route in routes
+        }
     
     @api.depends('job_ids')
     def _compute_job_count(self):
@@ -235,11 +310,29 @@ class FieldServiceRoute(models.Model):
 
     def _generate_acknowledgment_token(self):
         """Generate a secure token for inspector acknowledgment."""
-        import secrets
         self.ensure_one()
-        token = secrets.token_urlsafe(32)
-        self.write({'inspector_acknowledgment_token': token})
-        return token
+        return self._generate_acknowledgment_tokens()[self.id]
+
+    def _generate_acknowledgment_tokens(self):
+        """Issue acknowledgment tokens for many routes in one statement.
+
+        :return: dict {route id: token}
+        """
+        import secrets
+        if not self:
+            return {}
+        tokens = {route.id: secrets.token_urlsafe(32) for route in self}
+        self.flush_recordset(['inspector_acknowledgment_token'])
+        self.env.cr.execute("""
+            UPDATE property_fielder_route r
+               SET inspector_acknowledgment_token = v.token,
+                   write_date = (now() at time zone 'UTC'),
+                   write_uid = %s
+              FROM unnest(%s::int[], %s::varchar[]) AS v(id, token)
+             WHERE r.id = v.id
+        """, (self.env.uid, list(tokens), list(tokens.values())))
+        self.invalidate_recordset(['inspector_acknowledgment_token', 'write_date', 'write_uid'])
+        return tokens
 
     def action_acknowledge_schedule(self):
         """Inspector acknowledges receipt of schedule."""
@@ -255,7 +348,7 @@ class FieldServiceRoute(models.Model):
         )
 
     def action_reoptimize(self):
-        """Trigger re-optimization for this route."""
+        """Trigger re-optimization for this route, starting from its current order."""
         self.ensure_one()
         # Get all jobs from this route
         jobs = self.job_ids
@@ -268,6 +361,7 @@ class FieldServiceRoute(models.Model):
             'optimization_date': self.route_date,
             'job_ids': [(6, 0, jobs.ids)],
             'inspector_ids': [(6, 0, [self.inspector_id.id])],
+            'warm_start': True,
             'state': 'draft',
         })
 
@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+
+import hashlib
+import json
+import logging
+from datetime import timedelta
+from math import radians, sin, cos, sqrt, atan2
+
+import requests
+
+from odoo import models, fields, api
+
+_logger = logging.getLogger(__name__)
+
+DEFAULT_OSRM_URL = 'https://osrmproj-production.up.railway.app'
+# Coordinates per OSRM request; longer routes are fetched in overlapping chunks
+OSRM_MAX_WAYPOINTS = 100
+# Straight-line fallback speed, as in the distance API
+FALLBACK_SPEED_KMH = 50.0
+
+
+def waypoint_hash(waypoints, schedule=''):
+    """Stable hash of a (lon, lat) waypoint list, rounded to ~1 m.
+
+    ``schedule`` adds the inputs of the ETAs (start time, job durations).
+    """
+    key = ';'.join('%.5f,%.5f' % (lon, lat) for lon, lat in waypoints)
+    return hashlib.sha1(('%s|%s' % (key, schedule)).encode()).hexdigest()
+
+
+def haversine_km(lon1, lat1, lon2, lat2):
+    lat1, lon1, lat2, lon2 = map(radians, (lat1, lon1, lat2, lon2))
+    a = sin((lat2 - lat1) / 2) ** 2 + cos(lat1) * cos(lat2) * sin((lon2 - lon1) / 2) ** 2
+    return 6371.0 * 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+class RouteGeometryService(models.AbstractModel):
+    """Server-side road geometry for routes.
+
+    Builds home → jobs → home waypoints, fetches the road geometry and leg
+    breakdown from OSRM (one HTTP session per batch, identical waypoint sets
+    fetched once) and falls back to straight lines when OSRM is unavailable.
+    """
+    _name = 'property_fielder.route.geometry'
+    _description = 'Route Geometry Service'
+
+    @api.model
+    def _route_stops(self, route):
+        """Ordered stops of a route: [(label, job or None, lon, lat)]."""
+        inspector = route.inspector_id
+        home = None
+        if inspector.home_latitude and inspector.home_longitude:
+            home = ('home', None, inspector.home_longitude, inspector.home_latitude)
+        stops = [home] if home else []
+        for job in route.job_ids.sorted(lambda j: (j.sequence_in_route, j.id)):
+            if job.latitude and job.longitude:
+                stops.append((job.job_number or job.name, job, job.longitude, job.latitude))
+        if home:
+            stops.append(home)
+        return stops
+
+    @api.model
+    def _fetch_osrm(self, session, waypoints):
+        """Fetch geometry and legs for waypoints, chunking long routes."""
+        osrm_url = self.env['ir.config_parameter'].sudo().get_param(
+            'property_fielder.osrm.url', DEFAULT_OSRM_URL
+        )
+        coordinates = []
+        legs = []
+        start = 0
+        while start < len(waypoints) - 1:
+            chunk = waypoints[start:start + OSRM_MAX_WAYPOINTS]
+            response = session.get(
+                '%s/route/v1/driving/%s' % (osrm_url, ';'.join('%s,%s' % point for point in chunk)),
+                params={'overview': 'full', 'geometries': 'geojson'},
+                timeout=10,
+            )
+            response.raise_for_status()
+            data = response.json()
+            if data.get('code') != 'Ok' or not data.get('routes'):
+                raise ValueError(data.get('message') or data.get('code'))
+            route = data['routes'][0]
+            points = route['geometry']['coordinates']
+            coordinates.extend(points[1:] if coordinates else points)
+            legs.extend((leg['distance'] / 1000.0, leg['duration'] / 60.0) for leg in route['legs'])
+            start += len(chunk) - 1
+        return coordinates, legs
+
+    @api.model
+    def _straight_line(self, waypoints):
+        legs = []
+        for (lon1, lat1), (lon2, lat2) in zip(waypoints, waypoints[1:]):
+            distance = haversine_km(lon1, lat1, lon2, lat2)
+            legs.append((distance, distance / FALLBACK_SPEED_KMH * 60.0))
+        return [list(point) for point in waypoints], legs
+
+    @api.model
+    def _build_legs(self, route, stops, leg_metrics):
+        """Per-leg distance, drive time and ETA at each stop."""
+        clock = route.start_time
+        legs = []
+        for (origin, destination), (distance_km, drive_minutes) in zip(zip(stops, stops[1:]), leg_metrics):
+            eta = clock + timedelta(minutes=drive_minutes) if clock else None
+            job = destination[1]
+            legs.append({
+                'from': origin[0],
+                'to': destination[0],
+                'job_id': job.id if job else False,
+                'distance_km': round(distance_km, 2),
+                'drive_minutes': round(drive_minutes, 1),
+                'eta': fields.Datetime.to_string(eta) if eta else False,
+            })
+            if eta:
+                clock = eta + timedelta(minutes=job.duration_minutes if job else 0)
+        return legs
+
+    @api.model
+    def refresh_routes(self, routes, force=False):
+        """Recompute geometry for routes whose waypoints changed.
+
+        The stored waypoint hash is the cache key: routes whose stops did
+        not move are skipped, and identical waypoint sets within a batch
+        share one OSRM request. Straight-line fallbacks are stored without a
+        hash so the next run retries OSRM.
+
+        :return: routes that were updated
+        """
+        updated = routes.browse()
+        fetched = {}
+        fallback = set()
+        with requests.Session() as session:
+            for route in routes:
+                stops = self._route_stops(route)
+                waypoints = [(stop[2], stop[3]) for stop in stops]
+                schedule = '%s|%s' % (route.start_time, [stop[1].duration_minutes for stop in stops if stop[1]])
+                key = waypoint_hash(waypoints, schedule)
+                if not force and route.route_waypoint_hash == key:
+                    continue
+                if len(waypoints) < 2:
+                    route.write({
+                        'route_geometry': False,
+                        'route_legs': [],
+                        'route_waypoint_hash': key,
+                    })
+                    updated |= route
+                    continue
+                path_key = waypoint_hash(waypoints)
+                if path_key not in fetched:
+                    try:
+                        fetched[path_key] = self._fetch_osrm(session, waypoints)
+                    except (requests.RequestException, ValueError, KeyError) as e:
+                        _logger.warning('OSRM geometry failed for route %s, using straight lines: %s',
+                                        route.id, e)
+                        fetched[path_key] = self._straight_line(waypoints)
+                        fallback.add(path_key)
+                coordinates, leg_metrics = fetched[path_key]
+                route.write({
+                    'route_geometry': json.dumps({'type': 'LineString', 'coordinates': coordinates}),
+                    'route_legs': self._build_legs(route, stops, leg_metrics),
+                    'route_waypoint_hash': False if path_key in fallback else key,
+                })
+                updated |= route
+        return updated
@@ -15,6 +15,7 @@ export class DispatchMapWidget extends Component {
         jobs: { type: Array, optional: true },
         routes: { type: Array, optional: true },
         inspectors: { type: Array, optional: true },
+        positions: { type: Object, optional: true }, // Live GPS positions keyed by inspector id
         selectedInspectorIds: { type: Array, optional: true }, // Highlight selected inspectors
         selectedJobIds: { type: Array, optional: true }, // Selected job IDs for visual differentiation
         hoveredJobId: { type: [Number, { value: null }], optional: true }, // Job to highlight on map
@@ -32,6 +33,7 @@ export class DispatchMapWidget extends Component {
         this.map = null;
         this.markers = [];
         this.inspectorMarkers = []; // Inspector home location markers
+        this.positionMarkers = new Map(); // Live GPS markers keyed by inspector id
         this.routeLayers = [];
         this.mapboxToken = null;
         this.clusterSourceId = 'job-clusters';
@@ -54,6 +56,9 @@ export class DispatchMapWidget extends Component {
                 const inspectorsChanged = JSON.stringify(this.props.selectedInspectorIds || []) !==
                                           JSON.stringify(nextProps.selectedInspectorIds || []);
                 const hoveredJobChanged = this.props.hoveredJobId !== nextProps.hoveredJobId;
+                if (this.props.positions !== nextProps.positions) {
+                    setTimeout(() => this.renderLivePositions(), 10);
+                }
 
                 if (currentVersion !== nextVersion || jobsChanged || routesChanged) {
                     console.log('[MapWidget] Data changed, re-rendering...', {
@@ -133,6 +138,7 @@ export class DispatchMapWidget extends Component {
                 this.renderJobs();
                 this.renderRoutes();
                 this.renderInspectorMarkers();
+                this.renderLivePositions();
                 this.setupPopupClickHandler();
             });
 
@@ -514,59 +520,33 @@ export class DispatchMapWidget extends Component {
         // If no routes, we're done (map is now clear)
         if (!this.props.routes || this.props.routes.length === 0) return;
 
-        // OSRM server URL
-        const osrmUrl = 'https://osrmproj-production.up.railway.app';
+        // Road geometry is computed and stored on the server; load it for all routes at once
+        let storedGeometry = {};
+        try {
+            storedGeometry = await this.orm.call(
+                "property_fielder.route",
+                "get_map_geometry",
+                [this.props.routes.map(route => route.id)]
+            );
+        } catch (error) {
+            console.warn("[MapWidget] Failed to load route geometry, using straight lines:", error);
+        }
+        // Routes may have changed while the geometry was loading
+        if (!this.map) return;
 
-        // Add route polylines - fetch real road geometry from OSRM
         for (let index = 0; index < this.props.routes.length; index++) {
             const route = this.props.routes[index];
             if (!route.job_ids || route.job_ids.length === 0) continue;
 
             const layerId = `route-${route.id}`;
+            if (this.map.getSource(layerId)) continue;
 
-            // Get inspector home location as start/end point
-            const inspector = this.props.inspectors?.find(i =>
-                route.inspector_id && i.id === route.inspector_id[0]
-            );
-            const homeLat = inspector?.home_latitude || 51.5074;
-            const homeLng = inspector?.home_longitude || -0.1278;
-
-            // Get jobs in sequence order
-            const jobs = this.props.jobs?.filter(j => route.job_ids.includes(j.id)) || [];
-            jobs.sort((a, b) => (a.sequence_in_route || 0) - (b.sequence_in_route || 0));
-
-            // Build waypoints: home -> jobs -> home
-            const waypoints = [[homeLng, homeLat]];
-            jobs.forEach(job => {
-                if (job.latitude && job.longitude) {
-                    waypoints.push([job.longitude, job.latitude]);
-                }
-            });
-            waypoints.push([homeLng, homeLat]); // Return to home
-
-            if (waypoints.length < 2) continue;
-
-            let routeGeometry = null;
-
-            try {
-                // Build OSRM coordinates string: lng,lat;lng,lat;...
-                const coordsStr = waypoints.map(c => `${c[0]},${c[1]}`).join(';');
-                const osrmRequestUrl = `${osrmUrl}/route/v1/driving/${coordsStr}?overview=full&geometries=geojson`;
-
-                const response = await fetch(osrmRequestUrl);
-                if (response.ok) {
-                    const data = await response.json();
-                    if (data.code === 'Ok' && data.routes && data.routes[0]?.geometry) {
-                        routeGeometry = data.routes[0].geometry;
-                        console.log(`[Route ${route.id}] OSRM returned ${routeGeometry.coordinates.length} points`);
-                    }
-                }
-            } catch (error) {
-                console.warn(`[Route ${route.id}] OSRM failed, using straight lines:`, error.message);
-            }
+            let routeGeometry = storedGeometry[route.id]?.geometry || null;
 
-            // Fallback to straight lines if OSRM failed
+            // Fallback to straight lines between the jobs
             if (!routeGeometry) {
+                const waypoints = this.getRouteCoordinates(route);
+                if (waypoints.length < 2) continue;
                 routeGeometry = {
                     type: 'LineString',
                     coordinates: waypoints
@@ -604,6 +584,7 @@ export class DispatchMapWidget extends Component {
     getRouteCoordinates(route) {
         // Get coordinates from jobs in the route (used as fallback)
         const jobs = this.props.jobs?.filter(j => route.job_ids.includes(j.id)) || [];
+        jobs.sort((a, b) => (a.sequence_in_route || 0) - (b.sequence_in_route || 0));
         return jobs
             .filter(j => j.latitude && j.longitude)
             .map(j => [j.longitude, j.latitude]);
@@ -774,6 +755,42 @@ export class DispatchMapWidget extends Component {
             this.inspectorMarkers.push(marker);
         }
     }
+
+    /**
+     * Show the live GPS position of each inspector.
+     * Existing markers are moved rather than recreated, so frequent
+     * position updates stay cheap.
+     */
+    renderLivePositions() {
+        const positions = this.props.positions || {};
+        const inspectors = new Map((this.props.inspectors || []).map(i => [i.id, i]));
+
+        for (const [inspectorId, marker] of this.positionMarkers) {
+            if (!positions[inspectorId]) {
+                marker.remove();
+                this.positionMarkers.delete(inspectorId);
+            }
+        }
+
+        for (const [key, position] of Object.entries(positions)) {
+            const inspectorId = Number(key);
+            const lngLat = [position.longitude, position.latitude];
+            const existing = this.positionMarkers.get(inspectorId);
+            if (existing) {
+                existing.setLngLat(lngLat);
+                continue;
+            }
+            const name = inspectors.get(inspectorId)?.name || position.inspector_id[1];
+            const el = document.createElement('div');
+            el.className = 'inspector-live-marker';
+            el.title = name;
+            const marker = new mapboxgl.Marker(el)
+                .setLngLat(lngLat)
+                .setPopup(new mapboxgl.Popup({ offset: 12 }).setText(name))
+                .addTo(this.map);
+            this.positionMarkers.set(inspectorId, marker);
+        }
+    }
 }
 
 // Export the component for use in dispatch views
@@ -1,6 +1,6 @@
 /** @odoo-module **/
 
-import { Component, useState, onWillStart, onMounted } from "@odoo/owl";
+import { Component, useState, onWillStart, onMounted, onWillUnmount } from "@odoo/owl";
 import { registry } from "@web/core/registry";
 import { useService } from "@web/core/utils/hooks";
 import { FloatingPanel } from "./floating_panel";
@@ -19,6 +19,9 @@ export class EnhancedDispatchView extends Component {
         this.orm = useService("orm");
         this.action = useService("action");
         this.notification = useService("notification");
+        this.busService = useService("bus_service");
+        this.dispatchChannel = null;
+        this.onDispatchDiff = (payload) => this.applyDispatchDiff(payload);
 
         this.state = useState({
             // Current tab
@@ -31,6 +34,12 @@ export class EnhancedDispatchView extends Component {
             selectedDate: new Date().toISOString().split('T')[0],
             loading: false,
 
+            // Live updates pushed over the bus (keyed by job id)
+            checkins: {},
+            safetyTimers: {},
+            // Live inspector GPS positions (keyed by inspector id)
+            positions: {},
+
             // Panel visibility (legacy, kept for compatibility)
             panels: {
                 resources: true,
@@ -87,6 +96,12 @@ export class EnhancedDispatchView extends Component {
 
         onMounted(() => {
             this.loadPanelVisibility();
+            this.busService.subscribe("property_fielder.dispatch/diff", this.onDispatchDiff);
+        });
+
+        onWillUnmount(() => {
+            this.busService.unsubscribe("property_fielder.dispatch/diff", this.onDispatchDiff);
+            this.setDispatchChannel(null);
         });
     }
 
@@ -456,7 +471,7 @@ export class EnhancedDispatchView extends Component {
     async loadData(autoSelectDate = false) {
         this.state.loading = true;
         try {
-            const [jobs, routes, inspectors] = await Promise.all([
+            const [jobs, routes, inspectors, positions] = await Promise.all([
                 this.orm.searchRead(
                     "property_fielder.job",
                     [["scheduled_date", "=", this.state.selectedDate]],
@@ -477,11 +492,22 @@ export class EnhancedDispatchView extends Component {
                     ["id", "name", "user_id", "skill_ids", "active", "available", "home_latitude", "home_longitude",
                      "shift_start", "shift_end"]
                 ),
+                this.orm.call("property_fielder.inspector.position", "get_latest_positions", [], {
+                    max_age_minutes: 24 * 60,
+                }),
             ]);
 
             this.state.jobs = jobs;
             this.state.routes = routes;
             this.state.inspectors = inspectors;
+            this.state.checkins = {};
+            this.state.safetyTimers = {};
+            this.state.positions = Object.fromEntries(
+                positions
+                    .filter((position) => position.recorded_at.startsWith(this.state.selectedDate))
+                    .map((position) => [position.inspector_id[0], position])
+            );
+            this.setDispatchChannel(this.state.selectedDate);
 
             // Auto-select a date with jobs if current date has none
             if (autoSelectDate && jobs.length === 0) {
@@ -495,6 +521,92 @@ export class EnhancedDispatchView extends Component {
         }
     }
 
+    // Live Updates
+
+    /**
+     * Listen to the bus channel of the displayed date only.
+     * The server publishes job, route, check-in and safety timer diffs
+     * per date, so the board never needs a full reload to stay current.
+     */
+    setDispatchChannel(date) {
+        const channel = date ? `property_fielder_dispatch_${date}` : null;
+        if (channel === this.dispatchChannel) {
+            return;
+        }
+        if (this.dispatchChannel) {
+            this.busService.deleteChannel(this.dispatchChannel);
+        }
+        if (channel) {
+            this.busService.addChannel(channel);
+        }
+        this.dispatchChannel = channel;
+    }
+
+    /**
+     * Merge changed records into a list in place and drop removed ids.
+     */
+    mergeRecords(records, section) {
+        if (!section) {
+            return records;
+        }
+        const removed = new Set(section.removed);
+        const changed = new Map(section.changed.map((record) => [record.id, record]));
+        const merged = [];
+        for (const record of records) {
+            if (removed.has(record.id)) {
+                continue;
+            }
+            if (changed.has(record.id)) {
+                merged.push(changed.get(record.id));
+                changed.delete(record.id);
+            } else {
+                merged.push(record);
+            }
+        }
+        return merged.concat([...changed.values()]);
+    }
+
+    applyDispatchDiff(payload) {
+        if (!payload || payload.date !== this.state.selectedDate) {
+            return;
+        }
+        if (payload.jobs) {
+            this.state.jobs = this.mergeRecords(this.state.jobs, payload.jobs);
+        }
+        if (payload.routes) {
+            this.state.routes = this.mergeRecords(this.state.routes, payload.routes);
+        }
+        if (payload.checkins) {
+            for (const checkin of payload.checkins.changed) {
+                if (checkin.job_id) {
+                    this.state.checkins[checkin.job_id[0]] = checkin;
+                }
+            }
+        }
+        if (payload.positions) {
+            // Replace the object so the map sees a new prop and redraws markers
+            const positions = { ...this.state.positions };
+            for (const position of payload.positions.changed) {
+                positions[position.inspector_id[0]] = position;
+            }
+            this.state.positions = positions;
+        }
+        if (payload.safety_timers) {
+            for (const timer of payload.safety_timers.changed) {
+                const previous = Object.values(this.state.safetyTimers).find((t) => t.id === timer.id);
+                const key = timer.job_id ? timer.job_id[0] : `inspector_${timer.inspector_id[0]}`;
+                this.state.safetyTimers[key] = timer;
+                const alerting = ["overdue", "escalated", "panic"].includes(timer.state);
+                if (alerting && (!previous || previous.state !== timer.state)) {
+                    this.notification.add(
+                        `Safety timer ${timer.state}: ${timer.inspector_id[1]}`,
+                        { type: "danger", sticky: timer.state === "panic" }
+                    );
+                }
+            }
+        }
+    }
+
     /**
      * Find a date with jobs and switch to it
      * Searches within ±14 days of today
@@ -131,12 +131,23 @@ class BulkJobWizard(models.TransientModel):
         emails_sent = 0
         base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
 
-        if self.notify_owners:
-            template = self.env.ref('property_fielder_field_service.email_template_owner_appointment', raise_if_not_found=False)
-            for job in self.job_ids:
-                if job.partner_id and job.partner_id.email and template:
-                    template.with_context(base_url=base_url, custom_message=self.custom_message).send_mail(job.id, force_send=True)
-                    emails_sent += 1
+        template = self.env.ref('property_fielder_field_service.email_template_owner_appointment', raise_if_not_found=False)
+        jobs = self.job_ids.filtered(lambda j: j.partner_id.email)
+        if self.notify_owners and template and jobs:
+            # Only token hashes are stored: the links are rendered from the context.
+            # Answered appointments keep their state and get the mail without a link.
+            tokens = jobs.filtered(
+                lambda j: j.confirmation_state not in ('confirmed', 'declined')
+            )._generate_confirmation_tokens({
+                'owner_notified': True,
+                'owner_notified_date': fields.Datetime.now(),
+            })
+            template = template.with_context(
+                base_url=base_url, custom_message=self.custom_message, confirmation_tokens=tokens
+            )
+            for job in jobs:
+                template.send_mail(job.id, force_send=True)
+                emails_sent += 1
 
         return self._show_result(_(f'{emails_sent} notifications sent'))
 
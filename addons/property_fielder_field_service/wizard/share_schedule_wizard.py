@@ -68,6 +68,22 @@ class ShareScheduleWizard(models.TransientModel):
         compute='_compute_counts'
     )
 
+    # Sending progress (emails are queued and sent by the mail queue)
+    state = fields.Selection([
+        ('draft', 'Draft'),
+        ('queued', 'Queued'),
+    ], string='Status', default='draft')
+
+    queued_mail_ids = fields.Json(
+        string='Queued Emails',
+        help='Ids of the mail.mail records queued by this wizard'
+    )
+
+    queued_count = fields.Integer(string='Queued', readonly=True)
+    pending_count = fields.Integer(string='Waiting', compute='_compute_progress')
+    failed_count = fields.Integer(string='Failed', compute='_compute_progress')
+    sent_count = fields.Integer(string='Sent', compute='_compute_progress')
+
     @api.depends('route_ids')
     def _compute_counts(self):
         """Compute counts for display"""
@@ -80,6 +96,14 @@ class ShareScheduleWizard(models.TransientModel):
             wizard.job_count = len(jobs)
             wizard.owner_count = len(owners)
 
+    def _compute_progress(self):
+        """Progress of the queued emails (sent mails are auto-deleted)."""
+        for wizard in self:
+            mails = self.env['mail.mail'].sudo().browse(wizard.queued_mail_ids or []).exists()
+            wizard.pending_count = len(mails.filtered(lambda m: m.state == 'outgoing'))
+            wizard.failed_count = len(mails.filtered(lambda m: m.state in ('exception', 'cancel')))
+            wizard.sent_count = wizard.queued_count - wizard.pending_count - wizard.failed_count
+
     @api.model
     def default_get(self, fields_list):
         """Set defaults from context"""
@@ -94,118 +118,127 @@ class ShareScheduleWizard(models.TransientModel):
         return res
 
     def action_send_schedule(self):
-        """Send schedule emails to selected recipients"""
+        """Queue schedule emails to selected recipients
+
+        Tokens are issued in bulk, templates are rendered for all records in
+        one batch and the emails are handed to the mail queue, so the wizard
+        returns immediately and shows the sending progress.
+        """
         self.ensure_one()
 
         if not self.share_with_inspectors and not self.share_with_owners and not self.additional_emails:
             raise UserError(_('Please select at least one sharing option or add additional recipients.'))
 
-        emails_sent = 0
+        mails = self.env['mail.mail'].sudo()
 
         # Send to inspectors
         if self.share_with_inspectors:
-            emails_sent += self._send_to_inspectors()
+            mails |= self._send_to_inspectors()
 
         # Send to property owners
         if self.share_with_owners:
-            emails_sent += self._send_to_owners()
+            mails |= self._send_to_owners()
 
         # Send to additional recipients
         if self.additional_emails:
-            emails_sent += self._send_to_additional()
+            mails |= self._send_to_additional()
+
+        # Wake the mail queue now rather than at its next scheduled run
+        self.env.ref('mail.ir_cron_mail_scheduler_action').sudo()._trigger()
 
+        self.write({
+            'state': 'queued',
+            'queued_mail_ids': mails.ids,
+            'queued_count': len(mails),
+        })
+        return self.action_refresh_progress()
+
+    def action_refresh_progress(self):
+        """Reopen the wizard on its progress view"""
+        self.ensure_one()
         return {
-            'type': 'ir.actions.client',
-            'tag': 'display_notification',
-            'params': {
-                'title': _('Schedule Shared'),
-                'message': _('%d emails sent successfully!') % emails_sent,
-                'type': 'success',
-                'sticky': False,
-            }
+            'type': 'ir.actions.act_window',
+            'name': _('Share Schedule'),
+            'res_model': self._name,
+            'res_id': self.id,
+            'view_mode': 'form',
+            'target': 'new',
+        }
+
+    def _template_context(self):
+        return {
+            'custom_message': self.custom_message,
+            'base_url': self.env['ir.config_parameter'].sudo().get_param('web.base.url'),
         }
 
     def _send_to_inspectors(self):
-        """Send schedule to inspectors with acknowledgment token"""
-        emails_sent = 0
+        """Queue schedules for inspectors with acknowledgment tokens"""
         template = self.env.ref('property_fielder_field_service.email_template_inspector_schedule', raise_if_not_found=False)
-        base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
+        routes = self.route_ids.filtered(lambda r: r.inspector_id.email)
+        if not routes:
+            return self.env['mail.mail'].sudo()
 
-        for route in self.route_ids:
-            inspector = route.inspector_id
-            if inspector and inspector.email:
-                # Generate acknowledgment token for inspector
-                route._generate_acknowledgment_token()
-
-                if template:
-                    template.with_context(
-                        custom_message=self.custom_message,
-                        base_url=base_url
-                    ).send_mail(route.id, force_send=True)
-                else:
-                    self._send_simple_email(inspector.email, route, 'inspector')
-                emails_sent += 1
-
-        return emails_sent
+        # Generate acknowledgment tokens for all inspectors at once
+        routes._generate_acknowledgment_tokens()
+
+        if template:
+            return template.with_context(**self._template_context()).send_mail_batch(routes.ids)
+        return self._queue_simple_emails([
+            (route.inspector_id.email, route, 'inspector') for route in routes
+        ])
 
     def _send_to_owners(self):
-        """Send appointment notifications to property owners with confirmation tokens"""
-        emails_sent = 0
+        """Queue appointment notifications for property owners with confirmation tokens"""
         template = self.env.ref('property_fielder_field_service.email_template_owner_appointment', raise_if_not_found=False)
-        base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
-
-        for route in self.route_ids:
-            for job in route.job_ids:
-                partner = job.partner_id
-                if partner and partner.email:
-                    # Generate confirmation token for owner
-                    job._generate_confirmation_token()
-
-                    # Mark as notified
-                    job.write({
-                        'owner_notified': True,
-                        'owner_notified_date': fields.Datetime.now(),
-                    })
-
-                    if template:
-                        template.with_context(
-                            custom_message=self.custom_message,
-                            base_url=base_url
-                        ).send_mail(job.id, force_send=True)
-                    else:
-                        self._send_simple_email(partner.email, job, 'owner')
-                    emails_sent += 1
-
-        return emails_sent
+        jobs = self.route_ids.job_ids.filtered(lambda j: j.partner_id.email)
+        if not jobs:
+            return self.env['mail.mail'].sudo()
+
+        # Generate confirmation tokens and mark as notified in one go
+        tokens = jobs._generate_confirmation_tokens({
+            'owner_notified': True,
+            'owner_notified_date': fields.Datetime.now(),
+        })
+
+        if template:
+            # Only token hashes are stored: the links are rendered from the context
+            return template.with_context(
+                confirmation_tokens=tokens, **self._template_context()
+            ).send_mail_batch(jobs.ids)
+        return self._queue_simple_emails([
+            (job.partner_id.email, job, 'owner') for job in jobs
+        ])
 
     def _send_to_additional(self):
-        """Send to additional email addresses"""
-        emails_sent = 0
-        if not self.additional_emails:
-            return 0
-
+        """Queue the route summary for additional email addresses"""
         # Parse email addresses
-        email_list = [e.strip() for e in self.additional_emails.split(',') if e.strip()]
+        email_list = [e.strip() for e in (self.additional_emails or '').split(',') if e.strip()]
+        if not email_list:
+            return self.env['mail.mail'].sudo()
 
-        for email in email_list:
-            # Send summary email with all routes
-            self._send_summary_email(email)
-            emails_sent += 1
+        # The summary is the same for everyone: build it once
+        body = self._build_summary_body()
+        return self.env['mail.mail'].sudo().create([{
+            'subject': _('Route Schedule Summary'),
+            'email_to': email,
+            'body_html': body,
+            'auto_delete': True,
+        } for email in email_list])
 
-        return emails_sent
+    def _queue_simple_emails(self, recipients):
+        """Queue simple emails without template
 
-    def _send_simple_email(self, email, record, recipient_type):
-        """Send a simple email without template"""
-        mail_values = {
+        :param recipients: list of (email, record, recipient_type)
+        """
+        return self.env['mail.mail'].sudo().create([{
             'subject': _('Your Schedule for %s') % (record.route_date if hasattr(record, 'route_date') else record.scheduled_date),
             'email_to': email,
             'body_html': self._build_email_body(record, recipient_type),
             'auto_delete': True,
-        }
-        self.env['mail.mail'].sudo().create(mail_values).send()
+        } for email, record, recipient_type in recipients])
 
-    def _send_summary_email(self, email):
-        """Send summary email with all routes"""
+    def _build_summary_body(self):
+        """Summary email body with all routes"""
         body = '<h2>Route Schedule Summary</h2>'
 
         for route in self.route_ids:
@@ -222,13 +255,7 @@ class ShareScheduleWizard(models.TransientModel):
         if self.custom_message:
             body += f'<p><em>{self.custom_message}</em></p>'
 
-        mail_values = {
-            'subject': _('Route Schedule Summary'),
-            'email_to': email,
-            'body_html': body,
-            'auto_delete': True,
-        }
-        self.env['mail.mail'].sudo().create(mail_values).send()
+        return body
 
     def _build_email_body(self, record, recipient_type):
         """Build email body HTML"""
@@ -203,6 +203,7 @@ class MobileAPIController(http.Controller):
                     'scheduled_date': job.scheduled_date.isoformat() if job.scheduled_date else None,
                     'earliest_start': job.earliest_start.isoformat() if job.earliest_start else None,
                     'latest_end': job.latest_end.isoformat() if job.latest_end else None,
+                    'start_eligible_at': job.start_eligible_at.isoformat() if job.start_eligible_at else None,
                     'duration_minutes': job.duration_minutes,
                     'priority': job.priority,
                     'state': job.state,
@@ -272,6 +273,7 @@ class MobileAPIController(http.Controller):
                         'date': job.scheduled_date.isoformat() if job.scheduled_date else None,
                         'earliest_start': job.earliest_start.isoformat() if job.earliest_start else None,
                         'latest_end': job.latest_end.isoformat() if job.latest_end else None,
+                        'start_eligible_at': job.start_eligible_at.isoformat() if job.start_eligible_at else None,
                         'duration_minutes': job.duration_minutes,
                     },
                     'priority': job.priority,
@@ -356,12 +358,22 @@ class MobileAPIController(http.Controller):
             if job.state in ['draft', 'pending', 'assigned']:
                 job.write({'state': 'in_progress'})
 
-            return {
+            result = {
                 'success': True,
                 'checkin_id': checkin.id,
                 'message': 'Checked in successfully',
                 'section_11_compliant': True,
+                'geofence_valid': checkin.geofence_valid,
             }
+            if not checkin.geofence_valid:
+                result['distance_from_job'] = round(checkin.distance_from_job)
+                result['nearby_jobs'] = [{
+                    'id': nearby.id,
+                    'job_number': nearby.job_number,
+                    'name': nearby.name,
+                    'distance_m': round(distance),
+                } for nearby, distance in checkin._nearby_jobs()]
+            return result
         except Exception as e:
             _logger.error(f'Check-in failed: {str(e)}', exc_info=True)
             return {'success': False, 'error': str(e)}
@@ -800,6 +812,45 @@ class MobileAPIController(http.Controller):
             _logger.error(f'Get safety status failed: {str(e)}', exc_info=True)
             return _json_response({'success': False, 'error': str(e)}, 500)
 
+    # ========== Location ==========
+
+    @http.route('/mobile/api/location/breadcrumbs', type='jsonrpc', auth='user', methods=['POST'], cors='*')
+    def upload_breadcrumbs(self, points=None):
+        """Store a batch of GPS points recorded by the app.
+
+        ``points`` is a list of packed arrays ``[epoch, lat, lng, accuracy]``
+        (or dicts with the same keys); uploads are idempotent, so the app
+        may resend a batch after a network failure.
+        """
+        try:
+            inspector = request.env['property_fielder.inspector'].search([
+                ('user_id', '=', request.env.user.id)
+            ], limit=1)
+
+            if not inspector:
+                return {'success': False, 'error': 'No inspector profile found'}
+
+            stored = request.env['property_fielder.inspector.breadcrumb'].sudo()._ingest(
+                inspector, points or []
+            )
+
+            # Keep the safety timer's last known location in step
+            position = request.env['property_fielder.inspector.position'].sudo().search([
+                ('inspector_id', '=', inspector.id)
+            ], limit=1)
+            timer = request.env['property_fielder.safety.timer'].sudo().search([
+                ('inspector_id', '=', inspector.id),
+                ('state', 'in', ['active', 'overdue', 'escalated', 'panic']),
+            ], limit=1)
+            if timer and position and (
+                    not timer.last_location_update or timer.last_location_update < position.recorded_at):
+                timer._set_location(position.latitude, position.longitude, position.recorded_at)
+
+            return {'success': True, 'stored': stored}
+        except Exception as e:
+            _logger.error(f'Breadcrumb upload failed: {str(e)}', exc_info=True)
+            return {'success': False, 'error': str(e)}
+
     # ========== Sync ==========
 
     @http.route('/mobile/api/sync', type='jsonrpc', auth='user', methods=['POST'])
@@ -827,47 +878,14 @@ class MobileAPIController(http.Controller):
                 'status': 'success'
             })
 
-            # Get data to sync
-            # Jobs for today and tomorrow
-            from datetime import date, timedelta
-            today = date.today()
-            tomorrow = today + timedelta(days=1)
-
-            jobs = request.env['property_fielder.job'].search([
-                ('inspector_id', '=', inspector.id),
-                ('scheduled_date', 'in', [today, tomorrow])
-            ])
-
-            routes = request.env['property_fielder.route'].search([
-                ('inspector_id', '=', inspector.id),
-                ('route_date', 'in', [today, tomorrow])
-            ])
+            payload = request.env['property_fielder.mobile.sync']._sync_payload(inspector)
 
             # Update sync log
             sync_log.write({
-                'jobs_downloaded': len(jobs),
+                'jobs_downloaded': len(payload['jobs']),
             })
 
-            return {
-                'success': True,
-                'sync_id': sync_log.id,
-                'jobs': [{
-                    'id': job.id,
-                    'job_number': job.job_number,
-                    'name': job.name,
-                    'customer_name': job.partner_id.name,
-                    'latitude': job.latitude,
-                    'longitude': job.longitude,
-                    'scheduled_date': job.scheduled_date.isoformat() if job.scheduled_date else None,
-                    'state': job.state,
-                } for job in jobs],
-                'routes': [{
-                    'id': route.id,
-                    'route_number': route.route_number,
-                    'name': route.name,
-                    'route_date': route.route_date.isoformat() if route.route_date else None,
-                } for route in routes]
-            }
+            return dict(payload, success=True, sync_id=sync_log.id)
         except Exception as e:
             _logger.error(f'Sync failed: {str(e)}', exc_info=True)
             return {'success': False, 'error': str(e)}
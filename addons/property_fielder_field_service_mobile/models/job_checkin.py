@@ -11,8 +11,13 @@ class JobCheckIn(models.Model):
 
     _name = 'property_fielder.job.checkin'
     _description = 'Job Check-In/Out'
+    _inherit = ['property_fielder.dispatch.mixin']
     _order = 'checkin_time desc'
 
+    # Dispatch board diffs (see property_fielder.dispatch.mixin)
+    _dispatch_key = 'checkins'
+    _dispatch_fields = ['job_id', 'inspector_id', 'checkin_time', 'checkout_time', 'status']
+
     # Default geofence radius in meters
     DEFAULT_GEOFENCE_RADIUS = 100
 
@@ -231,6 +236,32 @@ class JobCheckIn(models.Model):
 
         return True
 
+    def _dispatch_date(self):
+        return self.job_id.scheduled_date
+
+    def _nearby_jobs(self, limit=5):
+        """Other open jobs of the inspector around the check-in point.
+
+        Used to point an inspector who checked in outside the geofence at
+        the job they are probably standing at.
+
+        :return: list of (job, distance in metres)
+        """
+        self.ensure_one()
+        if not (self.checkin_latitude and self.checkin_longitude):
+            return []
+        radius = max(self.geofence_radius or 0, self.DEFAULT_GEOFENCE_RADIUS) * 2
+        return self.env['property_fielder.job']._geo_radius(
+            self.checkin_latitude, self.checkin_longitude, radius,
+            domain=[
+                ('inspector_id', '=', self.inspector_id.id),
+                ('scheduled_date', '=', fields.Date.context_today(self)),
+                ('state', 'not in', ['completed', 'cancelled']),
+                ('id', '!=', self.job_id.id),
+            ],
+            limit=limit,
+        )
+
     def get_location_info(self):
         """Get formatted location information for display"""
         self.ensure_one()
@@ -125,6 +125,48 @@ class MobileSyncLog(models.Model):
         help='Amount of data transferred'
     )
 
+    @api.model
+    def _sync_payload(self, inspector, today=None):
+        """Jobs and routes of an inspector for today and tomorrow.
+
+        Each job carries ``start_eligible_at`` (UTC) and the payload the
+        server time, so the app can decide check-in eligibility offline.
+
+        :return: dict {'jobs': [...], 'routes': [...], 'server_time': str} as sent to the app
+        """
+        from datetime import timedelta
+        today = today or fields.Date.context_today(self)
+        dates = [today, today + timedelta(days=1)]
+
+        jobs = self.env['property_fielder.job'].search([
+            ('inspector_id', '=', inspector.id),
+            ('scheduled_date', 'in', dates)
+        ])
+        routes = self.env['property_fielder.route'].search([
+            ('inspector_id', '=', inspector.id),
+            ('route_date', 'in', dates)
+        ])
+        return {
+            'jobs': [{
+                'id': job.id,
+                'job_number': job.job_number,
+                'name': job.name,
+                'customer_name': job.partner_id.name,
+                'latitude': job.latitude,
+                'longitude': job.longitude,
+                'scheduled_date': job.scheduled_date.isoformat() if job.scheduled_date else None,
+                'state': job.state,
+                'start_eligible_at': job.start_eligible_at.isoformat() if job.start_eligible_at else None,
+            } for job in jobs],
+            'routes': [{
+                'id': route.id,
+                'route_number': route.route_number,
+                'name': route.name,
+                'route_date': route.route_date.isoformat() if route.route_date else None,
+            } for route in routes],
+            'server_time': fields.Datetime.now().isoformat(),
+        }
+
 
 class MobileDevice(models.Model):
     """Registered mobile devices"""
@@ -2,11 +2,14 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
-from datetime import timedelta
+from datetime import timedelta, timezone
 import logging
 
 _logger = logging.getLogger(__name__)
 
+# Minutes a timer may stay overdue before it is escalated to the manager
+ESCALATION_MINUTES = 15
+
 
 class SafetyTimer(models.Model):
     """Lone Worker Safety Timer for HSE Compliance.
@@ -20,8 +23,15 @@ class SafetyTimer(models.Model):
     
     _name = 'property_fielder.safety.timer'
     _description = 'Inspector Safety Timer'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'property_fielder.dispatch.mixin']
     _order = 'started_at desc'
+
+    # Dispatch board diffs (see property_fielder.dispatch.mixin)
+    _dispatch_key = 'safety_timers'
+    _dispatch_fields = [
+        'inspector_id', 'job_id', 'state', 'expected_end',
+        'last_known_lat', 'last_known_long', 'panic_triggered_at',
+    ]
     
     name = fields.Char(
         string='Reference',
@@ -157,6 +167,50 @@ class SafetyTimer(models.Model):
             else:
                 timer.minutes_remaining = 0
     
+    # ============================================================
+    # CRUD OVERRIDES
+    # ============================================================
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        timers = super().create(vals_list)
+        timers._schedule_deadline_checks()
+        return timers
+
+    def write(self, vals):
+        result = super().write(vals)
+        if 'expected_end' in vals or vals.get('state') in ('active', 'overdue'):
+            self._schedule_deadline_checks()
+        return result
+
+    def _dispatch_date(self):
+        if self.job_id:
+            return self.job_id.scheduled_date
+        return self.started_at and fields.Date.to_date(self.started_at)
+
+    def _schedule_deadline_checks(self):
+        """Wake the safety cron exactly when these timers fall due.
+
+        Active timers trigger at ``expected_end``; overdue timers trigger at
+        their escalation time. ``ir.cron._trigger`` stores the call time and
+        notifies the cron workers, so deadlines are processed on time instead
+        of waiting for the next fallback sweep.
+        """
+        cron = self.env.ref(
+            'property_fielder_field_service_mobile.ir_cron_safety_timer_check',
+            raise_if_not_found=False
+        )
+        if not cron:
+            return
+        call_times = set()
+        for timer in self:
+            if timer.state == 'active' and timer.expected_end:
+                call_times.add(timer.expected_end)
+            elif timer.state == 'overdue' and timer.overdue_at:
+                call_times.add(timer.overdue_at + timedelta(minutes=ESCALATION_MINUTES))
+        if call_times:
+            cron.sudo()._trigger(at=sorted(call_times))
+
     # ============================================================
     # ACTIONS
     # ============================================================
@@ -289,19 +343,28 @@ class SafetyTimer(models.Model):
             template.send_mail(self.id, force_send=True)
 
         self.message_post(
-            body=_('⚠️ Timer ESCALATED to manager after being overdue for 15+ minutes.'),
+            body=_('⚠️ Timer ESCALATED to manager after being overdue for %d+ minutes.') % ESCALATION_MINUTES,
             message_type='notification'
         )
 
     def update_location(self, latitude, longitude):
         """Update last known location from mobile app."""
         self.ensure_one()
-        self.write({
+        now = fields.Datetime.now()
+        # The point also joins the inspector's GPS history
+        self.env['property_fielder.inspector.breadcrumb'].sudo()._ingest(
+            self.inspector_id, [[now.replace(tzinfo=timezone.utc).timestamp(), latitude, longitude]]
+        )
+        self._set_location(latitude, longitude, now)
+        return True
+
+    def _set_location(self, latitude, longitude, recorded_at):
+        # No chatter tracking on position updates
+        self.with_context(tracking_disable=True).write({
             'last_known_lat': latitude,
             'last_known_long': longitude,
-            'last_location_update': fields.Datetime.now(),
+            'last_location_update': recorded_at,
         })
-        return True
 
     # ============================================================
     # CRON JOB
@@ -309,28 +372,33 @@ class SafetyTimer(models.Model):
 
     @api.model
     def _cron_check_overdue_timers(self):
-        """Cron job: Runs every 5 minutes to check for overdue safety timers."""
+        """Process due safety timers.
+
+        Normally woken by the per-timer triggers scheduled in
+        _schedule_deadline_checks; the periodic run is a fallback sweep for
+        crash recovery.
+        """
         now = fields.Datetime.now()
-        escalation_threshold = now - timedelta(minutes=15)
+        escalation_threshold = now - timedelta(minutes=ESCALATION_MINUTES)
 
-        # Find active timers that are overdue
+        # Find active timers that are overdue and mark them in bulk
         overdue_timers = self.search([
             ('state', '=', 'active'),
-            ('expected_end', '<', now),
+            ('expected_end', '<=', now),
         ])
-
-        for timer in overdue_timers:
-            timer.write({
+        if overdue_timers:
+            overdue_timers.write({
                 'state': 'overdue',
                 'overdue_at': now,
             })
-            timer._send_overdue_alert()
-            _logger.info(f'Safety timer {timer.name} marked as overdue')
+            for timer in overdue_timers:
+                timer._send_overdue_alert()
+            _logger.info('Safety timers marked as overdue: %s', ', '.join(overdue_timers.mapped('name')))
 
         # Escalate timers that have been overdue for 15+ minutes
         escalation_timers = self.search([
             ('state', '=', 'overdue'),
-            ('overdue_at', '<', escalation_threshold),
+            ('overdue_at', '<=', escalation_threshold),
         ])
 
         for timer in escalation_timers:
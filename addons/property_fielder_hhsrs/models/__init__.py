@@ -2,6 +2,7 @@
 from . import hazard_type
 from . import likelihood_band
 from . import vulnerable_group
+from . import hhsrs_scoring
 from . import hhsrs_assessment
 from . import awaab_deadline
 from . import access_refusal
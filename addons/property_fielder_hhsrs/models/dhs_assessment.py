@@ -123,35 +123,49 @@ class DHSAssessment(models.Model):
     @api.depends('property_id')
     def _compute_criterion_a_auto(self):
         """Criterion A: Free from Category 1 Hazards."""
-        HHSRSAssessment = self.env['property_fielder.hhsrs.assessment']
+        property_ids = self.mapped('property_id').ids
+        cat1_properties = set()
+        if property_ids:
+            # One grouped query for all assessments in the batch
+            groups = self.env['property_fielder.hhsrs.assessment']._read_group(
+                [
+                    ('property_id', 'in', property_ids),
+                    ('state', '=', 'confirmed'),
+                    ('hhsrs_category', '=', '1'),
+                ],
+                ['property_id'],
+                ['__count'],
+            )
+            cat1_properties = {prop.id for prop, count in groups if count}
         for rec in self:
             if not rec.property_id:
                 rec.criterion_a_auto = False
                 continue
-            # Check for any confirmed Cat 1 hazards
-            cat1_assessments = HHSRSAssessment.search([
-                ('property_id', '=', rec.property_id.id),
-                ('state', '=', 'confirmed'),
-                ('hhsrs_category', '=', '1'),
-            ])
-            rec.criterion_a_auto = len(cat1_assessments) == 0
+            rec.criterion_a_auto = rec.property_id.id not in cat1_properties
 
     @api.depends('property_id')
     def _compute_criterion_b_auto(self):
         """Criterion B: Reasonable State of Repair."""
-        Component = self.env['property_fielder.building.component']
+        property_ids = self.mapped('property_id').ids
+        failing_properties = set()
+        if property_ids:
+            # Check for critical/failed components in one grouped query
+            groups = self.env['property_fielder.building.component']._read_group(
+                [
+                    ('property_id', 'in', property_ids),
+                    '|',
+                    ('condition', '=', 'critical'),
+                    ('is_beyond_life', '=', True),
+                ],
+                ['property_id'],
+                ['__count'],
+            )
+            failing_properties = {prop.id for prop, count in groups if count}
         for rec in self:
             if not rec.property_id:
                 rec.criterion_b_auto = False
                 continue
-            # Check for critical/failed components
-            failing = Component.search([
-                ('property_id', '=', rec.property_id.id),
-                '|',
-                ('condition', '=', 'critical'),
-                ('is_beyond_life', '=', True),
-            ])
-            rec.criterion_b_auto = len(failing) == 0
+            rec.criterion_b_auto = rec.property_id.id not in failing_properties
 
     @api.depends('property_id.epc_rating')
     def _compute_criterion_d_auto(self):
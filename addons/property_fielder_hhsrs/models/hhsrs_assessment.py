@@ -2,6 +2,8 @@
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
+from .hhsrs_scoring import SCORE_DIGITS, band_for_score, round_score
+
 
 class HHSRSAssessment(models.Model):
     """HHSRS Assessment record with scoring calculation."""
@@ -91,7 +93,7 @@ class HHSRSAssessment(models.Model):
         string='HHSRS Score',
         compute='_compute_hhsrs_score',
         store=True,
-        digits=(10, 2)
+        digits=(10, SCORE_DIGITS)
     )
     hhsrs_band = fields.Selection([
         ('A', 'Band A (5000+)'),
@@ -242,30 +244,11 @@ class HHSRSAssessment(models.Model):
                 (rec.outcome_prob_class_3 / 100) * self.OUTCOME_WEIGHTS[3] +
                 (rec.outcome_prob_class_4 / 100) * self.OUTCOME_WEIGHTS[4]
             )
-            rec.hhsrs_score = rsp * weighted_outcome
-
-            # Assign band based on score
-            score = rec.hhsrs_score
-            if score >= 5000:
-                rec.hhsrs_band, rec.hhsrs_category = 'A', '1'
-            elif score >= 2000:
-                rec.hhsrs_band, rec.hhsrs_category = 'B', '1'
-            elif score >= 1000:
-                rec.hhsrs_band, rec.hhsrs_category = 'C', '1'
-            elif score >= 500:
-                rec.hhsrs_band, rec.hhsrs_category = 'D', '2'
-            elif score >= 200:
-                rec.hhsrs_band, rec.hhsrs_category = 'E', '2'
-            elif score >= 100:
-                rec.hhsrs_band, rec.hhsrs_category = 'F', '2'
-            elif score >= 50:
-                rec.hhsrs_band, rec.hhsrs_category = 'G', '2'
-            elif score >= 20:
-                rec.hhsrs_band, rec.hhsrs_category = 'H', '2'
-            elif score >= 10:
-                rec.hhsrs_band, rec.hhsrs_category = 'I', '2'
-            else:
-                rec.hhsrs_band, rec.hhsrs_category = 'J', '2'
+            score = round_score(rsp * weighted_outcome)
+            rec.hhsrs_score = score
+
+            # Assign band based on the stored score, as the batch recompute does
+            rec.hhsrs_band, rec.hhsrs_category = band_for_score(score)
 
     @api.constrains('outcome_prob_class_1', 'outcome_prob_class_2',
                     'outcome_prob_class_3', 'outcome_prob_class_4')
@@ -326,6 +309,12 @@ class HHSRSAssessment(models.Model):
         job = self.env['property_fielder.job'].create(job_vals)
         self.remediation_job_id = job.id
 
+        # Emergency work goes straight to the closest suitable inspector. This
+        # is dispatch policy rather than a choice of the assessor, who may not
+        # have rights on inspectors or their locations: run it as superuser.
+        if is_emergency:
+            job.sudo()._assign_nearest()
+
         # Link to Awaab deadline if applicable
         if self.hhsrs_hazard_type_id.is_awaab_covered:
             self._create_awaab_deadline(job, is_emergency)
@@ -410,3 +399,9 @@ class HHSRSAssessment(models.Model):
         """Mark as superseded by newer assessment."""
         self.write({'state': 'superseded'})
 
+    def action_recompute_scores(self):
+        """Recompute scores in bulk (e.g. after changing OUTCOME_WEIGHTS)."""
+        self.env['property_fielder.hhsrs.scoring'].recompute_assessments(
+            assessment_ids=self.ids or None
+        )
+
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+import bisect
+import logging
+
+from odoo import models, api
+from odoo.tools import float_round
+
+_logger = logging.getLogger(__name__)
+
+try:
+    import numpy
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+# Score thresholds (ascending) and the band/category assigned at or above each
+BAND_THRESHOLDS = [10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+BAND_BY_THRESHOLD = [
+    ('J', '2'), ('I', '2'), ('H', '2'), ('G', '2'), ('F', '2'),
+    ('E', '2'), ('D', '2'), ('C', '1'), ('B', '1'), ('A', '1'),
+]
+
+
+# Decimals of the stored hhsrs_score; bands are assigned on the stored value
+SCORE_DIGITS = 2
+
+
+def round_score(score):
+    """Round a raw HHSRS score the way the stored field keeps it."""
+    return float_round(score, precision_digits=SCORE_DIGITS)
+
+
+def band_for_score(score):
+    """Return the (band, category) pair for an HHSRS score."""
+    return BAND_BY_THRESHOLD[bisect.bisect_right(BAND_THRESHOLDS, score)]
+
+
+class HHSRSScoringEngine(models.AbstractModel):
+    """Batch HHSRS scoring engine.
+
+    Recomputes stored scores for many assessments at once (one SQL read,
+    vectorised score calculation, one bulk UPDATE).
+    """
+    _name = 'property_fielder.hhsrs.scoring'
+    _description = 'HHSRS Scoring Engine'
+
+    # ------------------------------------------------------------
+    # Batch scoring
+    # ------------------------------------------------------------
+
+    @api.model
+    def _compute_scores(self, rsps, probabilities):
+        """Vectorised HHSRS score: RSP × Σ(weight × probability / 100).
+
+        :param rsps: list of RSP values, one per assessment
+        :param probabilities: list of (p1, p2, p3, p4) percentage tuples
+        :return: list of scores
+        """
+        weights = self.env['property_fielder.hhsrs.assessment'].OUTCOME_WEIGHTS
+        weight_vector = [weights[1], weights[2], weights[3], weights[4]]
+        if not rsps:
+            return []
+        if NUMPY_AVAILABLE:
+            probs = numpy.asarray(probabilities, dtype=float) / 100.0
+            scores = numpy.asarray(rsps, dtype=float) * probs.dot(weight_vector)
+            return scores.tolist()
+        return [
+            rsp * sum(p / 100.0 * w for p, w in zip(probs, weight_vector))
+            for rsp, probs in zip(rsps, probabilities)
+        ]
+
+    @api.model
+    def recompute_assessments(self, assessment_ids=None, band_ids=None):
+        """Recompute score, band and category for many assessments.
+
+        :param assessment_ids: restrict to these assessments (default: all)
+        :param band_ids: restrict to assessments using these likelihood bands
+        :return: number of assessments whose stored values changed
+        """
+        Assessment = self.env['property_fielder.hhsrs.assessment']
+        Assessment.flush_model([
+            'likelihood_band_id', 'outcome_prob_class_1', 'outcome_prob_class_2',
+            'outcome_prob_class_3', 'outcome_prob_class_4',
+        ])
+        self.env['property_fielder.hhsrs.likelihood.band'].flush_model(['rsp'])
+
+        where, params = ['TRUE'], []
+        if assessment_ids is not None:
+            where.append('a.id = ANY(%s)')
+            params.append(list(assessment_ids))
+        if band_ids is not None:
+            where.append('a.likelihood_band_id = ANY(%s)')
+            params.append(list(band_ids))
+        self.env.cr.execute("""
+            SELECT a.id, COALESCE(b.rsp, 0), b.id IS NOT NULL,
+                   COALESCE(a.outcome_prob_class_1, 0), COALESCE(a.outcome_prob_class_2, 0),
+                   COALESCE(a.outcome_prob_class_3, 0), COALESCE(a.outcome_prob_class_4, 0),
+                   a.hhsrs_score, a.hhsrs_band, a.hhsrs_category
+              FROM property_fielder_hhsrs_assessment a
+              LEFT JOIN property_fielder_hhsrs_likelihood_band b ON b.id = a.likelihood_band_id
+             WHERE %s
+        """ % ' AND '.join(where), params)
+        rows = self.env.cr.fetchall()
+        if not rows:
+            return 0
+
+        scores = self._compute_scores(
+            [row[1] for row in rows],
+            [row[3:7] for row in rows],
+        )
+
+        ids, new_scores, new_bands, new_categories = [], [], [], []
+        for row, score in zip(rows, scores):
+            if not row[2]:
+                score = 0.0
+            score = round_score(score)
+            band, category = band_for_score(score)
+            if (row[7] is not None and abs(row[7] - score) < 0.005
+                    and row[8] == band and row[9] == category):
+                continue
+            ids.append(row[0])
+            new_scores.append(score)
+            new_bands.append(band)
+            new_categories.append(category)
+
+        if not ids:
+            return 0
+
+        self.env.cr.execute("""
+            UPDATE property_fielder_hhsrs_assessment a
+               SET hhsrs_score = v.score,
+                   hhsrs_band = v.band,
+                   hhsrs_category = v.category,
+                   write_date = (now() at time zone 'UTC')
+              FROM unnest(%s::int[], %s::float8[], %s::varchar[], %s::varchar[])
+                   AS v(id, score, band, category)
+             WHERE a.id = v.id
+        """, (ids, new_scores, new_bands, new_categories))
+
+        changed = Assessment.browse(ids)
+        fnames = ['hhsrs_score', 'hhsrs_band', 'hhsrs_category']
+        changed.invalidate_recordset(fnames)
+        # Let dependent stored fields (e.g. remediation_required) recompute
+        changed.modified(fnames)
+        self._refresh_dhs_criteria(changed.mapped('property_id').ids)
+        self.env.flush_all()
+
+        _logger.info('HHSRS batch scoring updated %d assessments', len(ids))
+        return len(ids)
+
+    @api.model
+    def _refresh_dhs_criteria(self, property_ids):
+        """Recompute DHS Criterion A for assessments on the given properties."""
+        if not property_ids:
+            return
+        DHS = self.env['property_fielder.dhs.assessment']
+        dhs_records = DHS.search([('property_id', 'in', property_ids)])
+        if dhs_records:
+            self.env.add_to_compute(DHS._fields['criterion_a_auto'], dhs_records)
@@ -29,3 +29,13 @@ class HHSRSLikelihoodBand(models.Model):
         'Likelihood band code must be unique!',
     )
 
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'rsp' in vals:
+            # Stored assessment scores do not depend on the band RSP through
+            # the ORM, so push the change through the batch scoring engine.
+            self.env['property_fielder.hhsrs.scoring'].recompute_assessments(
+                band_ids=self.ids
+            )
+        return res
@@ -4,7 +4,11 @@ from odoo import http, _
 from odoo.http import request
 from odoo.addons.portal.controllers.portal import CustomerPortal, pager as portal_pager
 from odoo.exceptions import AccessError
-import base64
+
+# Browser cache lifetime of downloaded certificates (revalidated by ETag)
+CERTIFICATE_MAX_AGE = 3600
+PROPERTIES_PER_PAGE = 12
+CERTIFICATES_PER_PAGE = 20
 
 
 class OwnerPortal(CustomerPortal):
@@ -15,13 +19,11 @@ class OwnerPortal(CustomerPortal):
         values = super()._prepare_home_portal_values(counters)
         partner = request.env.user.partner_id
         
+        is_owner = partner.is_property_owner and partner.owner_portal_access
         if 'property_count' in counters:
-            if partner.is_property_owner and partner.owner_portal_access:
-                values['property_count'] = request.env['property_fielder.property'].search_count([
-                    ('partner_id', '=', partner.id)
-                ])
-            else:
-                values['property_count'] = 0
+            values['property_count'] = partner.owned_property_count if is_owner else 0
+        if 'owner_inspection_count' in counters:
+            values['owner_inspection_count'] = partner.owner_upcoming_inspection_count if is_owner else 0
         
         return values
 
@@ -39,34 +41,30 @@ class OwnerPortal(CustomerPortal):
         partner = self._check_owner_access()
         
         Property = request.env['property_fielder.property']
-        domain = [('partner_id', '=', partner.id)]
         
         # Sorting options
         searchbar_sortings = {
-            'name': {'label': _('Name'), 'order': 'name asc'},
-            'compliance': {'label': _('Compliance'), 'order': 'compliance_status asc'},
-            'city': {'label': _('City'), 'order': 'city asc'},
+            'name': {'label': _('Name'), 'order': 'name asc, id asc'},
+            'compliance': {'label': _('Compliance'), 'order': 'compliance_status asc, id asc'},
+            'city': {'label': _('City'), 'order': 'city asc, id asc'},
         }
         
-        if not sortby:
+        if sortby not in searchbar_sortings:
             sortby = 'name'
         order = searchbar_sortings[sortby]['order']
         
-        # Count and pager
-        property_count = Property.search_count(domain)
+        # Stored counter instead of a count query
         pager = portal_pager(
             url='/my/properties',
-            total=property_count,
+            url_args={'sortby': sortby},
+            total=partner.owned_property_count,
             page=page,
-            step=10,
+            step=PROPERTIES_PER_PAGE,
         )
         
-        # Get properties
-        properties = Property.search(
-            domain,
-            order=order,
-            limit=10,
-            offset=pager['offset']
+        # Cached card data for this page
+        properties = Property.get_owner_portal_cards(
+            partner.id, order, pager['offset'], PROPERTIES_PER_PAGE
         )
         
         values = {
@@ -76,12 +74,16 @@ class OwnerPortal(CustomerPortal):
             'default_url': '/my/properties',
             'searchbar_sortings': searchbar_sortings,
             'sortby': sortby,
+            'compliant_count': partner.owner_compliant_count,
+            'attention_count': partner.owner_attention_count,
         }
         
         return request.render('property_fielder_owner_portal.portal_my_properties', values)
 
-    @http.route('/my/properties/<int:property_id>', type='http', auth='user', website=True)
-    def portal_property_detail(self, property_id, **kw):
+    @http.route(['/my/properties/<int:property_id>',
+                 '/my/properties/<int:property_id>/page/<int:page>'],
+                type='http', auth='user', website=True)
+    def portal_property_detail(self, property_id, page=1, **kw):
         """Property detail view"""
         partner = self._check_owner_access()
         
@@ -91,10 +93,20 @@ class OwnerPortal(CustomerPortal):
         if not property_obj.exists() or property_obj.partner_id.id != partner.id:
             raise AccessError(_("You don't have access to this property."))
         
-        # Get certifications
-        certifications = request.env['property_fielder.property.certification'].search([
-            ('property_id', '=', property_id)
-        ])
+        # Get certifications, one page at a time
+        Certification = request.env['property_fielder.property.certification']
+        cert_domain = [('property_id', '=', property_id)]
+        pager = portal_pager(
+            url='/my/properties/%s' % property_id,
+            total=Certification.search_count(cert_domain),
+            page=page,
+            step=CERTIFICATES_PER_PAGE,
+        )
+        certifications = Certification.search(
+            cert_domain,
+            limit=CERTIFICATES_PER_PAGE,
+            offset=pager['offset']
+        )
         
         # Get upcoming inspections
         inspections = request.env['property_fielder.property.inspection'].search([
@@ -107,6 +119,7 @@ class OwnerPortal(CustomerPortal):
             'certifications': certifications,
             'inspections': inspections,
             'page_name': 'property_detail',
+            'pager': pager,
         }
         
         return request.render('property_fielder_owner_portal.portal_property_detail', values)
@@ -114,29 +127,31 @@ class OwnerPortal(CustomerPortal):
     @http.route('/my/properties/<int:property_id>/certificate/<int:cert_id>/download',
                 type='http', auth='user', website=True)
     def download_certificate(self, property_id, cert_id, **kw):
-        """Download a certificate PDF"""
+        """Download a certificate PDF
+        
+        The file is streamed from the filestore (Content-Length, range
+        requests and ETag revalidation are handled by the stream) instead of
+        being decoded into memory.
+        """
         partner = self._check_owner_access()
         
         # Verify access
-        property_obj = request.env['property_fielder.property'].browse(property_id)
-        if not property_obj.exists() or property_obj.partner_id.id != partner.id:
-            raise AccessError(_("You don't have access to this property."))
-        
         cert = request.env['property_fielder.property.certification'].browse(cert_id)
-        if not cert.exists() or cert.property_id.id != property_id:
+        if not cert.exists() or cert.property_id.id != property_id or cert.owner_id.id != partner.id:
             raise AccessError(_("Certificate not found."))
         
         if not cert.certificate_file:
             return request.redirect('/my/properties/%s' % property_id)
         
-        # Return file download
-        return request.make_response(
-            base64.b64decode(cert.certificate_file),
-            headers=[
-                ('Content-Type', 'application/pdf'),
-                ('Content-Disposition', f'attachment; filename="{cert.name}.pdf"'),
-            ]
+        stream = request.env['ir.binary']._get_stream_from(
+            cert, 'certificate_file',
+            filename=cert.certificate_filename or '%s.pdf' % cert.name,
+            mimetype='application/pdf',
         )
+        response = stream.get_response(as_attachment=True, max_age=CERTIFICATE_MAX_AGE)
+        # Owner documents must not be stored by shared caches
+        response.headers['Cache-Control'] = 'private, max-age=%d' % CERTIFICATE_MAX_AGE
+        return response
 
     @http.route(['/my/inspections', '/my/inspections/page/<int:page>'],
                 type='http', auth='user', website=True)
@@ -146,15 +161,14 @@ class OwnerPortal(CustomerPortal):
 
         Inspection = request.env['property_fielder.property.inspection']
         domain = [
-            ('property_id.partner_id', '=', partner.id),
+            ('owner_id', '=', partner.id),
             ('state', 'in', ['draft', 'scheduled'])
         ]
 
-        # Count and pager
-        inspection_count = Inspection.search_count(domain)
+        # Stored counter instead of a count query
         pager = portal_pager(
             url='/my/inspections',
-            total=inspection_count,
+            total=partner.owner_upcoming_inspection_count,
             page=page,
             step=10,
         )
@@ -185,7 +199,7 @@ class OwnerPortal(CustomerPortal):
         inspection = request.env['property_fielder.property.inspection'].browse(inspection_id)
 
         # Check access
-        if not inspection.exists() or inspection.property_id.partner_id.id != partner.id:
+        if not inspection.exists() or inspection.owner_id.id != partner.id:
             raise AccessError(_("You don't have access to this inspection."))
 
         if request.httprequest.method == 'POST':
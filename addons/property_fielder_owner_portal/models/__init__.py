@@ -1,4 +1,5 @@
 # -*- coding: utf-8 -*-
 
 from . import res_partner
+from . import property_portal
 
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, fields, api, tools
+from odoo.tools import SQL
+
+# Fields shown on the portal property cards
+PORTAL_CARD_FIELDS = [
+    'name', 'city', 'zip', 'compliance_status',
+    'flage_fire_status', 'flage_legionella_status', 'flage_asbestos_status',
+    'flage_gas_status', 'flage_electrical_status',
+]
+# Stored computed card fields, recomputed from certifications without
+# touching the property write_date
+PORTAL_STATUS_FIELDS = [fname for fname in PORTAL_CARD_FIELDS if fname.endswith('_status')]
+
+
+class Property(models.Model):
+    _inherit = 'property_fielder.property'
+
+    @api.model
+    def _get_owner_portal_signature(self, partner_id):
+        """Cheap fingerprint of an owner's properties used as cache key.
+
+        Compliance statuses are recomputed when certifications change and do
+        not bump ``write_date``, so their values are hashed in as well.
+        """
+        self.flush_model(['partner_id'] + PORTAL_CARD_FIELDS)
+        self.env.cr.execute(SQL("""
+            SELECT COUNT(*), MAX(write_date),
+                   MD5(STRING_AGG(CONCAT_WS(',', id, %s), ';' ORDER BY id))
+              FROM property_fielder_property
+             WHERE partner_id = %s
+        """, SQL(', ').join(SQL.identifier(fname) for fname in PORTAL_STATUS_FIELDS), partner_id))
+        count, last_write, statuses = self.env.cr.fetchone()
+        return (count, str(last_write), statuses)
+
+    @api.model
+    def get_owner_portal_cards(self, partner_id, order, offset, limit):
+        """One page of an owner's property cards, cached per portfolio revision."""
+        return self._get_owner_portal_cards(
+            partner_id, order, offset, limit, self._get_owner_portal_signature(partner_id)
+        )
+
+    @tools.ormcache('partner_id', 'order', 'offset', 'limit', 'signature')
+    def _get_owner_portal_cards(self, partner_id, order, offset, limit, signature):
+        return tuple(self.sudo().search_read(
+            [('partner_id', '=', partner_id)], PORTAL_CARD_FIELDS,
+            order=order, offset=offset, limit=limit,
+        ))
+
+
+class PropertyCertification(models.Model):
+    _inherit = 'property_fielder.property.certification'
+
+    # Denormalised owner so portal domains and record rules avoid the join
+    owner_id = fields.Many2one(
+        related='property_id.partner_id',
+        string='Owner',
+        store=True,
+        index=True
+    )
+
+
+class PropertyInspection(models.Model):
+    _inherit = 'property_fielder.property.inspection'
+
+    owner_id = fields.Many2one(
+        related='property_id.partner_id',
+        string='Owner',
+        store=True,
+        index=True
+    )
@@ -43,15 +43,57 @@ class ResPartner(models.Model):
         string='Owned Properties'
     )
     
+    # Portal counters, stored so portal pages never count on the fly
     owned_property_count = fields.Integer(
         string='Property Count',
-        compute='_compute_owned_property_count'
+        compute='_compute_owner_counters',
+        store=True
     )
     
-    @api.depends('owned_property_ids')
-    def _compute_owned_property_count(self):
+    owner_compliant_count = fields.Integer(
+        string='Compliant Properties',
+        compute='_compute_owner_counters',
+        store=True
+    )
+    
+    owner_attention_count = fields.Integer(
+        string='Properties Needing Attention',
+        compute='_compute_owner_counters',
+        store=True,
+        help='Properties that are expiring soon, expired or non-compliant'
+    )
+    
+    owner_upcoming_inspection_count = fields.Integer(
+        string='Upcoming Inspections',
+        compute='_compute_owner_upcoming_inspection_count',
+        store=True
+    )
+    
+    @api.depends('owned_property_ids', 'owned_property_ids.compliance_status')
+    def _compute_owner_counters(self):
+        counts = {}
+        if self.ids:
+            for partner, status, count in self.env['property_fielder.property']._read_group(
+                [('partner_id', 'in', self.ids)], ['partner_id', 'compliance_status'], ['__count'],
+            ):
+                counts.setdefault(partner.id, {})[status] = count
+        for partner in self:
+            by_status = counts.get(partner.id, {})
+            partner.owned_property_count = sum(by_status.values())
+            partner.owner_compliant_count = by_status.get('compliant', 0)
+            partner.owner_attention_count = partner.owned_property_count - partner.owner_compliant_count
+    
+    @api.depends('owned_property_ids.inspection_ids.state')
+    def _compute_owner_upcoming_inspection_count(self):
+        counts = {}
+        if self.ids:
+            counts = dict(self.env['property_fielder.property.inspection']._read_group(
+                [('owner_id', 'in', self.ids), ('state', 'in', ['draft', 'scheduled'])],
+                ['owner_id'], ['__count'],
+            ))
+            counts = {partner.id: count for partner, count in counts.items()}
         for partner in self:
-            partner.owned_property_count = len(partner.owned_property_ids)
+            partner.owner_upcoming_inspection_count = counts.get(partner.id, 0)
     
     def action_grant_portal_access(self):
         """Grant portal access to the owner"""
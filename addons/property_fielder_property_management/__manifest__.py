@@ -88,8 +88,10 @@ Features:
             'property_fielder_property_management/static/src/css/mobile_responsive.css',
             'property_fielder_property_management/static/src/js/property_chatter.js',
             'property_fielder_property_management/static/src/js/property_map_widget.js',
+            'property_fielder_property_management/static/src/js/property_portfolio_map.js',
             'property_fielder_property_management/static/src/js/mobile_camera.js',
             'property_fielder_property_management/static/src/xml/property_map_widget.xml',
+            'property_fielder_property_management/static/src/xml/property_portfolio_map.xml',
             'property_fielder_property_management/static/src/xml/mobile_camera.xml',
         ],
     },
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from . import property
+from . import property_map
 from . import property_image
 from . import property_document
 from . import certification_type
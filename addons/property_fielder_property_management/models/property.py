@@ -13,9 +13,12 @@ _geocoding_cache = {}
 class Property(models.Model):
     _name = 'property_fielder.property'
     _description = 'Property'
-    _inherit = ['mail.thread', 'mail.activity.mixin']
+    _inherit = ['mail.thread', 'mail.activity.mixin', 'property_fielder.geo.mixin']
     _order = 'name'
 
+    # Map tiles are refreshed when these change (see property_fielder.geo.mixin)
+    _geo_revision_fields = ['compliance_status']
+
     # Basic Information
     name = fields.Char(string='Property Name', required=True, tracking=True)
     property_number = fields.Char(
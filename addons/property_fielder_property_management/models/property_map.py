@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+
+from odoo import models, api
+
+
+class MapTiles(models.AbstractModel):
+    _inherit = 'property_fielder.map.tiles'
+
+    @api.model
+    def _map_layers(self):
+        layers = super()._map_layers()
+        layers['properties'] = {
+            'model': 'property_fielder.property',
+            'group': 'property_fielder_property_management.group_property_user',
+            'status_field': 'compliance_status',
+            'severity': ['compliant', 'expiring_soon', 'expired', 'non_compliant'],
+            'filters': {
+                'statuses': 'compliance_status',
+                'owner_ids': 'partner_id',
+            },
+        }
+        return layers
@@ -0,0 +1,171 @@
+/** @odoo-module **/
+
+import { Component, onMounted, onWillUnmount, useRef, useState } from "@odoo/owl";
+import { registry } from "@web/core/registry";
+import { useService } from "@web/core/utils/hooks";
+import { debounce } from "@web/core/utils/timing";
+
+const STATUS_COLORS = {
+    compliant: "#28a745",
+    expiring_soon: "#ffc107",
+    expired: "#fd7e14",
+    non_compliant: "#dc3545",
+};
+
+/**
+ * Portfolio map of every property, coloured by compliance status.
+ * Only the visible viewport is requested: the server answers with clustered
+ * tiles at low zoom and individual properties at high zoom, so the map
+ * stays light whatever the portfolio size.
+ */
+export class PropertyPortfolioMap extends Component {
+    static template = "property_fielder_property_management.PropertyPortfolioMap";
+
+    setup() {
+        this.mapContainer = useRef("mapContainer");
+        this.orm = useService("orm");
+        this.action = useService("action");
+
+        this.map = null;
+        this.requestId = 0;
+        this.state = useState({ loading: true, error: null, total: 0 });
+        this.loadViewport = debounce(this.loadViewport.bind(this), 250);
+
+        onMounted(() => this.initMap());
+        onWillUnmount(() => {
+            this.loadViewport.cancel();
+            if (this.map) {
+                this.map.remove();
+                this.map = null;
+            }
+        });
+    }
+
+    async initMap() {
+        try {
+            const token = await this.orm.call(
+                "ir.config_parameter",
+                "get_param",
+                ["property_fielder.mapbox.token", ""]
+            );
+            if (typeof mapboxgl === "undefined") {
+                throw new Error("Mapbox GL JS not loaded");
+            }
+            mapboxgl.accessToken = token || "pk.eyJ1IjoibXVhemFtc2FyZmFyYXoiLCJhIjoiY205b2dzdnVlMTVuZDJqczcwbnBseW1tYiJ9.-MvfX63GtzUQceap1g6iJQ";
+            this.map = new mapboxgl.Map({
+                container: this.mapContainer.el,
+                style: "mapbox://styles/mapbox/light-v11",
+                center: [-1.5, 53.0], // UK
+                zoom: 5.5,
+            });
+            this.map.addControl(new mapboxgl.NavigationControl(), "bottom-right");
+            this.map.on("load", () => {
+                this.setupLayers();
+                this.loadViewport();
+            });
+            this.map.on("moveend", () => this.loadViewport());
+        } catch (error) {
+            console.error("Failed to initialize portfolio map:", error);
+            this.state.error = error.message || "Failed to load map";
+            this.state.loading = false;
+        }
+    }
+
+    setupLayers() {
+        const statusColor = ["match", ["get", "status"]];
+        for (const [status, color] of Object.entries(STATUS_COLORS)) {
+            statusColor.push(status, color);
+        }
+        statusColor.push("#6c757d");
+
+        this.map.addSource("portfolio", {
+            type: "geojson",
+            data: { type: "FeatureCollection", features: [] },
+        });
+        this.map.addLayer({
+            id: "portfolio-points",
+            type: "circle",
+            source: "portfolio",
+            paint: {
+                "circle-color": statusColor,
+                "circle-radius": ["step", ["get", "count"], 7, 10, 12, 100, 17, 1000, 23],
+                "circle-opacity": 0.85,
+                "circle-stroke-width": 2,
+                "circle-stroke-color": "#ffffff",
+            },
+        });
+        this.map.addLayer({
+            id: "portfolio-counts",
+            type: "symbol",
+            source: "portfolio",
+            filter: [">", ["get", "count"], 1],
+            layout: { "text-field": ["get", "label"], "text-size": 11 },
+            paint: { "text-color": "#ffffff" },
+        });
+
+        this.map.on("click", "portfolio-points", (ev) => {
+            const feature = ev.features[0];
+            if (feature.properties.count > 1) {
+                this.map.easeTo({ center: feature.geometry.coordinates, zoom: this.map.getZoom() + 2 });
+            } else if (feature.properties.id) {
+                this.action.doAction({
+                    type: "ir.actions.act_window",
+                    res_model: "property_fielder.property",
+                    res_id: feature.properties.id,
+                    views: [[false, "form"]],
+                });
+            }
+        });
+        this.map.on("mouseenter", "portfolio-points", () => {
+            this.map.getCanvas().style.cursor = "pointer";
+        });
+        this.map.on("mouseleave", "portfolio-points", () => {
+            this.map.getCanvas().style.cursor = "";
+        });
+    }
+
+    async loadViewport() {
+        if (!this.map) {
+            return;
+        }
+        const bounds = this.map.getBounds();
+        const requestId = ++this.requestId;
+        this.state.loading = true;
+        // Mapbox zoom levels use 512 px tiles, the tile service 256 px ones
+        const data = await this.orm.call("property_fielder.map.tiles", "get_viewport", [
+            "properties",
+            bounds.getSouth(),
+            bounds.getWest(),
+            bounds.getNorth(),
+            bounds.getEast(),
+            Math.round(this.map.getZoom()) + 1,
+        ]);
+        if (requestId !== this.requestId || !this.map) {
+            return;
+        }
+
+        const features = [];
+        let total = 0;
+        for (const tile of Object.values(data.tiles)) {
+            for (let i = 0; i < tile.lat.length; i++) {
+                const count = data.clustered ? tile.count[i] : 1;
+                total += count;
+                features.push({
+                    type: "Feature",
+                    geometry: { type: "Point", coordinates: [tile.lng[i], tile.lat[i]] },
+                    properties: {
+                        id: data.clustered ? false : tile.id[i],
+                        count,
+                        label: count >= 1000 ? `${Math.round(count / 100) / 10}k` : String(count),
+                        status: tile.status[i],
+                    },
+                });
+            }
+        }
+        this.map.getSource("portfolio").setData({ type: "FeatureCollection", features });
+        this.state.total = total;
+        this.state.loading = false;
+    }
+}
+
+registry.category("actions").add("property_fielder_property_management.portfolio_map", PropertyPortfolioMap);
@@ -181,6 +181,7 @@ class BulkScheduleWizard(models.TransientModel):
                     'partner_id': prop.partner_id.id,
                     'property_id': prop.id,
                     'scheduled_date': self.scheduled_date,
+                    'due_date': cert.expiry_date,
                     'job_type': 'inspection',
                     'state': 'draft',
                     'street': prop.street,
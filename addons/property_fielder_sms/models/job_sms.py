@@ -2,6 +2,7 @@
 
 from odoo import models, fields, api, _
 from odoo.exceptions import UserError
+from odoo.addons.property_fielder_field_service.models.job_token import hash_token
 import logging
 
 _logger = logging.getLogger(__name__)
@@ -30,8 +31,12 @@ class JobSMS(models.Model):
             ).sorted('sent_time', reverse=True)[:1]
             job.last_sms_sent = last_log.sent_time if last_log else False
     
-    def _get_sms_values(self):
-        """Get template values for SMS"""
+    def _get_sms_values(self, confirmation_token=None):
+        """Get template values for SMS
+
+        :param confirmation_token: clear token to link to; only the caller
+                                   that actually sends the message issues one
+        """
         self.ensure_one()
         base_url = self.env['ir.config_parameter'].sudo().get_param('web.base.url')
         
@@ -42,6 +47,10 @@ class JobSMS(models.Model):
             end = self.latest_end.strftime('%H:%M')
             scheduled_time = f'{start} - {end}'
         
+        confirmation_link = ''
+        if confirmation_token:
+            confirmation_link = f'{base_url}/appointment/confirm/{confirmation_token}'
+        
         return {
             'owner_name': self.partner_id.name or 'Customer',
             'property_address': f'{self.street or ""}, {self.city or ""}'.strip(', '),
@@ -49,7 +58,7 @@ class JobSMS(models.Model):
             'scheduled_time': scheduled_time or 'TBC',
             'inspector_name': self.inspector_id.name if self.inspector_id else 'TBC',
             'job_type': self.name or 'Inspection',
-            'confirmation_link': f'{base_url}/appointment/{self.confirmation_token}' if self.confirmation_token else '',
+            'confirmation_link': confirmation_link,
             'company_name': self.env.company.name,
             'company_phone': self.env.company.phone or '',
         }
@@ -61,7 +70,16 @@ class JobSMS(models.Model):
             raise UserError(_('No phone number found for %s') % self.partner_id.name)
         
         phone = self.partner_id.mobile or self.partner_id.phone
-        values = self._get_sms_values()
+        template = self.env['property_fielder.sms.template'].get_template('appointment_confirmation')
+        
+        # Tokens are stored hashed: issue a dedicated one only for a message
+        # that links to it, and drop it again if the message is not sent
+        Token = self.env['property_fielder.job.token'].sudo()
+        token = None
+        if (self.confirmation_state == 'pending' and template
+                and '{confirmation_link}' in (template.message_body or '')):
+            token = Token._issue(self)[self.id]
+        values = self._get_sms_values(confirmation_token=token)
         
         sms_service = self.env['property_fielder.sms.service']
         result = sms_service.send_template_sms(
@@ -76,6 +94,8 @@ class JobSMS(models.Model):
         if result.get('success'):
             self.message_post(body=_('Confirmation SMS sent to %s') % phone)
         else:
+            if token:
+                Token.search([('token_hash', '=', hash_token(token))]).unlink()
             self.message_post(body=_('Failed to send SMS: %s') % result.get('error'))
         
         return result
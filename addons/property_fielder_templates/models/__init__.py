@@ -11,4 +11,5 @@ from . import inspection_response
 from . import inspection_asset_response
 from . import matrix_schema
 from . import template_calculation
+from . import template_runtime
 
@@ -1,9 +1,46 @@
 # -*- coding: utf-8 -*-
 
+import functools
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
 
+@functools.lru_cache(maxsize=1024)
+def compile_condition(operator, value):
+    """Return a predicate ``f(response_value) -> bool`` for an operator/value.
+
+    The comparison operand is parsed once here instead of on every call.
+    """
+    if operator == 'equals':
+        expected = str(value)
+        return lambda response_value: str(response_value) == expected
+    if operator == 'not_equals':
+        expected = str(value)
+        return lambda response_value: str(response_value) != expected
+    if operator in ('greater', 'less'):
+        try:
+            threshold = float(value)
+        except (ValueError, TypeError):
+            return lambda response_value: False
+
+        def compare(response_value):
+            try:
+                number = float(response_value)
+            except (ValueError, TypeError):
+                return False
+            return number > threshold if operator == 'greater' else number < threshold
+        return compare
+    if operator == 'contains':
+        needle = str(value)
+        return lambda response_value: needle in str(response_value)
+    if operator == 'is_empty':
+        return lambda response_value: not response_value
+    if operator == 'is_not_empty':
+        return lambda response_value: bool(response_value)
+    return lambda response_value: False
+
+
 class ConditionTrigger(models.Model):
     """Skip Logic Rules - Conditions for showing/hiding sections and items"""
     
@@ -86,29 +123,7 @@ class ConditionTrigger(models.Model):
     def evaluate(self, response_value):
         """Evaluate if condition is met based on response value."""
         self.ensure_one()
-        
-        if self.operator == 'equals':
-            return str(response_value) == str(self.value)
-        elif self.operator == 'not_equals':
-            return str(response_value) != str(self.value)
-        elif self.operator == 'greater':
-            try:
-                return float(response_value) > float(self.value)
-            except (ValueError, TypeError):
-                return False
-        elif self.operator == 'less':
-            try:
-                return float(response_value) < float(self.value)
-            except (ValueError, TypeError):
-                return False
-        elif self.operator == 'contains':
-            return str(self.value) in str(response_value)
-        elif self.operator == 'is_empty':
-            return not response_value
-        elif self.operator == 'is_not_empty':
-            return bool(response_value)
-        
-        return False
+        return compile_condition(self.operator, self.value)(response_value)
     
     # Display name
     def name_get(self):
@@ -1,5 +1,7 @@
 # -*- coding: utf-8 -*-
 
+from collections import defaultdict
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
@@ -151,6 +153,13 @@ class Inspection(models.Model):
         string='Report Template',
         help='QWeb report template for certificate generation'
     )
+
+    # Calculation results (maintained by the template runtime)
+    calculation_results = fields.Json(
+        string='Calculation Results',
+        readonly=True,
+        help='Latest template calculation results keyed by calculation code'
+    )
     
     @api.depends('response_ids')
     def _compute_response_count(self):
@@ -171,8 +180,9 @@ class Inspection(models.Model):
                 record.completion_percentage = 100.0
                 continue
             
+            required_ids = set(required_items.ids)
             answered = record.response_ids.filtered(
-                lambda r: r.item_id in required_items and r.is_answered
+                lambda r: r.item_id.id in required_ids and r.is_answered
             )
             record.completion_percentage = (len(answered) / len(required_items)) * 100
 
@@ -205,17 +215,17 @@ class Inspection(models.Model):
 
     def action_initialize_responses(self):
         """Create empty response records for all template items."""
-        self.ensure_one()
-        Response = self.env['property_fielder.inspection.response']
+        vals_list = []
+        for record in self:
+            existing_item_ids = set(record.response_ids.item_id.ids)
+            vals_list.extend({
+                'inspection_id': record.id,
+                'item_id': item.id,
+            } for item in record.template_id.section_ids.item_ids
+                if item.id not in existing_item_ids)
 
-        for section in self.template_id.section_ids:
-            for item in section.item_ids:
-                existing = self.response_ids.filtered(lambda r: r.item_id == item)
-                if not existing:
-                    Response.create({
-                        'inspection_id': self.id,
-                        'item_id': item.id,
-                    })
+        if vals_list:
+            self.env['property_fielder.inspection.response'].create(vals_list)
 
         return True
 
@@ -223,36 +233,46 @@ class Inspection(models.Model):
         """Pre-fill responses from previous inspection."""
         self.ensure_one()
 
-        for response in self.response_ids:
-            if response.item_id.load_previous_value:
-                prev = self._get_previous_response(response.item_id)
-                if prev:
-                    response.write({
-                        'response_text': prev.response_text,
-                        'response_numeric': prev.response_numeric,
-                        'response_option_id': prev.response_option_id.id if prev.response_option_id else False,
-                        'response_date': prev.response_date,
-                    })
+        previous_inspection = self._get_previous_inspection()
+        if not previous_inspection:
+            return True
+
+        previous_by_code = {}
+        for prev in previous_inspection.response_ids:
+            previous_by_code.setdefault(prev.item_id.code, prev)
+
+        # Group responses receiving identical values into a single write
+        batches = defaultdict(list)
+        for response in self.response_ids.filtered(lambda r: r.item_id.load_previous_value):
+            prev = previous_by_code.get(response.item_id.code)
+            if prev:
+                vals = (
+                    ('response_text', prev.response_text),
+                    ('response_numeric', prev.response_numeric),
+                    ('response_option_id', prev.response_option_id.id or False),
+                    ('response_date', prev.response_date),
+                )
+                batches[vals].append(response.id)
+
+        # Calculations are refreshed once for the whole prefill, not per write
+        Response = self.env['property_fielder.inspection.response'].with_context(skip_calculation_update=True)
+        for vals, response_ids in batches.items():
+            Response.browse(response_ids).write(dict(vals))
+        if batches:
+            self._update_calculation_results()
 
         return True
 
-    def _get_previous_response(self, item):
-        """Load answer from most recent 'done' inspection of same template on same property."""
-        previous_inspection = self.search([
+    def _get_previous_inspection(self):
+        """Most recent 'done' inspection of same template on same property."""
+        self.ensure_one()
+        return self.search([
             ('template_id', '=', self.template_id.id),
             ('property_id', '=', self.property_id.id),
             ('overall_result', '!=', 'pending'),
             ('id', '!=', self.id),
         ], order='completion_date desc', limit=1)
 
-        if previous_inspection:
-            previous_response = previous_inspection.response_ids.filtered(
-                lambda r: r.item_id.code == item.code
-            )
-            if previous_response:
-                return previous_response[0]
-        return False
-
     def action_complete(self):
         """Mark inspection as complete and calculate result."""
         self.ensure_one()
@@ -279,6 +299,29 @@ class Inspection(models.Model):
 
         return True
 
+    def _update_calculation_results(self, changed_item_ids=None):
+        """Refresh stored calculation results.
+
+        With ``changed_item_ids`` only the calculations depending on those
+        items are re-run and merged into the existing results.
+        """
+        Runtime = self.env['property_fielder.template.runtime']
+        for record in self:
+            if not record.template_id or not record.template_id.calculation_ids:
+                continue
+            results = Runtime.evaluate_calculations(record, changed_item_ids=changed_item_ids)
+            if not results:
+                continue
+            keys = {calc.id: calc.code or str(calc.id) for calc in record.template_id.calculation_ids}
+            merged = dict(record.calculation_results or {}) if changed_item_ids is not None else {}
+            merged.update({keys[calc_id]: value for calc_id, value in results.items()})
+            record.calculation_results = merged
+        return True
+
+    def action_compute_calculations(self):
+        """Recompute all template calculations for these inspections."""
+        return self._update_calculation_results()
+
     def action_view_responses(self):
         """View all responses for this inspection."""
         self.ensure_one()
@@ -134,6 +134,34 @@ class InspectionResponse(models.Model):
         help='Additional notes for this response'
     )
     
+    # Fields whose change can affect template calculations
+    CALCULATION_FIELDS = {'response_text', 'response_numeric', 'response_option_id', 'response_date'}
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        records = super().create(vals_list)
+        if any(self.CALCULATION_FIELDS.intersection(vals) for vals in vals_list):
+            records._notify_calculation_change()
+        return records
+
+    def write(self, vals):
+        result = super().write(vals)
+        if self.CALCULATION_FIELDS.intersection(vals):
+            self._notify_calculation_change()
+        return result
+
+    def _notify_calculation_change(self):
+        """Re-run only the calculations depending on the changed items.
+
+        Bulk updates pass ``skip_calculation_update`` in the context and
+        refresh the results once at the end instead.
+        """
+        if self.env.context.get('skip_calculation_update'):
+            return
+        for inspection in self.inspection_id:
+            changed = self.filtered(lambda r: r.inspection_id == inspection)
+            inspection._update_calculation_results(changed_item_ids=changed.item_id.ids)
+
     @api.depends('response_text', 'response_numeric', 'response_option_id', 
                  'response_option_ids', 'response_date', 'response_json', 'photo_ids')
     def _compute_is_answered(self):
@@ -169,6 +169,8 @@ class InspectionTemplate(models.Model):
             if not record.section_ids:
                 raise ValidationError(_("Template must have at least one section."))
             record.state = 'active'
+            # Validate and cache the calculation formulas of this revision
+            self.env['property_fielder.template.runtime'].compile_template(record)
 
     def action_archive(self):
         """Archive the template (no longer available for new inspections)."""
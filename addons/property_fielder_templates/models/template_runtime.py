@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+import ast
+import datetime
+import logging
+
+from odoo import models, api, tools, _
+from odoo.exceptions import ValidationError
+from odoo.tools.safe_eval import safe_eval, test_python_expr
+
+from .template_calculation import format_result
+
+_logger = logging.getLogger(__name__)
+
+# Names in the formula context that expose the whole response set
+WILDCARD_NAMES = {'responses', 'scores', 'count_value', 'count_not_empty'}
+
+
+def json_safe(value):
+    """Convert a formula result to a value the Json result field can store."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set)):
+        return [json_safe(item) for item in value]
+    if isinstance(value, dict):
+        return {str(key): json_safe(item) for key, item in value.items()}
+    return str(value)
+
+
+def formula_dependencies(formula):
+    """Return the item codes a formula reads, or None if it reads all of them.
+
+    ``responses['CODE']`` and ``responses.get('CODE')`` are tracked as
+    individual dependencies; any other use of the response set (iteration,
+    ``scores``, ``count_value()``...) makes the formula depend on everything.
+    """
+    tree = ast.parse(formula.strip(), mode='eval')
+    keyed_nodes = set()
+    codes = set()
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Subscript) and isinstance(node.value, ast.Name)
+                and node.value.id == 'responses'
+                and isinstance(node.slice, ast.Constant) and isinstance(node.slice.value, str)):
+            keyed_nodes.add(id(node.value))
+            codes.add(node.slice.value)
+        elif (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == 'get' and isinstance(node.func.value, ast.Name)
+                and node.func.value.id == 'responses' and node.args
+                and isinstance(node.args[0], ast.Constant) and isinstance(node.args[0].value, str)):
+            keyed_nodes.add(id(node.func.value))
+            codes.add(node.args[0].value)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and node.id in WILDCARD_NAMES and id(node) not in keyed_nodes:
+            return None
+    return frozenset(codes)
+
+
+class TemplateRuntime(models.AbstractModel):
+    """Compiled inspection template runtime.
+
+    Templates are compiled once (the item → calculation dependency graph of
+    their formulas) and cached per template revision. Evaluation reads an
+    inspection's responses once and runs every requested formula in one
+    pass through safe_eval.
+    """
+    _name = 'property_fielder.template.runtime'
+    _description = 'Template Runtime'
+
+    # ------------------------------------------------------------
+    # Compilation
+    # ------------------------------------------------------------
+
+    @api.model
+    def _get_template_signature(self, template_id):
+        """Revision key of a template, its items and calculations (one query)."""
+        for model in ('property_fielder.inspection.template',
+                      'property_fielder.inspection.template.item',
+                      'property_fielder.template.calculation'):
+            self.env[model].flush_model()
+        self.env.cr.execute("""
+            SELECT t.write_date,
+                   (SELECT ROW(COUNT(*), MAX(write_date))::text
+                      FROM property_fielder_inspection_template_item WHERE template_id = t.id),
+                   (SELECT ROW(COUNT(*), MAX(write_date))::text
+                      FROM property_fielder_template_calculation WHERE template_id = t.id)
+              FROM property_fielder_inspection_template t
+             WHERE t.id = %s
+        """, (template_id,))
+        return tuple(str(value) for value in (self.env.cr.fetchone() or ()))
+
+    @api.model
+    def get_compiled_template(self, template):
+        """Return the compiled runtime for a template (cached per revision)."""
+        return self._compile_template(template.id, self._get_template_signature(template.id))
+
+    @tools.ormcache('template_id', 'signature')
+    def _compile_template(self, template_id, signature):
+        template = self.env['property_fielder.inspection.template'].browse(template_id)
+        items = self.env['property_fielder.inspection.template.item'].search_read(
+            [('template_id', '=', template_id)], ['code'],
+        )
+        item_keys = {item['id']: item['code'] or str(item['id']) for item in items}
+
+        calculations = []
+        dependents = {}
+        wildcard = []
+        for calc in template.calculation_ids.sorted(lambda c: (c.sequence, c.id)):
+            deps = None
+            try:
+                deps = formula_dependencies(calc.formula)
+            except (SyntaxError, ValueError) as e:
+                # Broken formulas fall back to safe_eval, which logs the error
+                _logger.warning("Could not compile formula %s: %s", calc.formula, e)
+            calculations.append({
+                'id': calc.id,
+                'code': calc.code,
+                'formula': calc.formula,
+                'result_type': calc.result_type,
+            })
+            if deps is None:
+                wildcard.append(calc.id)
+            else:
+                for code in deps:
+                    dependents.setdefault(code, []).append(calc.id)
+
+        return {
+            'item_keys': item_keys,
+            'calculations': calculations,
+            'dependents': dependents,
+            'wildcard': wildcard,
+        }
+
+    @api.model
+    def compile_template(self, template):
+        """Compile a template and raise a ValidationError on broken formulas."""
+        for calc in template.calculation_ids:
+            try:
+                formula_dependencies(calc.formula)
+                error = test_python_expr(calc.formula.strip(), mode='eval')
+                if error:
+                    raise ValueError(error)
+            except (SyntaxError, ValueError) as e:
+                raise ValidationError(
+                    _("Calculation '%(name)s' has an invalid formula: %(error)s",
+                      name=calc.name, error=e)
+                )
+        return self.get_compiled_template(template)
+
+    # ------------------------------------------------------------
+    # Evaluation
+    # ------------------------------------------------------------
+
+    @api.model
+    def _read_responses(self, inspection, item_keys):
+        """Read an inspection's responses once into (values, scores)."""
+        rows = self.env['property_fielder.inspection.response'].search_read(
+            [('inspection_id', '=', inspection.id)],
+            ['item_id', 'response_numeric', 'response_option_id',
+             'response_text', 'response_date'],
+            order='item_sequence, id',
+        )
+        option_ids = {row['response_option_id'][0] for row in rows if row['response_option_id']}
+        options = {
+            option['id']: option for option in
+            self.env['property_fielder.inspection.template.item.option'].browse(
+                list(option_ids)).read(['value', 'score'])
+        }
+
+        values = {}
+        scores = []
+        for row in rows:
+            item_id = row['item_id'][0]
+            code = item_keys.get(item_id) or str(item_id)
+            if row['response_numeric']:
+                values[code] = row['response_numeric']
+                scores.append(row['response_numeric'])
+            elif row['response_option_id']:
+                option = options[row['response_option_id'][0]]
+                values[code] = option['value']
+                if option['score']:
+                    scores.append(option['score'])
+            elif row['response_text']:
+                values[code] = row['response_text']
+            elif row['response_date']:
+                values[code] = row['response_date']
+            else:
+                values[code] = None
+        return values, scores
+
+    @api.model
+    def _build_eval_context(self, responses, scores):
+        def count_value(val):
+            return sum(1 for v in responses.values() if v == val)
+
+        def count_not_empty():
+            return sum(1 for v in responses.values() if v is not None)
+
+        def avg(items):
+            if not items:
+                return 0
+            return sum(items) / len(items)
+
+        return {
+            'responses': responses,
+            'scores': scores,
+            'sum': sum,
+            'len': len,
+            'avg': avg,
+            'count_value': count_value,
+            'count_not_empty': count_not_empty,
+            'min': min,
+            'max': max,
+            'round': round,
+        }
+
+    @api.model
+    def _run_formula(self, calc, eval_context):
+        try:
+            result = format_result(calc['result_type'], safe_eval(calc['formula'], dict(eval_context)))
+        except Exception as e:
+            _logger.error("Error evaluating formula %s: %s", calc['formula'], str(e))
+            return None
+        return json_safe(result)
+
+    @api.model
+    def _affected_calculations(self, compiled, changed_item_ids):
+        """Calculations that depend on any of the changed items."""
+        affected = set(compiled['wildcard'])
+        for item_id in changed_item_ids:
+            key = compiled['item_keys'].get(item_id, str(item_id))
+            affected.update(compiled['dependents'].get(key, ()))
+        return affected
+
+    @api.model
+    def evaluate_calculations(self, inspection, calculations=None, changed_item_ids=None):
+        """Run template calculations for an inspection in one pass.
+
+        :param calculations: restrict to these calculation records
+        :param changed_item_ids: only run calculations depending on these items
+        :return: dict {calculation id: formatted result}
+        """
+        compiled = self.get_compiled_template(inspection.template_id)
+        selected = compiled['calculations']
+        if calculations is not None:
+            wanted = set(calculations.ids)
+            selected = [calc for calc in selected if calc['id'] in wanted]
+        if changed_item_ids is not None:
+            affected = self._affected_calculations(compiled, changed_item_ids)
+            selected = [calc for calc in selected if calc['id'] in affected]
+        if not selected:
+            return {}
+
+        responses, scores = self._read_responses(inspection, compiled['item_keys'])
+        eval_context = self._build_eval_context(responses, scores)
+        return {calc['id']: self._run_formula(calc, eval_context) for calc in selected}
@@ -1,9 +1,62 @@
 # -*- coding: utf-8 -*-
 
+import functools
+import re
+
 from odoo import models, fields, api, _
 from odoo.exceptions import ValidationError
 
 
+@functools.lru_cache(maxsize=1024)
+def compile_validation(validation_type, validation_value):
+    """Return a check ``f(target_response_value) -> bool`` for a rule.
+
+    Numeric bounds, lengths and regex patterns are parsed once here.
+    """
+    if validation_type == 'required':
+        return lambda value: bool(value)
+    if validation_type in ('min_value', 'max_value'):
+        try:
+            bound = float(validation_value or 0)
+        except (ValueError, TypeError):
+            return lambda value: False
+
+        def check_bound(value):
+            try:
+                number = float(value or 0)
+            except (ValueError, TypeError):
+                return False
+            return number >= bound if validation_type == 'min_value' else number <= bound
+        return check_bound
+    if validation_type in ('min_length', 'max_length'):
+        try:
+            length = int(validation_value or 0)
+        except (ValueError, TypeError):
+            return lambda value: False
+        if validation_type == 'min_length':
+            return lambda value: len(str(value or '')) >= length
+        return lambda value: len(str(value or '')) <= length
+    if validation_type == 'regex':
+        try:
+            pattern = re.compile(validation_value or '')
+        except re.error:
+            return lambda value: False
+        return lambda value: bool(pattern.match(str(value or '')))
+    # photo_required is checked at response level
+    return lambda value: True
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_trigger(trigger_operator, trigger_value):
+    """Return a predicate ``f(trigger_response_value) -> bool``."""
+    expected = str(trigger_value)
+    if trigger_operator == 'equals':
+        return lambda value: str(value) == expected
+    if trigger_operator == 'not_equals':
+        return lambda value: str(value) != expected
+    return lambda value: False
+
+
 class ValidationRule(models.Model):
     """Conditional Validation Rules"""
     
@@ -68,49 +121,13 @@ class ValidationRule(models.Model):
         
         # First check if trigger condition is met
         if self.trigger_item_id:
-            trigger_met = False
-            if self.trigger_operator == 'equals':
-                trigger_met = str(trigger_response_value) == str(self.trigger_value)
-            elif self.trigger_operator == 'not_equals':
-                trigger_met = str(trigger_response_value) != str(self.trigger_value)
-            
-            if not trigger_met:
+            trigger = compile_trigger(self.trigger_operator, self.trigger_value)
+            if not trigger(trigger_response_value):
                 return True  # Validation doesn't apply
         
-        # Check validation
-        if self.validation_type == 'required':
-            if not target_response_value:
-                return False
-        elif self.validation_type == 'photo_required':
-            # Check handled at response level
-            pass
-        elif self.validation_type == 'min_value':
-            try:
-                if float(target_response_value or 0) < float(self.validation_value or 0):
-                    return False
-            except (ValueError, TypeError):
-                return False
-        elif self.validation_type == 'max_value':
-            try:
-                if float(target_response_value or 0) > float(self.validation_value or 0):
-                    return False
-            except (ValueError, TypeError):
-                return False
-        elif self.validation_type == 'min_length':
-            if len(str(target_response_value or '')) < int(self.validation_value or 0):
-                return False
-        elif self.validation_type == 'max_length':
-            if len(str(target_response_value or '')) > int(self.validation_value or 0):
-                return False
-        elif self.validation_type == 'regex':
-            import re
-            try:
-                if not re.match(self.validation_value or '', str(target_response_value or '')):
-                    return False
-            except re.error:
-                return False
-        
-        return True
+        return compile_validation(self.validation_type, self.validation_value)(
+            target_response_value
+        )
     
     # Display name
     def name_get(self):
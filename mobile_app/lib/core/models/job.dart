@@ -15,6 +15,7 @@ class Job {
   final String? scheduledTime;
   final String? earliestStart;
   final String? latestEnd;
+  final String? startEligibleAt;
   final int durationMinutes;
   final String priority;
   final String status;
@@ -45,6 +46,7 @@ class Job {
     this.scheduledTime,
     this.earliestStart,
     this.latestEnd,
+    this.startEligibleAt,
     required this.durationMinutes,
     required this.priority,
     required this.status,
@@ -77,6 +79,7 @@ class Job {
       scheduledTime: json['scheduled_time'] as String?,
       earliestStart: json['earliest_start'] as String?,
       latestEnd: json['latest_end'] as String?,
+      startEligibleAt: json['start_eligible_at'] as String?,
       durationMinutes: json['duration_minutes'] as int? ?? 60,
       priority: json['priority'] as String? ?? '2',
       status: json['status'] as String? ?? 'pending',
@@ -110,6 +113,7 @@ class Job {
       'scheduled_time': scheduledTime,
       'earliest_start': earliestStart,
       'latest_end': latestEnd,
+      'start_eligible_at': startEligibleAt,
       'duration_minutes': durationMinutes,
       'priority': priority,
       'status': status,
@@ -168,5 +172,20 @@ class Job {
   bool get isInProgress => status == 'in_progress';
   bool get canCheckIn => status == 'assigned' || status == 'pending';
   bool get canCheckOut => status == 'in_progress';
+
+  /// When the Section 11 notice period ends, as sent by the server (UTC).
+  DateTime? get startEligibleTime {
+    if (startEligibleAt == null) return null;
+    final value = startEligibleAt!;
+    // Server datetimes are naive UTC
+    final hasOffset = value.endsWith('Z') || RegExp(r'[+-]\d{2}:\d{2}$').hasMatch(value);
+    return DateTime.tryParse(hasOffset ? value : '${value}Z');
+  }
+
+  /// Whether Section 11 allows the job to start at [now] (e.g. server-adjusted time).
+  bool canStartAt(DateTime now) {
+    final eligible = startEligibleTime;
+    return eligible != null && !eligible.isAfter(now.toUtc());
+  }
 }
 
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Generate benchmark data and run the backend benchmark suite via XML-RPC.
+
+Requires the property_fielder_benchmark addon on a dedicated database.
+
+    # build the small dataset (resumable), then benchmark it
+    python scripts/run_benchmarks.py generate --profile small --seed 42
+    python scripts/run_benchmarks.py run --output results.json
+
+    # fail (exit 1) when a case got more than 20% slower than the baseline
+    python scripts/run_benchmarks.py run --output new.json --baseline results.json
+
+    # remove the generated records
+    python scripts/run_benchmarks.py purge --seed 42
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import xmlrpc.client
+from datetime import date, timedelta
+
+ENTITIES = ['owners', 'inspectors', 'properties', 'certificates', 'jobs']
+# Regressions smaller than this many milliseconds are treated as noise
+MIN_REGRESSION_MS = 5.0
+
+
+def connect(args):
+    common = xmlrpc.client.ServerProxy(f'{args.url}/xmlrpc/2/common')
+    uid = common.authenticate(args.db, args.user, args.password, {})
+    if not uid:
+        print('ERROR: Authentication failed')
+        sys.exit(1)
+    models = xmlrpc.client.ServerProxy(f'{args.url}/xmlrpc/2/object')
+
+    def call(model, method, *params, **kwargs):
+        return models.execute_kw(args.db, uid, args.password, model, method, list(params), kwargs)
+    return call
+
+
+def generate(call, args):
+    profile = call('property_fielder.benchmark.generator', 'get_profiles')[args.profile]
+    # Centre the job window on today so there are past, current and future jobs
+    start_date = args.start_date or (date.today() - timedelta(days=profile['days'] // 2)).isoformat()
+    for entity in ENTITIES:
+        offset = 0
+        started = time.perf_counter()
+        created = 0
+        while offset is not False:
+            result = call('property_fielder.benchmark.generator', 'generate',
+                          args.profile, args.seed, entity, offset, args.batch_size, start_date)
+            created += result['created']
+            offset = result['next_offset']
+            print(f'\r  {entity}: {offset or result["total"]}/{result["total"]}', end='', flush=True)
+        elapsed = time.perf_counter() - started
+        print(f'\r  {entity}: {created} created in {elapsed:.1f}s '
+              f'({created / elapsed if elapsed else 0:.0f}/s)')
+
+
+def purge(call, args):
+    for entity in reversed(ENTITIES):
+        deleted = 0
+        while True:
+            count = call('property_fielder.benchmark.generator', 'purge', args.seed, entity, args.batch_size)
+            if not count:
+                break
+            deleted += count
+        print(f'  {entity}: {deleted} deleted')
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, report, threshold):
+    """Cases whose median time grew more than ``threshold`` (a ratio)."""
+    regressions = []
+    for name, result in report['cases'].items():
+        before = baseline.get('cases', {}).get(name)
+        if not before or 'median_ms' not in before or 'median_ms' not in result:
+            continue
+        slower = result['median_ms'] - before['median_ms']
+        if slower > MIN_REGRESSION_MS and result['median_ms'] > before['median_ms'] * (1 + threshold):
+            regressions.append((name, before, result))
+    return regressions
+
+
+def run(call, args):
+    report = call('property_fielder.benchmark', 'run', args.cases or False, args.repeat, args.seed)
+    report['git_revision'] = git_revision()
+    report['url'] = args.url
+
+    print(f'\n{"case":40} {"median ms":>10} {"min ms":>10} {"queries":>8}')
+    for name, result in report['cases'].items():
+        if 'error' in result:
+            print(f'{name:40} ERROR: {result["error"]}')
+        else:
+            print(f'{name:40} {result["median_ms"]:>10.1f} {result["min_ms"]:>10.1f} {result["queries"]:>8}')
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f'\nResults written to {args.output}')
+
+    failed = any('error' in result for result in report['cases'].values())
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        for name, before, after in regressions:
+            print(f'REGRESSION {name}: {before["median_ms"]:.1f} ms -> {after["median_ms"]:.1f} ms, '
+                  f'{before.get("queries")} -> {after.get("queries")} queries')
+        if not regressions:
+            print(f'No regression above {args.threshold:.0%} against {args.baseline}')
+        failed = failed or bool(regressions)
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['generate', 'run', 'purge'])
+    parser.add_argument('--url', default=os.getenv('ODOO_URL', 'http://localhost:8069'))
+    parser.add_argument('--db', default=os.getenv('ODOO_DB', 'benchmark'))
+    parser.add_argument('--user', default=os.getenv('ODOO_USER', 'admin'))
+    parser.add_argument('--password', default=os.getenv('ODOO_PASSWORD', 'admin'))
+    parser.add_argument('--profile', default='small', choices=['small', 'medium', 'large'])
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--start-date', help='First day of the job window (default: centred on today)')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--cases', nargs='*', help='Benchmark cases to run (default: all)')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', help='Previous results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Relative slowdown reported as a regression (default: 0.2)')
+    args = parser.parse_args()
+
+    call = connect(args)
+    if args.command == 'generate':
+        generate(call, args)
+    elif args.command == 'purge':
+        purge(call, args)
+    else:
+        sys.exit(run(call, args))
+
+
+if __name__ == '__main__':
+    main()